@@ -0,0 +1,83 @@
+"""Compare strip_html with the BeautifulSoup flattening it replaced.
+
+    python benchmarks/strip_html.py [iterations]
+
+The baseline needs ``beautifulsoup4``, which is no longer a dependency; it is
+skipped when not installed. Token counts are estimated at 4 characters each.
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from collections.abc import Callable
+
+from auto_leetcode.leetcode.parser import strip_html
+
+SAMPLE = """
+<p>Given an array of integers&nbsp;<code>nums</code>&nbsp;and an integer&nbsp;<code>target</code>,
+return <em>indices of the two numbers such that they add up to <code>target</code></em>.</p>
+
+<p>You may assume that each input would have <strong><em>exactly</em> one solution</strong>,
+and you may not use the <em>same</em> element twice.</p>
+
+<p>&nbsp;</p>
+<p><strong class="example">Example 1:</strong></p>
+
+<pre>
+<strong>Input:</strong> nums = [2,7,11,15], target = 9
+<strong>Output:</strong> [0,1]
+<strong>Explanation:</strong> Because nums[0] + nums[1] == 9, we return [0, 1].
+</pre>
+
+<p><strong class="example">Example 2:</strong></p>
+
+<pre>
+<strong>Input:</strong> nums = [3,2,4], target = 6
+<strong>Output:</strong> [1,2]
+</pre>
+
+<p>&nbsp;</p>
+<p><strong>Constraints:</strong></p>
+
+<ul>
+\t<li><code>2 &lt;= nums.length &lt;= 10<sup>4</sup></code></li>
+\t<li><code>-10<sup>9</sup> &lt;= nums[i] &lt;= 10<sup>9</sup></code></li>
+\t<li><code>-10<sup>9</sup> &lt;= target &lt;= 10<sup>9</sup></code></li>
+\t<li><strong>Only one valid answer exists.</strong></li>
+</ul>
+
+<p>&nbsp;</p>
+<strong>Follow-up:&nbsp;</strong>Can you come up with an algorithm that is less than
+<code>O(n<sup>2</sup>)</code><font face="monospace">&nbsp;</font>time complexity?
+"""
+
+
+def _bs4_strip_html(html: str) -> str:
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, "html.parser").get_text(separator="\n").strip()
+
+
+def _report(name: str, convert: Callable[[str], str], iterations: int) -> None:
+    seconds = timeit.timeit(lambda: convert(SAMPLE), number=iterations)
+    text = convert(SAMPLE)
+    print(
+        f"{name:<14} {seconds / iterations * 1e6:8.1f} us/call"
+        f"  {len(text):5d} chars  ~{len(text) // 4:4d} tokens"
+    )
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    _report("strip_html", strip_html, iterations)
+    try:
+        import bs4  # noqa: F401
+    except ImportError:
+        print("beautifulsoup4 not installed, skipping baseline")
+        return
+    _report("beautifulsoup", _bs4_strip_html, iterations)
+
+
+if __name__ == "__main__":
+    main()
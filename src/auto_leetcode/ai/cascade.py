@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from auto_leetcode.ai.protocol import SolutionGenerator
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CascadePolicy:
+    """Decides when an attempt goes to the strong model instead of the fast one.
+
+    Escalation is sticky: once a problem has hit a verdict in ``escalate_on``
+    or failed ``escalate_after`` times, every later attempt stays escalated.
+    """
+
+    strong_difficulties: frozenset[str] = frozenset({"Hard"})
+    escalate_after: int = 2
+    # A fast model that is too slow rarely finds the better algorithm on a retry.
+    escalate_on: frozenset[SubmissionStatus] = frozenset(
+        {SubmissionStatus.TIME_LIMIT, SubmissionStatus.MEMORY_LIMIT}
+    )
+
+    def escalation(self, problem: Problem, previous_attempts: list[SubmissionResult]) -> str | None:
+        """Why this attempt needs the strong model, or None to use the fast one."""
+        if problem.difficulty in self.strong_difficulties:
+            return problem.difficulty
+        for attempt in previous_attempts:
+            if attempt.status in self.escalate_on:
+                return attempt.status.value
+        if len(previous_attempts) >= self.escalate_after:
+            return f"{len(previous_attempts)} failed attempts"
+        return None
+
+
+class CascadeGenerator:
+    """Routes each attempt to a fast or a strong generator according to a policy."""
+
+    def __init__(
+        self,
+        fast: SolutionGenerator,
+        strong: SolutionGenerator,
+        policy: CascadePolicy | None = None,
+    ) -> None:
+        self._fast = fast
+        self._strong = strong
+        self._policy = policy or CascadePolicy()
+
+    async def generate(
+        self,
+        problem: Problem,
+        previous_attempts: list[SubmissionResult],
+    ) -> Solution:
+        return await self._route(problem, previous_attempts).generate(problem, previous_attempts)
+
+    async def generate_many(
+        self,
+        problem: Problem,
+        previous_attempts: list[SubmissionResult],
+        n: int,
+    ) -> list[Solution]:
+        return await self._route(problem, previous_attempts).generate_many(
+            problem, previous_attempts, n
+        )
+
+    def _route(
+        self, problem: Problem, previous_attempts: list[SubmissionResult]
+    ) -> SolutionGenerator:
+        reason = self._policy.escalation(problem, previous_attempts)
+        if reason is None:
+            return self._fast
+        logger.info(
+            "Problem #%d attempt %d escalated to the strong model (%s)",
+            problem.id,
+            len(previous_attempts) + 1,
+            reason,
+        )
+        return self._strong
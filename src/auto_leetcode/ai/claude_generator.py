@@ -1,50 +1,207 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Sequence
+from typing import Any, cast
 
 from anthropic import APIError, AsyncAnthropic
+from anthropic.types.message_create_params import MessageCreateParamsNonStreaming
+from anthropic.types.messages.batch_create_params import Request
 
 from auto_leetcode.ai.prompt import (
+    PROMPT_TOKEN_BUDGET,
     SYSTEM_PROMPT,
-    build_user_prompt,
+    PromptParts,
+    build_prompt_parts,
     extract_code,
     extract_reasoning,
+    log_prompt,
+    starter_class,
+)
+from auto_leetcode.ai.rate_limiter import (
+    AIRateLimiter,
+    limited,
+    request_tokens,
+    response_headers,
+)
+from auto_leetcode.ai.streaming import (
+    CACHED_STATS,
+    CodeBlockWatcher,
+    PromptUsage,
+    log_generation,
 )
 from auto_leetcode.errors import AIGenerationError
+from auto_leetcode.models.batch import BatchProgress
 from auto_leetcode.models.problem import Problem
-from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.solution import GenerationStats, Solution
 from auto_leetcode.models.submission import SubmissionResult
+from auto_leetcode.storage.response_cache import ResponseCache, response_key
 
 logger = logging.getLogger(__name__)
 
+MAX_TOKENS = 4096
+EPHEMERAL = {"type": "ephemeral"}
+
 
 class ClaudeGenerator:
-    def __init__(self, api_key: str, base_url: str, model: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        model: str,
+        cache: ResponseCache | None = None,
+        stream: bool = True,
+        prompt_budget: int = PROMPT_TOKEN_BUDGET,
+        limiter: AIRateLimiter | None = None,
+    ) -> None:
         self._client = AsyncAnthropic(api_key=api_key, base_url=base_url)
         self._model = model
+        self._cache = cache
+        self._stream = stream
+        self._prompt_budget = prompt_budget
+        self._limiter = limiter
 
     async def generate(
         self,
         problem: Problem,
         previous_attempts: list[SubmissionResult],
     ) -> Solution:
-        user_prompt = build_user_prompt(problem, previous_attempts)
+        prompt = build_prompt_parts(problem, previous_attempts, self._prompt_budget)
+        log_prompt(problem, prompt)
+        return await self._sample(problem, previous_attempts, prompt, 0)
 
-        try:
-            response = await self._client.messages.create(
-                model=self._model,
-                max_tokens=4096,
-                system=SYSTEM_PROMPT,
-                messages=[{"role": "user", "content": user_prompt}],
+    async def generate_many(
+        self,
+        problem: Problem,
+        previous_attempts: list[SubmissionResult],
+        n: int,
+    ) -> list[Solution]:
+        """Sample ``n`` solutions with parallel requests; the Messages API has no ``n``."""
+        prompt = build_prompt_parts(problem, previous_attempts, self._prompt_budget)
+        log_prompt(problem, prompt)
+        results = await asyncio.gather(
+            *(self._sample(problem, previous_attempts, prompt, i) for i in range(n)),
+            return_exceptions=True,
+        )
+        solutions = [result for result in results if isinstance(result, Solution)]
+        errors = [result for result in results if isinstance(result, BaseException)]
+        for error in errors:
+            if not isinstance(error, AIGenerationError):
+                raise error
+        if not solutions:
+            raise errors[0]
+        if errors:
+            logger.warning(
+                "Problem #%d: %d of %d candidates failed: %s",
+                problem.id,
+                len(errors),
+                n,
+                errors[0],
             )
+        return solutions
+
+    async def submit_batch(self, problems: Sequence[Problem]) -> str:
+        """Queue first attempts through the Message Batches API, at half the token price."""
+        requests: list[Request] = []
+        for problem in problems:
+            prompt = build_prompt_parts(problem, [], self._prompt_budget)
+            params = cast(MessageCreateParamsNonStreaming, self._request(prompt))
+            requests.append(Request(custom_id=_custom_id(problem), params=params))
+        try:
+            batch = await self._client.messages.batches.create(requests=requests)
         except APIError as e:
-            raise AIGenerationError(
-                f"Claude API call failed for problem #{problem.id}: {e}"
-            ) from e
+            raise AIGenerationError(f"Claude batch submission failed: {e}") from e
+        return batch.id
 
-        text_blocks = [b.text for b in response.content if b.type == "text"]
-        content = text_blocks[0] if text_blocks else ""
-        code = extract_code(content)
+    async def batch_progress(self, batch_id: str) -> BatchProgress:
+        try:
+            batch = await self._client.messages.batches.retrieve(batch_id)
+        except APIError as e:
+            raise AIGenerationError(f"Claude batch {batch_id} lookup failed: {e}") from e
+        counts = batch.request_counts
+        failed = counts.errored + counts.canceled + counts.expired
+        return BatchProgress(
+            done=batch.processing_status == "ended",
+            succeeded=counts.succeeded,
+            failed=failed,
+            total=counts.processing + counts.succeeded + failed,
+        )
+
+    async def batch_results(self, batch_id: str, problems: Sequence[Problem]) -> list[Solution]:
+        by_id = {_custom_id(problem): problem for problem in problems}
+        solutions = []
+        try:
+            async for entry in await self._client.messages.batches.results(batch_id):
+                problem = by_id.get(entry.custom_id)
+                if problem is None or entry.result.type != "succeeded":
+                    continue
+                message = entry.result.message
+                text_blocks = [b.text for b in message.content if b.type == "text"]
+                content = text_blocks[0] if text_blocks else ""
+                stats = GenerationStats(
+                    seconds=0.0,
+                    time_to_code=None,
+                    output_tokens=message.usage.output_tokens,
+                    input_tokens=message.usage.input_tokens,
+                    batched=True,
+                )
+                try:
+                    solutions.append(self._solution(problem, [], content, stats))
+                except AIGenerationError as e:
+                    logger.warning("Discarding batch result: %s", e)
+                    continue
+                if self._cache is not None:
+                    prompt = build_prompt_parts(problem, [], self._prompt_budget)
+                    self._cache.put(self._key(prompt, 0), content)
+        except APIError as e:
+            raise AIGenerationError(f"Claude batch {batch_id} results failed: {e}") from e
+        return solutions
+
+    async def _sample(
+        self,
+        problem: Problem,
+        previous_attempts: list[SubmissionResult],
+        prompt: PromptParts,
+        sample: int,
+    ) -> Solution:
+        key = self._key(prompt, sample)
+        cached = self._cache.get(key) if self._cache is not None else None
+        if cached is not None:
+            logger.info("Reusing cached response for problem #%d", problem.id)
+            content, stats = cached, CACHED_STATS
+        else:
+            content, stats = await self._complete(problem, prompt)
+            log_generation(problem, self._model, stats)
+
+        solution = self._solution(problem, previous_attempts, content, stats)
+        if cached is None and self._cache is not None:
+            self._cache.put(key, content)
+        return solution
+
+    def _key(self, prompt: PromptParts, sample: int) -> str:
+        params: dict[str, int] = {"max_tokens": MAX_TOKENS}
+        if sample:
+            # Each extra candidate is its own call, so it gets its own cache entry.
+            params["sample"] = sample
+        return response_key("claude", self._model, SYSTEM_PROMPT, prompt.text, params)
+
+    def _request(self, prompt: PromptParts) -> dict[str, Any]:
+        return {
+            "model": self._model,
+            "max_tokens": MAX_TOKENS,
+            "system": [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": EPHEMERAL}],
+            "messages": [{"role": "user", "content": _content_blocks(prompt)}],
+        }
+
+    def _solution(
+        self,
+        problem: Problem,
+        previous_attempts: list[SubmissionResult],
+        content: str,
+        stats: GenerationStats,
+    ) -> Solution:
+        code = extract_code(content, starter_class(problem))
         reasoning = extract_reasoning(content)
 
         if not code.strip():
@@ -59,4 +216,74 @@ class ClaudeGenerator:
             model_used=self._model,
             attempt=len(previous_attempts) + 1,
             reasoning=reasoning,
+            stats=stats,
+        )
+
+    async def _complete(self, problem: Problem, prompt: PromptParts) -> tuple[str, GenerationStats]:
+        request = self._request(prompt)
+        try:
+            return await limited(
+                self._limiter,
+                request_tokens(prompt.text),
+                lambda: self._complete_once(request, starter_class(problem)),
+            )
+        except APIError as e:
+            raise AIGenerationError(f"Claude API call failed for problem #{problem.id}: {e}") from e
+
+    async def _complete_once(
+        self, request: dict[str, Any], class_name: str
+    ) -> tuple[str, GenerationStats]:
+        watcher = CodeBlockWatcher(class_name)
+        if not self._stream:
+            response = await self._client.messages.create(**request)
+            text_blocks = [b.text for b in response.content if b.type == "text"]
+            watcher.feed(text_blocks[0] if text_blocks else "")
+            usage = response.usage
+            stats = watcher.finish(usage.output_tokens, prompt=_prompt_usage(usage))
+            return watcher.text, stats
+
+        async with self._client.messages.stream(**request) as stream:
+            if self._limiter is not None:
+                self._limiter.observe_headers(response_headers(stream))
+            async for chunk in stream.text_stream:
+                if watcher.feed(chunk):
+                    # Leaving the block closes the connection and ends the generation.
+                    # Prompt usage arrives with the first event, so it is already known.
+                    usage = stream.current_message_snapshot.usage
+                    stats = watcher.finish(None, True, _prompt_usage(usage))
+                    return watcher.text, stats
+            final = await stream.get_final_message()
+        return watcher.text, watcher.finish(
+            final.usage.output_tokens, prompt=_prompt_usage(final.usage)
         )
+
+
+def _custom_id(problem: Problem) -> str:
+    return f"problem-{problem.id}"
+
+
+def _content_blocks(prompt: PromptParts) -> list[dict[str, Any]]:
+    """The user turn as text blocks with cache breakpoints.
+
+    The problem statement is identical on every retry, so it is one breakpoint;
+    the newest attempt is another, so the next retry reuses everything before
+    its own new attempt. Together with the system prompt that is three of the
+    four breakpoints a request may carry.
+    """
+    blocks: list[dict[str, Any]] = [
+        {"type": "text", "text": prompt.problem, "cache_control": EPHEMERAL}
+    ]
+    blocks.extend({"type": "text", "text": "\n" + attempt} for attempt in prompt.attempts)
+    if prompt.attempts:
+        blocks[-1]["cache_control"] = EPHEMERAL
+    if prompt.closing:
+        blocks.append({"type": "text", "text": "\n" + prompt.closing})
+    return blocks
+
+
+def _prompt_usage(usage: Any) -> PromptUsage:
+    return PromptUsage(
+        input_tokens=usage.input_tokens,
+        cache_read_tokens=getattr(usage, "cache_read_input_tokens", None),
+        cache_write_tokens=getattr(usage, "cache_creation_input_tokens", None),
+    )
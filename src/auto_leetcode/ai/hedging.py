@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from auto_leetcode.ai.protocol import SolutionGenerator
+from auto_leetcode.errors import AIGenerationError
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.submission import SubmissionResult
+
+logger = logging.getLogger(__name__)
+
+HEDGE_PERCENTILE = 0.95
+# Until the primary has this many timed calls, hedge after a fixed delay instead.
+MIN_LATENCY_SAMPLES = 5
+LATENCY_WINDOW = 50
+DEFAULT_HEDGE_SECONDS = 60.0
+FAILOVER_AFTER_ERRORS = 3
+FAILOVER_COOLDOWN_SECONDS = 120.0
+
+
+class LatencyTracker:
+    """Durations of a generator's most recent calls."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """Nearest-rank percentile, or None while there are too few samples."""
+        if len(self._samples) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+class HedgedGenerator:
+    """Backs a primary generator with a secondary one.
+
+    A primary call still running at its recent p95 latency gets a duplicate
+    sent to the secondary; whichever succeeds first is used and the other is
+    cancelled. A failed primary call is retried on the secondary, and after
+    ``failover_after`` consecutive failures the primary is skipped for
+    ``cooldown`` seconds. With ``hedge`` off only the failover applies.
+    """
+
+    def __init__(
+        self,
+        primary: SolutionGenerator,
+        secondary: SolutionGenerator,
+        hedge: bool = True,
+        percentile: float = HEDGE_PERCENTILE,
+        default_delay: float = DEFAULT_HEDGE_SECONDS,
+        failover_after: int = FAILOVER_AFTER_ERRORS,
+        cooldown: float = FAILOVER_COOLDOWN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._primary = primary
+        self._secondary = secondary
+        self._hedge = hedge
+        self._percentile = percentile
+        self._default_delay = default_delay
+        self._failover_after = failover_after
+        self._cooldown = cooldown
+        self._clock = clock
+        self.latency = LatencyTracker()
+        self._errors = 0
+        self._failed_over_until = 0.0
+
+    @property
+    def hedge_delay(self) -> float:
+        """Seconds to wait on the primary before sending the duplicate."""
+        learned = self.latency.percentile(self._percentile)
+        return learned if learned is not None else self._default_delay
+
+    async def generate(
+        self,
+        problem: Problem,
+        previous_attempts: list[SubmissionResult],
+    ) -> Solution:
+        return await self._call(
+            problem, lambda generator: generator.generate(problem, previous_attempts)
+        )
+
+    async def generate_many(
+        self,
+        problem: Problem,
+        previous_attempts: list[SubmissionResult],
+        n: int,
+    ) -> list[Solution]:
+        return await self._call(
+            problem, lambda generator: generator.generate_many(problem, previous_attempts, n)
+        )
+
+    async def _call[T: (
+        Solution,
+        list[Solution],
+    )](self, problem: Problem, call: Callable[[SolutionGenerator], Awaitable[T]]) -> T:
+        if self._clock() < self._failed_over_until:
+            logger.info("Problem #%d: primary model failed over, using the secondary", problem.id)
+            return await call(self._secondary)
+
+        primary = asyncio.ensure_future(self._timed(call(self._primary)))
+        delay = self.hedge_delay if self._hedge else None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if not done:
+            logger.info(
+                "Problem #%d: primary model still running after %.1fs, hedging",
+                problem.id,
+                delay,
+            )
+            secondary = asyncio.ensure_future(call(self._secondary))
+            return await self._race(problem, primary, secondary)
+
+        try:
+            return primary.result()
+        except AIGenerationError as e:
+            logger.warning(
+                "Problem #%d: primary model failed (%s), using the secondary", problem.id, e
+            )
+            return await call(self._secondary)
+
+    async def _race[T: (
+        Solution,
+        list[Solution],
+    )](self, problem: Problem, primary: asyncio.Future[T], secondary: asyncio.Future[T]) -> T:
+        pending = {primary, secondary}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        continue
+                    if future is secondary:
+                        logger.info("Problem #%d: the hedged request answered first", problem.id)
+                    return future.result()
+            # Both failed; report the primary's error.
+            return primary.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            # Let the loser close its connection before moving on.
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _timed[T: (Solution, list[Solution])](self, call: Awaitable[T]) -> T:
+        started = self._clock()
+        try:
+            result = await call
+        except asyncio.CancelledError:
+            # A primary that lost to the hedge took at least this long; leaving it out
+            # would keep only the fast calls and pull the percentile ever lower.
+            self.latency.observe(self._clock() - started)
+            raise
+        except AIGenerationError:
+            self._errors += 1
+            if self._errors >= self._failover_after:
+                self._failed_over_until = self._clock() + self._cooldown
+                logger.warning(
+                    "Primary model failed %d times in a row; using the secondary for %.0fs",
+                    self._errors,
+                    self._cooldown,
+                )
+            raise
+        self._errors = 0
+        solutions = result if isinstance(result, list) else [result]
+        # Cache hits return instantly and would drag the percentile toward zero.
+        if not any(s.stats is not None and s.stats.cached for s in solutions):
+            self.latency.observe(self._clock() - started)
+        return result
@@ -1,68 +1,342 @@
 from __future__ import annotations
 
+import json
 import logging
+from collections.abc import Sequence
+from typing import Any, Literal
 
 from openai import APIError, AsyncOpenAI
 
 from auto_leetcode.ai.prompt import (
+    PROMPT_TOKEN_BUDGET,
     SYSTEM_PROMPT,
-    build_user_prompt,
+    build_prompt_parts,
+    estimate_tokens,
     extract_code,
     extract_reasoning,
+    log_prompt,
+    starter_class,
+)
+from auto_leetcode.ai.rate_limiter import (
+    AIRateLimiter,
+    limited,
+    request_tokens,
+    response_headers,
+)
+from auto_leetcode.ai.streaming import (
+    CACHED_STATS,
+    CodeBlockWatcher,
+    PromptUsage,
+    log_generation,
 )
 from auto_leetcode.errors import AIGenerationError
+from auto_leetcode.models.batch import BatchProgress
 from auto_leetcode.models.problem import Problem
-from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.solution import GenerationStats, Solution
 from auto_leetcode.models.submission import SubmissionResult
+from auto_leetcode.storage.response_cache import ResponseCache, response_key
 
 logger = logging.getLogger(__name__)
 
+TEMPERATURE = 0.2
+# Candidates drawn together need more spread than a single best guess.
+CANDIDATE_TEMPERATURE = 0.8
+BATCH_ENDPOINT: Literal["/v1/chat/completions"] = "/v1/chat/completions"
+BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
 
 class OpenAIGenerator:
-    def __init__(self, api_key: str, base_url: str, model: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        model: str,
+        cache: ResponseCache | None = None,
+        stream: bool = True,
+        prompt_budget: int = PROMPT_TOKEN_BUDGET,
+        limiter: AIRateLimiter | None = None,
+    ) -> None:
         self._client = AsyncOpenAI(api_key=api_key, base_url=base_url)
         self._model = model
+        self._cache = cache
+        self._stream = stream
+        self._prompt_budget = prompt_budget
+        self._limiter = limiter
 
     async def generate(
         self,
         problem: Problem,
         previous_attempts: list[SubmissionResult],
     ) -> Solution:
-        user_prompt = build_user_prompt(problem, previous_attempts)
+        prompt = build_prompt_parts(problem, previous_attempts, self._prompt_budget)
+        log_prompt(problem, prompt)
+        user_prompt = prompt.text
+        key = response_key(
+            "openai", self._model, SYSTEM_PROMPT, user_prompt, {"temperature": TEMPERATURE}
+        )
+        cached = self._cache.get(key) if self._cache is not None else None
+        if cached is not None:
+            logger.info("Reusing cached response for problem #%d", problem.id)
+            content, stats = cached, CACHED_STATS
+        else:
+            content, stats = (await self._complete(problem, user_prompt, 1, TEMPERATURE))[0]
+            log_generation(problem, self._model, stats)
+
+        solution = self._solution(problem, previous_attempts, content, stats)
+        if solution is None:
+            raise AIGenerationError(f"Empty code generated for problem #{problem.id}")
+        if cached is None and self._cache is not None:
+            self._cache.put(key, content)
+        return solution
+
+    async def generate_many(
+        self,
+        problem: Problem,
+        previous_attempts: list[SubmissionResult],
+        n: int,
+    ) -> list[Solution]:
+        """Sample ``n`` choices from a single request using the ``n`` parameter."""
+        prompt = build_prompt_parts(problem, previous_attempts, self._prompt_budget)
+        log_prompt(problem, prompt)
+        user_prompt = prompt.text
+        key = response_key(
+            "openai",
+            self._model,
+            SYSTEM_PROMPT,
+            user_prompt,
+            {"temperature": CANDIDATE_TEMPERATURE, "n": n},
+        )
+        cached = self._cache.get(key) if self._cache is not None else None
+        if cached is not None:
+            logger.info("Reusing %d cached candidates for problem #%d", n, problem.id)
+            completions = [(content, CACHED_STATS) for content in json.loads(cached)]
+        else:
+            completions = await self._complete(problem, user_prompt, n, CANDIDATE_TEMPERATURE)
+            for _, stats in completions:
+                log_generation(problem, self._model, stats)
+
+        solutions = [
+            solution
+            for content, stats in completions
+            if (solution := self._solution(problem, previous_attempts, content, stats)) is not None
+        ]
+        if not solutions:
+            raise AIGenerationError(f"Empty code generated for problem #{problem.id}")
+        if cached is None and self._cache is not None:
+            self._cache.put(key, json.dumps([content for content, _ in completions]))
+        return solutions
+
+    async def submit_batch(self, problems: Sequence[Problem]) -> str:
+        """Upload first-attempt requests as JSONL and queue them through the Batch API."""
+        lines = []
+        for problem in problems:
+            prompt = build_prompt_parts(problem, [], self._prompt_budget)
+            lines.append(
+                json.dumps(
+                    {
+                        "custom_id": _custom_id(problem),
+                        "method": "POST",
+                        "url": BATCH_ENDPOINT,
+                        "body": self._request(prompt.text, 1, TEMPERATURE),
+                    }
+                )
+            )
+        payload = ("\n".join(lines) + "\n").encode()
+        try:
+            upload = await self._client.files.create(file=("batch.jsonl", payload), purpose="batch")
+            batch = await self._client.batches.create(
+                input_file_id=upload.id,
+                endpoint=BATCH_ENDPOINT,
+                completion_window="24h",
+            )
+        except APIError as e:
+            raise AIGenerationError(f"OpenAI batch submission failed: {e}") from e
+        return batch.id
+
+    async def batch_progress(self, batch_id: str) -> BatchProgress:
+        try:
+            batch = await self._client.batches.retrieve(batch_id)
+        except APIError as e:
+            raise AIGenerationError(f"OpenAI batch {batch_id} lookup failed: {e}") from e
+        counts = batch.request_counts
+        return BatchProgress(
+            done=batch.status in BATCH_FINAL_STATUSES,
+            succeeded=counts.completed if counts else 0,
+            failed=counts.failed if counts else 0,
+            total=counts.total if counts else 0,
+        )
+
+    async def batch_results(self, batch_id: str, problems: Sequence[Problem]) -> list[Solution]:
+        by_id = {_custom_id(problem): problem for problem in problems}
+        try:
+            batch = await self._client.batches.retrieve(batch_id)
+            if batch.output_file_id is None:
+                return []
+            output = await self._client.files.content(batch.output_file_id)
+        except APIError as e:
+            raise AIGenerationError(f"OpenAI batch {batch_id} results failed: {e}") from e
+
+        solutions = []
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            problem = by_id.get(entry.get("custom_id"))
+            response = entry.get("response") or {}
+            if problem is None or response.get("status_code") != 200:
+                continue
+            body = response["body"]
+            content = body["choices"][0]["message"]["content"] or ""
+            usage = body.get("usage") or {}
+            output_tokens = usage.get("completion_tokens")
+            stats = GenerationStats(
+                seconds=0.0,
+                time_to_code=None,
+                output_tokens=(
+                    output_tokens if output_tokens is not None else estimate_tokens(content)
+                ),
+                tokens_estimated=output_tokens is None,
+                input_tokens=usage.get("prompt_tokens"),
+                batched=True,
+            )
+            solution = self._solution(problem, [], content, stats)
+            if solution is None:
+                logger.warning("Discarding empty batch result for problem #%d", problem.id)
+                continue
+            solutions.append(solution)
+            if self._cache is not None:
+                prompt = build_prompt_parts(problem, [], self._prompt_budget)
+                key = response_key(
+                    "openai",
+                    self._model,
+                    SYSTEM_PROMPT,
+                    prompt.text,
+                    {"temperature": TEMPERATURE},
+                )
+                self._cache.put(key, content)
+        return solutions
+
+    def _request(self, user_prompt: str, n: int, temperature: float) -> dict[str, Any]:
+        # The system prompt and the problem statement open every request for this
+        # problem byte for byte, which is what OpenAI's automatic prefix caching keys on.
+        return {
+            "model": self._model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+            "temperature": temperature,
+            # Some OpenAI-compatible endpoints reject ``n``, so only send it when sampling.
+            **({"n": n} if n > 1 else {}),
+        }
 
+    async def _complete(
+        self, problem: Problem, user_prompt: str, n: int, temperature: float
+    ) -> list[tuple[str, GenerationStats]]:
+        request = self._request(user_prompt, n, temperature)
+        complete = self._complete_streaming if self._stream else self._complete_blocking
+        class_name = starter_class(problem)
         try:
-            response = await self._client.chat.completions.create(
-                model=self._model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.2,
+            completions = await limited(
+                self._limiter,
+                request_tokens(user_prompt, n),
+                lambda: complete(request, n, class_name),
             )
         except APIError as e:
             raise AIGenerationError(
                 f"OpenAI API call failed for problem #{problem.id}: {e}"
             ) from e
 
-        if not response.choices:
+        if not completions:
             raise AIGenerationError(
                 f"No choices returned for problem #{problem.id}"
             )
+        return completions
 
-        content = response.choices[0].message.content or ""
-        code = extract_code(content)
-        reasoning = extract_reasoning(content)
+    async def _complete_blocking(
+        self, request: dict[str, Any], n: int, class_name: str
+    ) -> list[tuple[str, GenerationStats]]:
+        response = await self._client.chat.completions.create(**request)
+        prompt = _prompt_usage(response.usage)
+        completions = []
+        for index, choice in enumerate(response.choices):
+            watcher = CodeBlockWatcher(class_name)
+            watcher.feed(choice.message.content or "")
+            tokens = response.usage.completion_tokens if response.usage and n == 1 else None
+            # Prompt tokens are billed once per request, so only the first choice carries them.
+            stats = watcher.finish(tokens, prompt=prompt if index == 0 else None)
+            completions.append((watcher.text, stats))
+        return completions
 
-        if not code.strip():
-            raise AIGenerationError(
-                f"Empty code generated for problem #{problem.id}"
+    async def _complete_streaming(
+        self, request: dict[str, Any], n: int, class_name: str
+    ) -> list[tuple[str, GenerationStats]]:
+        """Read choices as they stream and hang up once each has a complete code block.
+
+        OpenAI sends usage, including cached prompt tokens, in a final chunk, so
+        only streams read to the end report it; hanging up early forgoes it.
+        """
+        watchers = [CodeBlockWatcher(class_name) for _ in range(n)]
+        done: set[int] = set()
+        usage: Any = None
+        stream = await self._client.chat.completions.create(
+            **request, stream=True, stream_options={"include_usage": True}
+        )
+        if self._limiter is not None:
+            self._limiter.observe_headers(response_headers(stream))
+        try:
+            async for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                for choice in chunk.choices:
+                    text = choice.delta.content
+                    if choice.index < n and text and watchers[choice.index].feed(text):
+                        done.add(choice.index)
+                if len(done) == n:
+                    break
+        finally:
+            await stream.close()
+        stopped_early = len(done) == n
+        prompt = _prompt_usage(usage)
+        tokens = usage.completion_tokens if usage is not None and n == 1 else None
+        return [
+            (
+                watcher.text,
+                watcher.finish(tokens, stopped_early, prompt if index == 0 else None),
             )
+            for index, watcher in enumerate(watchers)
+        ]
 
+    def _solution(
+        self,
+        problem: Problem,
+        previous_attempts: list[SubmissionResult],
+        content: str,
+        stats: GenerationStats,
+    ) -> Solution | None:
+        code = extract_code(content, starter_class(problem))
+        if not code.strip():
+            return None
         return Solution(
             problem_id=problem.id,
             code=code,
             language="python3",
             model_used=self._model,
             attempt=len(previous_attempts) + 1,
-            reasoning=reasoning,
+            reasoning=extract_reasoning(content),
+            stats=stats,
         )
+
+
+def _custom_id(problem: Problem) -> str:
+    return f"problem-{problem.id}"
+
+
+def _prompt_usage(usage: Any) -> PromptUsage | None:
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    return PromptUsage(
+        input_tokens=usage.prompt_tokens,
+        cache_read_tokens=getattr(details, "cached_tokens", None),
+    )
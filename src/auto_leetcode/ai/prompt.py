@@ -1,8 +1,13 @@
+import logging
 import re
+from dataclasses import dataclass
 
+from auto_leetcode.checks.static import expected_interface
 from auto_leetcode.models.problem import Problem
 from auto_leetcode.models.submission import SubmissionResult
 
+logger = logging.getLogger(__name__)
+
 SYSTEM_PROMPT = (
     "You are a competitive programming expert. "
     "Given a LeetCode problem, first explain your thought process and approach, "
@@ -19,40 +24,185 @@ SYSTEM_PROMPT = (
 )
 
 
+# Estimated tokens a user prompt may use before older attempts are compacted.
+PROMPT_TOKEN_BUDGET = 6000
+# Longer error messages keep their head and tail; tracebacks end with the exception.
+MAX_ERROR_CHARS = 2000
+DIGEST_CHARS = 160
+
+
+@dataclass(frozen=True)
+class PromptParts:
+    """A user prompt split where retries diverge.
+
+    ``problem`` (statement and starter code) is byte-identical on every attempt
+    at a problem, so providers can cache it as a prefix; each earlier attempt
+    adds one entry to ``attempts``. ``compacted`` counts the oldest attempts
+    reduced to a digest to fit the token budget, and ``uncompacted_tokens`` is
+    the estimate for the prompt with every attempt verbatim.
+    """
+
+    problem: str
+    attempts: tuple[str, ...] = ()
+    closing: str = ""
+    compacted: int = 0
+    uncompacted_tokens: int = 0
+
+    @property
+    def text(self) -> str:
+        return "\n".join([self.problem, *self.attempts, *([self.closing] if self.closing else [])])
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+def build_prompt_parts(
+    problem: Problem,
+    previous_attempts: list[SubmissionResult],
+    token_budget: int = PROMPT_TOKEN_BUDGET,
+) -> PromptParts:
+    """Split prompt for ``problem``, compacting the oldest attempts while over budget.
+
+    Errors are trimmed to ``MAX_ERROR_CHARS``. The latest attempt always stays
+    verbatim; older ones become a status line with a short error digest, oldest
+    first, only as far as needed, so short retry chains keep a stable prefix.
+    """
+    statement = "\n".join(
+        [
+            f"Problem #{problem.id}: {problem.title}",
+            f"Difficulty: {problem.difficulty}\n",
+            problem.description,
+            f"\nStarter code:\n```python\n{problem.code_snippet}\n```",
+        ]
+    )
+    closing = "\nFix the issues and provide a corrected solution." if previous_attempts else ""
+    verbatim = PromptParts(
+        statement,
+        tuple(_render_attempt(attempt, MAX_ERROR_CHARS) for attempt in previous_attempts),
+        closing,
+    )
+    uncompacted = PromptParts(
+        statement, tuple(_render_attempt(attempt, None) for attempt in previous_attempts), closing
+    )
+
+    attempts = list(verbatim.attempts)
+    compacted = 0
+    while (
+        compacted < len(attempts) - 1
+        and PromptParts(statement, tuple(attempts), closing).tokens > token_budget
+    ):
+        attempts[compacted] = _digest_attempt(previous_attempts[compacted])
+        compacted += 1
+    return PromptParts(statement, tuple(attempts), closing, compacted, uncompacted.tokens)
+
+
 def build_user_prompt(
     problem: Problem,
     previous_attempts: list[SubmissionResult],
+    token_budget: int = PROMPT_TOKEN_BUDGET,
 ) -> str:
-    parts = [
-        f"Problem #{problem.id}: {problem.title}",
-        f"Difficulty: {problem.difficulty}\n",
-        problem.description,
-        f"\nStarter code:\n```python\n{problem.code_snippet}\n```",
-    ]
-
-    for attempt in previous_attempts:
-        error_info = ""
-        if attempt.error_message:
-            error_info = f"\nError: {attempt.error_message}"
-        parts.append(
-            f"\nPrevious attempt failed with: {attempt.status.value}"
-            f"{error_info}"
-            f"\nCode:\n```python\n{attempt.solution.code}\n```"
+    return build_prompt_parts(problem, previous_attempts, token_budget).text
+
+
+def log_prompt(problem: Problem, prompt: PromptParts) -> None:
+    if prompt.compacted:
+        logger.info(
+            "Problem #%d prompt: ~%d tokens after compacting %d older attempts (~%d saved)",
+            problem.id,
+            prompt.tokens,
+            prompt.compacted,
+            prompt.uncompacted_tokens - prompt.tokens,
+        )
+    else:
+        logger.info(
+            "Problem #%d prompt: ~%d tokens (%d previous attempts)",
+            problem.id,
+            prompt.tokens,
+            len(prompt.attempts),
         )
 
-    if previous_attempts:
-        parts.append("\nFix the issues and provide a corrected solution.")
 
-    return "\n".join(parts)
+def trim_error(message: str, limit: int = MAX_ERROR_CHARS) -> str:
+    """Cut the middle out of a long error, keeping where it started and how it ended."""
+    if len(message) <= limit:
+        return message
+    head = message[: limit // 3]
+    tail = message[-(limit - len(head)) :]
+    return f"{head}\n... ({len(message) - len(head) - len(tail)} characters trimmed) ...\n{tail}"
 
 
-def extract_code(text: str) -> str:
-    match = re.search(r"```(?:python3?|py)?\s*\n(.*?)```", text, re.DOTALL)
-    if match:
-        return match.group(1).strip()
+def _render_attempt(attempt: SubmissionResult, error_limit: int | None) -> str:
+    error_info = ""
+    if attempt.error_message:
+        message = attempt.error_message
+        if error_limit is not None:
+            message = trim_error(message, error_limit)
+        error_info = f"\nError: {message}"
+    return (
+        f"\nPrevious attempt failed with: {attempt.status.value}"
+        f"{error_info}"
+        f"\nCode:\n```python\n{attempt.solution.code}\n```"
+    )
+
+
+def _digest_attempt(attempt: SubmissionResult) -> str:
+    digest = ""
+    if attempt.error_message:
+        lines = [line.strip() for line in attempt.error_message.splitlines() if line.strip()]
+        # A traceback's last line names the exception; other messages lead with the point.
+        line = ""
+        if lines:
+            line = lines[-1] if "Traceback" in lines[0] else lines[0]
+        if len(line) > DIGEST_CHARS:
+            line = line[: DIGEST_CHARS - 3] + "..."
+        digest = f": {line}" if line else ""
+    return f"\nEarlier attempt (code omitted) failed with: {attempt.status.value}{digest}"
+
+
+CODE_BLOCK = re.compile(r"```(?:python3?|py)?\s*\n(.*?)```", re.DOTALL)
+CLASS_DEFINITION = re.compile(r"^class \w+", re.MULTILINE)
+
+
+def starter_class(problem: Problem) -> str:
+    """The class the starter code asks for; ``Solution`` unless it is a design problem."""
+    interface = expected_interface(problem.code_snippet)
+    return interface[0] if interface is not None else "Solution"
+
+
+def has_code_block(text: str, class_name: str = "Solution") -> bool:
+    """True once ``text`` holds a closed code block that defines ``class_name``.
+
+    Usage examples and helper classes often come in their own fence before the
+    solution, so the first closed block alone is not enough to stop reading.
+    """
+    return any(_defines(block, class_name) for block in CODE_BLOCK.findall(text))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English prose and code (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def extract_code(text: str, class_name: str = "Solution") -> str:
+    """The fenced block defining ``class_name``, else the first defining any class,
+    else the first block, else ``text``."""
+    blocks = CODE_BLOCK.findall(text)
+    for block in blocks:
+        if _defines(block, class_name):
+            return str(block).strip()
+    for block in blocks:
+        if CLASS_DEFINITION.search(block):
+            return str(block).strip()
+    if blocks:
+        return str(blocks[0]).strip()
     return text.strip()
 
 
+def _defines(block: str, class_name: str) -> bool:
+    return re.search(rf"^class {re.escape(class_name)}\b", block, re.MULTILINE) is not None
+
+
 def extract_reasoning(text: str) -> str:
     match = re.search(r"##\s*Approach\s*\n(.*?)(?=##\s*Solution|```)", text, re.DOTALL)
     if match:
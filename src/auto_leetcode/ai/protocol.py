@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from typing import Protocol
+from collections.abc import Sequence
+from typing import Protocol, runtime_checkable
 
+from auto_leetcode.models.batch import BatchProgress
 from auto_leetcode.models.problem import Problem
 from auto_leetcode.models.solution import Solution
 from auto_leetcode.models.submission import SubmissionResult
@@ -13,3 +15,27 @@ class SolutionGenerator(Protocol):
         problem: Problem,
         previous_attempts: list[SubmissionResult],
     ) -> Solution: ...
+
+    async def generate_many(
+        self,
+        problem: Problem,
+        previous_attempts: list[SubmissionResult],
+        n: int,
+    ) -> list[Solution]:
+        """Up to ``n`` independently sampled solutions for one prompt."""
+        ...
+
+
+@runtime_checkable
+class BatchGenerator(Protocol):
+    """A generator that can also produce first attempts through a provider batch API."""
+
+    async def submit_batch(self, problems: Sequence[Problem]) -> str:
+        """Queue a first-attempt request per problem and return the batch ID."""
+        ...
+
+    async def batch_progress(self, batch_id: str) -> BatchProgress: ...
+
+    async def batch_results(self, batch_id: str, problems: Sequence[Problem]) -> list[Solution]:
+        """Solutions for the batch's succeeded requests, also stored in the response cache."""
+        ...
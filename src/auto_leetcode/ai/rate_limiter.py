@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from auto_leetcode.ai.prompt import SYSTEM_PROMPT, estimate_tokens
+from auto_leetcode.leetcode.rate_limiter import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THROTTLE_PAUSE_SECONDS = 10.0
+MAX_THROTTLE_RETRIES = 5
+# Output budgeted per choice before the real count is known; solutions are usually shorter.
+EXPECTED_OUTPUT_TOKENS = 1000
+
+
+class _MinuteBucket:
+    """A per-minute quota that refills continuously."""
+
+    def __init__(self, per_minute: float, now: float) -> None:
+        self.per_minute = per_minute
+        self.available = per_minute
+        self._updated = now
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self.available = min(self.per_minute, self.available + elapsed * self.per_minute / 60)
+        self._updated = now
+
+    def wait(self, amount: float) -> float:
+        # A request larger than the whole quota waits for a full bucket, not forever.
+        deficit = min(amount, self.per_minute) - self.available
+        return deficit * 60 / self.per_minute if deficit > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        self.available -= min(amount, self.per_minute)
+
+
+class AIRateLimiter:
+    """Keeps one model's calls inside its request, token and concurrency limits.
+
+    A call waits for a concurrency slot, one request and its estimated tokens
+    from per-minute buckets, so a saturated quota queues calls instead of
+    failing them. The concurrency limit follows AIMD: each success raises it
+    by ``increase`` up to ``max_concurrency``, each 429 halves it and pauses
+    new calls for the server's ``Retry-After``. Limits and remaining quota in
+    the provider's rate-limit headers override the configured ones.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_concurrency: int = 8,
+        increase: float = 0.25,
+        decrease: float = 0.5,
+        max_retries: int = MAX_THROTTLE_RETRIES,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        now = clock()
+        quotas = {"requests": requests_per_minute, "tokens": tokens_per_minute}
+        self._buckets: dict[str, _MinuteBucket] = {
+            kind: _MinuteBucket(quota, now) for kind, quota in quotas.items() if quota
+        }
+        self._concurrency = float(max_concurrency)
+        self._max_concurrency = max_concurrency
+        self._increase = increase
+        self._decrease = decrease
+        self._max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._active = 0
+        self._paused_until = 0.0
+        self._freed = asyncio.Event()
+
+    @property
+    def concurrency(self) -> int:
+        """Calls currently allowed in flight."""
+        return max(1, int(self._concurrency))
+
+    async def run[T](self, tokens: int, call: Callable[[], Awaitable[T]]) -> T:
+        """Run ``call`` within the limits, retrying it when the provider answers 429."""
+        for try_number in range(1, self._max_retries + 1):
+            await self.acquire(tokens)
+            try:
+                result = await call()
+            except Exception as e:
+                # Both SDKs raise an APIStatusError subclass carrying the response.
+                if getattr(e, "status_code", None) != 429 or try_number == self._max_retries:
+                    raise
+                self.on_throttle(response_headers(e))
+            else:
+                self.on_success()
+                return result
+            finally:
+                self._release()
+        raise AssertionError("unreachable")
+
+    async def acquire(self, tokens: int) -> None:
+        while True:
+            now = self._clock()
+            if now < self._paused_until:
+                await self._sleep(self._paused_until - now)
+                continue
+            if self._active >= self.concurrency:
+                self._freed.clear()
+                await self._freed.wait()
+                continue
+            amounts = {"requests": 1, "tokens": tokens}
+            wait = 0.0
+            for kind, bucket in self._buckets.items():
+                bucket.refill(now)
+                wait = max(wait, bucket.wait(amounts[kind]))
+            if wait > 0:
+                await self._sleep(wait)
+                continue
+            for kind, bucket in self._buckets.items():
+                bucket.take(amounts[kind])
+            self._active += 1
+            return
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Adopt the quota and remaining budget a response reported."""
+        now = self._clock()
+        for kind in ("requests", "tokens"):
+            limit = _header_number(
+                headers, f"x-ratelimit-limit-{kind}", f"anthropic-ratelimit-{kind}-limit"
+            )
+            remaining = _header_number(
+                headers, f"x-ratelimit-remaining-{kind}", f"anthropic-ratelimit-{kind}-remaining"
+            )
+            bucket = self._buckets.get(kind)
+            if bucket is None and limit:
+                bucket = self._buckets[kind] = _MinuteBucket(limit, now)
+            if bucket is None:
+                continue
+            bucket.refill(now)
+            if limit:
+                bucket.per_minute = limit
+            if remaining is not None:
+                bucket.available = min(bucket.available, remaining)
+
+    def on_success(self) -> None:
+        self._concurrency = min(self._max_concurrency, self._concurrency + self._increase)
+
+    def on_throttle(self, headers: Mapping[str, str]) -> None:
+        retry_after = parse_retry_after(headers.get("retry-after"))
+        pause = retry_after if retry_after is not None else DEFAULT_THROTTLE_PAUSE_SECONDS
+        self._concurrency = max(1.0, self._concurrency * self._decrease)
+        self._paused_until = max(self._paused_until, self._clock() + pause)
+        self.observe_headers(headers)
+        logger.warning(
+            "AI provider returned 429, pausing %.1fs and allowing %d concurrent calls",
+            pause,
+            self.concurrency,
+        )
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._freed.set()
+
+
+def response_headers(source: Any) -> Mapping[str, str]:
+    """Headers of the HTTP response behind an SDK stream or error, if it exposes one."""
+    return _headers(getattr(source, "response", None))
+
+
+def _headers(response: Any) -> Mapping[str, str]:
+    headers = getattr(response, "headers", None)
+    return headers if headers is not None else {}
+
+
+def _header_number(headers: Mapping[str, str], *names: str) -> float | None:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+async def limited[T](
+    limiter: AIRateLimiter | None, tokens: int, call: Callable[[], Awaitable[T]]
+) -> T:
+    """``limiter.run``, or just ``call`` when no limiter is configured."""
+    if limiter is None:
+        return await call()
+    return await limiter.run(tokens, call)
+
+
+def request_tokens(user_prompt: str, choices: int = 1) -> int:
+    """Tokens a call is budgeted before its usage is known: the prompt plus typical output."""
+    return (
+        estimate_tokens(SYSTEM_PROMPT)
+        + estimate_tokens(user_prompt)
+        + (choices * EXPECTED_OUTPUT_TOKENS)
+    )
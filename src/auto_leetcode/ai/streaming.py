@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from auto_leetcode.ai.prompt import estimate_tokens, has_code_block
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import GenerationStats
+
+logger = logging.getLogger(__name__)
+
+CACHED_STATS = GenerationStats(seconds=0.0, time_to_code=0.0, output_tokens=0, cached=True)
+
+
+@dataclass(frozen=True)
+class PromptUsage:
+    """Prompt-side token counts as reported by the provider."""
+
+    input_tokens: int | None = None
+    cache_read_tokens: int | None = None
+    cache_write_tokens: int | None = None
+
+
+class CodeBlockWatcher:
+    """Accumulates streamed text and notices when the code block is complete.
+
+    Generators stop reading the stream as soon as ``feed`` returns True, since
+    whatever the model writes after the closing fence is never used.
+    """
+
+    def __init__(
+        self, class_name: str = "Solution", clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._class_name = class_name
+        self._clock = clock
+        self._started = clock()
+        self._parts: list[str] = []
+        self._time_to_code: float | None = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> bool:
+        self._parts.append(chunk)
+        if (
+            self._time_to_code is None
+            and "`" in chunk
+            and has_code_block(self.text, self._class_name)
+        ):
+            self._time_to_code = self._clock() - self._started
+        return self._time_to_code is not None
+
+    def finish(
+        self,
+        output_tokens: int | None,
+        stopped_early: bool = False,
+        prompt: PromptUsage | None = None,
+    ) -> GenerationStats:
+        prompt = prompt or PromptUsage()
+        return GenerationStats(
+            seconds=self._clock() - self._started,
+            time_to_code=self._time_to_code,
+            output_tokens=estimate_tokens(self.text) if output_tokens is None else output_tokens,
+            tokens_estimated=output_tokens is None,
+            stopped_early=stopped_early,
+            input_tokens=prompt.input_tokens,
+            cache_read_tokens=prompt.cache_read_tokens,
+            cache_write_tokens=prompt.cache_write_tokens,
+        )
+
+
+def log_generation(problem: Problem, model: str, stats: GenerationStats) -> None:
+    code_at = f"{stats.time_to_code:.1f}s" if stats.time_to_code is not None else "never"
+    prompt = ""
+    if stats.input_tokens is not None:
+        prompt = (
+            f"{stats.input_tokens} input tokens, {stats.cache_read_tokens or 0} read from "
+            f"cache, {stats.cache_write_tokens or 0} written to cache; "
+        )
+    logger.info(
+        "Problem #%d: %s answered in %.1fs (code at %s, %s%s%d output tokens%s)",
+        problem.id,
+        model,
+        stats.seconds,
+        code_at,
+        prompt,
+        "~" if stats.tokens_estimated else "",
+        stats.output_tokens,
+        ", stream stopped early" if stats.stopped_early else "",
+    )
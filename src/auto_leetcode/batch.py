@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+
+from auto_leetcode.ai.protocol import BatchGenerator, SolutionGenerator
+from auto_leetcode.config import Config
+from auto_leetcode.leetcode.client import PROBLEM_BATCH_SIZE, LeetCodeClient
+from auto_leetcode.models.batch import BatchJob
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.submission import SubmissionResult
+from auto_leetcode.runner import load_problem, prefetch_problems
+from auto_leetcode.storage.batch_store import BatchStore
+from auto_leetcode.storage.checkpoint_store import CheckpointStore
+from auto_leetcode.storage.json_repository import JsonRepository
+
+logger = logging.getLogger(__name__)
+
+
+class PrefilledGenerator:
+    """Serves batch-generated first attempts, then hands retries to the live generator."""
+
+    def __init__(self, inner: SolutionGenerator, solutions: dict[int, Solution]) -> None:
+        self._inner = inner
+        self._solutions = dict(solutions)
+
+    async def generate(
+        self,
+        problem: Problem,
+        previous_attempts: list[SubmissionResult],
+    ) -> Solution:
+        prefilled = self._take(problem, previous_attempts)
+        if prefilled is not None:
+            return prefilled
+        return await self._inner.generate(problem, previous_attempts)
+
+    async def generate_many(
+        self,
+        problem: Problem,
+        previous_attempts: list[SubmissionResult],
+        n: int,
+    ) -> list[Solution]:
+        prefilled = self._take(problem, previous_attempts)
+        if prefilled is not None:
+            return [prefilled]
+        return await self._inner.generate_many(problem, previous_attempts, n)
+
+    def _take(self, problem: Problem, previous_attempts: list[SubmissionResult]) -> Solution | None:
+        if previous_attempts:
+            return None
+        return self._solutions.pop(problem.id, None)
+
+
+async def prefill_first_attempts(
+    client: LeetCodeClient,
+    generator: BatchGenerator,
+    repository: JsonRepository,
+    checkpoints: CheckpointStore,
+    config: Config,
+    problem_ids: Iterable[int],
+    remote_solved: set[int],
+) -> dict[int, Solution]:
+    """Generate first attempts for every unstarted problem in one provider batch.
+
+    The batch ID is stored in ``config.batch_path`` before polling starts, so an
+    interrupted run resumes waiting on the same batch instead of paying twice.
+    Problems missing from the results are generated interactively as usual.
+    """
+    store = BatchStore(config.batch_path)
+    job = store.load()
+    if job is not None and (job.provider, job.model) != (config.ai_provider, config.ai_model):
+        logger.warning(
+            "Ignoring batch %s from %s/%s; the configured model is %s/%s",
+            job.batch_id,
+            job.provider,
+            job.model,
+            config.ai_provider,
+            config.ai_model,
+        )
+        job = None
+
+    if job is not None:
+        problems = await _load_problems(client, repository, job.problem_ids, remote_solved)
+        logger.info("Resuming batch %s for %d problems", job.batch_id, len(job.problem_ids))
+    else:
+        problems = [
+            problem
+            for problem in await _load_problems(client, repository, problem_ids, remote_solved)
+            if checkpoints.load(problem.id) is None
+        ]
+        if not problems:
+            return {}
+        batch_id = await generator.submit_batch(problems)
+        job = BatchJob(
+            batch_id=batch_id,
+            provider=config.ai_provider,
+            model=config.ai_model,
+            problem_ids=tuple(problem.id for problem in problems),
+            submitted_at=time.time(),
+        )
+        store.save(job)
+        logger.info("Submitted batch %s for %d first attempts", batch_id, len(problems))
+
+    while not (progress := await generator.batch_progress(job.batch_id)).done:
+        logger.info(
+            "Batch %s: %d/%d succeeded, %d failed; checking again in %.0fs",
+            job.batch_id,
+            progress.succeeded,
+            progress.total,
+            progress.failed,
+            config.batch_poll_seconds,
+        )
+        await asyncio.sleep(config.batch_poll_seconds)
+
+    solutions = await generator.batch_results(job.batch_id, problems)
+    store.delete()
+    logger.info(
+        "Batch %s finished after %.0fs: %d of %d first attempts generated",
+        job.batch_id,
+        time.time() - job.submitted_at,
+        len(solutions),
+        len(job.problem_ids),
+    )
+    return {solution.problem_id: solution for solution in solutions}
+
+
+async def _load_problems(
+    client: LeetCodeClient,
+    repository: JsonRepository,
+    problem_ids: Iterable[int],
+    remote_solved: set[int],
+) -> list[Problem]:
+    ids = list(problem_ids)
+    problems = []
+    for start in range(0, len(ids), PROBLEM_BATCH_SIZE):
+        chunk = ids[start : start + PROBLEM_BATCH_SIZE]
+        await prefetch_problems(client, repository, chunk, remote_solved)
+        for problem_id in chunk:
+            problem = await load_problem(client, repository, problem_id, remote_solved)
+            if problem is not None:
+                problems.append(problem)
+    return problems
@@ -0,0 +1,161 @@
+"""Sandbox worker process, run as a standalone script by ``SandboxPool``.
+
+The worker imports what LeetCode solutions usually rely on once, then serves
+one JSON job per stdin line. Each job runs in a forked child with CPU, memory
+and file-size rlimits, so a job sees a clean copy of the warmed interpreter and
+cannot corrupt the worker. It must not import ``auto_leetcode``: it runs with
+``python -I`` and only the standard library on its path.
+"""
+
+import contextlib
+import json
+import os
+import resource
+import select
+import signal
+import sys
+import time
+import traceback
+from typing import Any, cast
+
+PRELUDE = """
+from typing import *
+import bisect, collections, functools, heapq, itertools, math, operator, re, string
+from bisect import *
+from collections import *
+from functools import *
+from heapq import *
+from itertools import *
+from math import *
+"""
+
+MAX_RESULT_BYTES = 512 * 1024
+
+
+def main() -> None:
+    warmed: dict[str, Any] = {}
+    exec(PRELUDE, warmed)
+    _send({"status": "ready"})
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        _send(_run_job(json.loads(line), warmed))
+
+
+def _send(message: dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def _run_job(job: dict[str, Any], warmed: dict[str, Any]) -> dict[str, Any]:
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        _child(job, dict(warmed), write_fd)
+    os.close(write_fd)
+
+    deadline = time.monotonic() + job["timeout"]
+    chunks: list[bytes] = []
+    timed_out = False
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            timed_out = True
+            break
+        ready, _, _ = select.select([read_fd], [], [], remaining)
+        if not ready:
+            continue
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(read_fd)
+    if timed_out:
+        os.kill(pid, signal.SIGKILL)
+    _, wait_status = os.waitpid(pid, 0)
+
+    if timed_out or _killed_by(wait_status, signal.SIGXCPU, signal.SIGKILL):
+        return {"status": "timeout"}
+    try:
+        return cast(dict[str, Any], json.loads(b"".join(chunks)))
+    except ValueError:
+        return {"status": "crashed", "error": f"worker child exited with {wait_status}"}
+
+
+def _killed_by(wait_status: int, *signals: int) -> bool:
+    return os.WIFSIGNALED(wait_status) and os.WTERMSIG(wait_status) in signals
+
+
+def _child(job: dict[str, Any], namespace: dict[str, Any], write_fd: int) -> None:
+    try:
+        _limit_resources(job)
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        try:
+            result = _execute(job, namespace)
+        except MemoryError:
+            result = {"status": "memory"}
+        except BaseException:  # the child reports everything and exits below
+            result = {"status": "error", "error": traceback.format_exc(limit=-3)}
+        payload = _encode(result)
+        while payload:
+            payload = payload[os.write(write_fd, payload) :]
+    finally:
+        os._exit(0)
+
+
+def _limit_resources(job: dict[str, Any]) -> None:
+    memory = job["memory_mb"] * 1024 * 1024
+    cpu = max(1, int(job["timeout"]) + 1)
+    for limit, value in (
+        (resource.RLIMIT_AS, (memory, memory)),
+        (resource.RLIMIT_CPU, (cpu, cpu + 1)),
+        (resource.RLIMIT_FSIZE, (0, 0)),
+    ):
+        # Not every platform supports every limit; the timeout still applies.
+        with contextlib.suppress(ValueError, OSError):
+            resource.setrlimit(limit, value)
+
+
+def _encode(result: dict[str, Any]) -> bytes:
+    try:
+        payload = json.dumps(result, default=repr).encode()
+    except (TypeError, ValueError) as e:
+        return json.dumps({"status": "error", "error": f"unserializable output: {e}"}).encode()
+    if len(payload) > MAX_RESULT_BYTES:
+        return json.dumps({"status": "error", "error": "output too large"}).encode()
+    return payload
+
+
+def _execute(job: dict[str, Any], namespace: dict[str, Any]) -> dict[str, Any]:
+    try:
+        compiled = compile(job["code"], "solution.py", "exec")
+    except SyntaxError:
+        return {"status": "compile_error", "error": traceback.format_exc(limit=0)}
+    exec(compiled, namespace)
+    if "Solution" not in namespace:
+        return {"status": "error", "error": "code does not define class Solution"}
+    method = getattr(namespace["Solution"](), job["method"])
+    outputs = []
+    timings = []
+    for index, args in enumerate(job["cases"]):
+        started = time.perf_counter()
+        try:
+            returned = method(*args)
+        except MemoryError:
+            return {"status": "memory", "case": index}
+        except Exception as e:
+            # Skip this frame so the traceback starts in the solution.
+            tb = e.__traceback__.tb_next if e.__traceback__ else None
+            error = "".join(traceback.format_exception(type(e), e, tb, limit=-3))
+            return {"status": "error", "error": error, "case": index}
+        timings.append(time.perf_counter() - started)
+        if job["collect_outputs"]:
+            outputs.append(args[0] if job["in_place"] else returned)
+    return {"status": "ok", "outputs": outputs, "timings": timings}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import replace
+
+from auto_leetcode.checks.protocol import CheckOutcome
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.storage.json_repository import JsonRepository
+
+logger = logging.getLogger(__name__)
+
+REPEAT_NOTE = (
+    "You already tried this exact solution (ignoring formatting and comments) "
+    "and LeetCode rejected it. Write a different approach."
+)
+
+
+class DuplicateCheck:
+    """Answers code LeetCode already rejected with the stored verdict instead of resubmitting.
+
+    Verdicts are looked up by problem and normalized code hash in the results
+    file, so repeats are caught across runs as well as within one.
+    """
+
+    def __init__(self, repository: JsonRepository) -> None:
+        self._repository = repository
+
+    async def check(self, problem: Problem, solution: Solution) -> CheckOutcome:
+        known = self._repository.known_rejection(problem.id, solution.code)
+        if known is None:
+            return CheckOutcome(solution)
+        logger.info(
+            "Problem #%d attempt %d repeats code already judged %s",
+            problem.id,
+            solution.attempt,
+            known.status.value,
+        )
+        message = REPEAT_NOTE
+        if known.error_message:
+            message = f"{message}\n{known.error_message}"
+        return CheckOutcome(solution, replace(known, solution=solution, error_message=message))
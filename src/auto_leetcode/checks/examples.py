@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import ast
+import json
+import logging
+import math
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from auto_leetcode.checks.protocol import CheckOutcome
+from auto_leetcode.checks.sandbox import SandboxJob, SandboxPool, SandboxResult
+from auto_leetcode.checks.signature import Signature, parse_signature, split_top_level
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
+
+logger = logging.getLogger(__name__)
+
+EXAMPLE_PATTERN = re.compile(
+    r"^[ \t]*Input:?[ \t]*(?P<input>\S.*?)[ \t]*\n\s*Output:?[ \t]*(?P<output>\S.*?)[ \t]*$",
+    re.MULTILINE,
+)
+ASSIGNMENT = re.compile(r"^\s*([A-Za-z_]\w*)\s*=\s*(.+?)\s*$", re.DOTALL)
+
+# Wording that means the examples show one of several accepted outputs.
+AMBIGUOUS_PHRASES = (
+    "any valid",
+    "any of them",
+    "return any",
+    "any possible",
+    "multiple answers",
+    "multiple solutions",
+    "multiple valid",
+    "more than one answer",
+)
+# Wording that means the order of the returned elements is not judged.
+ORDER_FREE_PATTERN = re.compile(
+    r"\bin any (?:order|sequence)\b"
+    r"|\border\b[^.]{0,80}?\b(?:does not|doesn't|do not|don't) matter"
+    r"|\border\b[^.]{0,80}?\b(?:is|are) not (?:important|relevant)"
+)
+
+
+@dataclass(frozen=True)
+class Example:
+    args: list[Any]
+    expected: Any
+    input_text: str
+    output_text: str
+
+
+def extract_examples(problem: Problem, signature: Signature) -> list[Example]:
+    examples: list[Example] = []
+    for match in EXAMPLE_PATTERN.finditer(problem.description):
+        input_text, output_text = match.group("input"), match.group("output")
+        try:
+            values = _parse_assignments(input_text)
+            expected = _parse_literal(output_text)
+        except ValueError:
+            continue
+        if set(values) != set(signature.params):
+            continue
+        args = [values[name] for name in signature.params]
+        examples.append(Example(args, expected, input_text, output_text))
+    return examples
+
+
+class ExampleCheck:
+    """Runs a solution on the problem's own examples before it costs a submission."""
+
+    def __init__(self, sandbox: SandboxPool) -> None:
+        self._sandbox = sandbox
+
+    async def check(self, problem: Problem, solution: Solution) -> CheckOutcome:
+        signature = parse_signature(problem.code_snippet)
+        if signature is None:
+            return CheckOutcome(solution)
+        examples = extract_examples(problem, signature)
+        if not examples:
+            return CheckOutcome(solution)
+
+        result = await self._sandbox.run(
+            SandboxJob(
+                code=solution.code,
+                method=signature.method,
+                cases=[example.args for example in examples],
+                in_place=signature.in_place,
+            )
+        )
+        failure = _judge(problem, solution, examples, result)
+        if failure is None:
+            logger.info("Problem #%d passed %d local examples", problem.id, len(examples))
+        return CheckOutcome(solution, failure)
+
+
+def _judge(
+    problem: Problem,
+    solution: Solution,
+    examples: list[Example],
+    result: SandboxResult,
+) -> SubmissionResult | None:
+    if result.status == "crashed":
+        logger.warning("Sandbox failed on #%d, skipping local check: %s", problem.id, result.error)
+        return None
+
+    where = ""
+    if result.case is not None and result.case < len(examples):
+        where = f" on example {result.case + 1} ({examples[result.case].input_text})"
+    if result.status == "compile_error":
+        return _failure(solution, SubmissionStatus.COMPILE_ERROR, result.error)
+    if result.status == "error":
+        return _failure(solution, SubmissionStatus.RUNTIME_ERROR, f"{result.error}{where}")
+    if result.status == "timeout":
+        return _failure(solution, SubmissionStatus.TIME_LIMIT, "Timed out on the examples")
+    if result.status == "memory":
+        return _failure(solution, SubmissionStatus.MEMORY_LIMIT, f"Out of memory{where}")
+
+    description = problem.description.lower()
+    if any(phrase in description for phrase in AMBIGUOUS_PHRASES):
+        return None
+    order_free = ORDER_FREE_PATTERN.search(description) is not None
+    for number, (example, got) in enumerate(zip(examples, result.outputs, strict=False), 1):
+        if _matches(got, example.expected, order_free):
+            continue
+        if not _matches(got, example.expected, order_free=True):
+            return _failure(
+                solution,
+                SubmissionStatus.WRONG_ANSWER,
+                f"Example {number}\nInput: {example.input_text}\n"
+                f"Output: {json.dumps(got)}\nExpected: {example.output_text}",
+            )
+        # The statement may allow any order in wording we do not recognise.
+        logger.info(
+            "Problem #%d differs from example %d only in order, leaving it to LeetCode",
+            problem.id,
+            number,
+        )
+    return None
+
+
+def _failure(solution: Solution, status: SubmissionStatus, detail: str) -> SubmissionResult:
+    return SubmissionResult(
+        problem_id=solution.problem_id,
+        status=status,
+        runtime_ms=None,
+        memory_mb=None,
+        error_message=f"Local example check: {detail.strip()}",
+        solution=solution,
+    )
+
+
+def _matches(got: Any, expected: Any, order_free: bool) -> bool:
+    if _equal(got, expected):
+        return True
+    return order_free and _equal(_canonical(got), _canonical(expected))
+
+
+def _equal(a: Any, b: Any) -> bool:
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, int | float) and isinstance(b, int | float):
+        return math.isclose(a, b, rel_tol=1e-5, abs_tol=1e-5)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b, strict=True))
+    return bool(a == b)
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, list):
+        return sorted((_canonical(item) for item in value), key=json.dumps)
+    return value
+
+
+def _parse_assignments(text: str) -> dict[str, Any]:
+    values: dict[str, Any] = {}
+    for part in split_top_level(text):
+        match = ASSIGNMENT.match(part)
+        if match is None:
+            raise ValueError(f"not an assignment: {part!r}")
+        values[match.group(1)] = _parse_literal(match.group(2))
+    return values
+
+
+def _parse_literal(text: str) -> Any:
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError) as e:
+        raise ValueError(f"not a literal: {text!r}") from e
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Protocol
+
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.submission import SubmissionResult
+
+
+@dataclass(frozen=True)
+class CheckOutcome:
+    """A check's verdict: the solution to carry on with, or the failure to feed back."""
+
+    solution: Solution
+    failure: SubmissionResult | None = None
+
+
+class SolutionCheck(Protocol):
+    async def check(self, problem: Problem, solution: Solution) -> CheckOutcome: ...
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Self
+
+logger = logging.getLogger(__name__)
+
+WORKER_PATH = Path(__file__).with_name("_worker.py")
+# Extra time the pool grants a worker beyond the job timeout it enforces itself.
+WORKER_GRACE_SECONDS = 5.0
+STREAM_LIMIT = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class SandboxJob:
+    code: str
+    method: str
+    cases: list[list[Any]]
+    in_place: bool = False
+    collect_outputs: bool = True
+    timeout: float | None = None
+
+
+@dataclass(frozen=True)
+class SandboxResult:
+    """What running a job produced.
+
+    ``status`` is one of ``ok``, ``error``, ``compile_error``, ``timeout``,
+    ``memory`` or ``crashed``; ``case`` is the index of the failing case if known
+    and ``timings`` holds the seconds each completed case took.
+    """
+
+    status: str
+    outputs: list[Any] = field(default_factory=list)
+    timings: list[float] = field(default_factory=list)
+    error: str = ""
+    case: int | None = None
+
+
+def sandbox_supported() -> bool:
+    return hasattr(os, "fork") and sys.platform != "win32"
+
+
+class SandboxPool:
+    """Pre-warmed worker interpreters that run untrusted solution code.
+
+    Workers are spawned lazily on first use and reused across jobs; each job
+    runs in a child forked from a worker, under CPU, memory and file-size
+    rlimits. A worker that stops answering is killed and replaced.
+    """
+
+    def __init__(self, size: int = 2, timeout: float = 5.0, memory_mb: int = 512) -> None:
+        self._size = size
+        self._timeout = timeout
+        self._memory_mb = memory_mb
+        self._idle: asyncio.Queue[asyncio.subprocess.Process | None] = asyncio.Queue()
+        self._workers: set[asyncio.subprocess.Process] = set()
+        self._start_lock = asyncio.Lock()
+        self._started = False
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.close()
+
+    async def run(self, job: SandboxJob) -> SandboxResult:
+        await self._ensure_started()
+        timeout = job.timeout if job.timeout is not None else self._timeout
+        request = {
+            "code": job.code,
+            "method": job.method,
+            "cases": job.cases,
+            "in_place": job.in_place,
+            "collect_outputs": job.collect_outputs,
+            "timeout": timeout,
+            "memory_mb": self._memory_mb,
+        }
+        # Stress cases can run to megabytes of JSON; encode them off the event loop.
+        payload = await asyncio.to_thread(_encode, request)
+        worker = await self._idle.get()
+        healthy = False
+        try:
+            if worker is None or worker.returncode is not None:
+                worker = await self._spawn()
+            assert worker.stdin is not None and worker.stdout is not None
+            worker.stdin.write(payload)
+            await worker.stdin.drain()
+            line = await asyncio.wait_for(worker.stdout.readline(), timeout + WORKER_GRACE_SECONDS)
+            if not line:
+                raise ConnectionError("sandbox worker exited")
+            reply = json.loads(line)
+            healthy = True
+        except (TimeoutError, ConnectionError, ValueError) as e:
+            logger.warning("Sandbox worker failed (%s), replacing it", e)
+            return SandboxResult(status="crashed", error=str(e))
+        finally:
+            # A worker interrupted mid-job may still owe a reply, so it is never reused;
+            # its slot is refilled with a fresh worker on the next run.
+            if not healthy and worker is not None:
+                await self._discard(worker)
+            self._idle.put_nowait(worker if healthy else None)
+        return SandboxResult(
+            status=reply.get("status", "crashed"),
+            outputs=reply.get("outputs", []),
+            timings=reply.get("timings", []),
+            error=reply.get("error", ""),
+            case=reply.get("case"),
+        )
+
+    async def close(self) -> None:
+        for worker in list(self._workers):
+            await self._discard(worker)
+        self._idle = asyncio.Queue()
+        self._started = False
+
+    async def _ensure_started(self) -> None:
+        async with self._start_lock:
+            if self._started:
+                return
+            for _ in range(self._size):
+                self._idle.put_nowait(await self._spawn())
+            self._started = True
+            logger.info("Started %d sandbox workers", self._size)
+
+    async def _spawn(self) -> asyncio.subprocess.Process:
+        worker = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-I",
+            str(WORKER_PATH),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=STREAM_LIMIT,
+        )
+        self._workers.add(worker)
+        assert worker.stdout is not None
+        # The worker says "ready" once its imports are loaded.
+        await worker.stdout.readline()
+        return worker
+
+    async def _discard(self, worker: asyncio.subprocess.Process) -> None:
+        self._workers.discard(worker)
+        if worker.returncode is None:
+            worker.kill()
+        await worker.wait()
+
+
+def _encode(request: dict[str, Any]) -> bytes:
+    return (json.dumps(request) + "\n").encode()
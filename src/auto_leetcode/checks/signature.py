@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+SIGNATURE_PATTERN = re.compile(r"def (\w+)\(self,?\s*(.*?)\)\s*(?:->\s*(.+?))?\s*:")
+LINKED_TYPES = re.compile(r"\b(?:ListNode|TreeNode|Node)\b")
+
+
+@dataclass(frozen=True)
+class Signature:
+    method: str
+    params: tuple[str, ...]
+    in_place: bool
+    types: tuple[str, ...] = ()
+
+
+def parse_signature(snippet: str) -> Signature | None:
+    """The single ``Solution`` method to call, or None for shapes we cannot drive."""
+    if "class Solution" not in snippet:
+        return None
+    matches = SIGNATURE_PATTERN.findall(snippet)
+    if len(matches) != 1:
+        return None
+    method, params, returns = matches[0]
+    if LINKED_TYPES.search(params) or LINKED_TYPES.search(returns):
+        return None
+    parts = [part.partition(":") for part in split_top_level(params) if part]
+    return Signature(
+        method=method,
+        params=tuple(name.strip() for name, _, _ in parts),
+        in_place=returns.strip() == "None",
+        types=tuple(annotation.strip() for _, _, annotation in parts),
+    )
+
+
+def split_top_level(text: str) -> list[str]:
+    """Split on commas that are outside brackets and string literals."""
+    parts: list[str] = []
+    depth = 0
+    quote = ""
+    start = 0
+    escaped = False
+    for i, char in enumerate(text):
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = ""
+        elif char in "\"'":
+            quote = char
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+    parts.append(text[start:].strip())
+    return parts
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import ast
+import builtins
+import logging
+import re
+from dataclasses import dataclass, replace
+
+from auto_leetcode.checks.protocol import CheckOutcome
+from auto_leetcode.checks.signature import SIGNATURE_PATTERN, split_top_level
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
+
+logger = logging.getLogger(__name__)
+
+CLASS_PATTERN = re.compile(r"^class (\w+)", re.MULTILINE)
+# Node-typed starters define the judge's ``Node`` inside a docstring.
+STRING_PATTERN = re.compile(r'"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'')
+
+# Names LeetCode's Python 3 judge makes available without an import, by module.
+IMPLICIT_NAMES: dict[str, str] = {
+    "typing": "Any Callable Deque Dict FrozenSet Iterable Iterator List Optional Set Tuple Union",
+    "collections": "Counter OrderedDict defaultdict deque namedtuple",
+    "heapq": "heapify heappop heappush heappushpop heapreplace nlargest nsmallest",
+    "bisect": "bisect bisect_left bisect_right insort insort_left insort_right",
+    "functools": "cache cmp_to_key lru_cache reduce",
+    "itertools": (
+        "accumulate chain combinations combinations_with_replacement count groupby pairwise "
+        "permutations product zip_longest"
+    ),
+    "math": "ceil comb floor gcd inf isqrt lcm log2 sqrt",
+}
+IMPLICIT_IMPORTS = {
+    name: module for module, names in IMPLICIT_NAMES.items() for name in names.split()
+}
+IMPLICIT_MODULES = frozenset(IMPLICIT_NAMES) | {"operator", "random", "re", "string", "sys"}
+# Supplied by the judge for linked-list and tree problems; defining them is optional.
+JUDGE_TYPES = frozenset({"ListNode", "TreeNode", "Node"})
+
+
+@dataclass(frozen=True)
+class ExpectedMethod:
+    name: str
+    arity: int
+
+
+@dataclass(frozen=True)
+class StaticReport:
+    """The repaired code and what was changed, or why the code cannot be submitted."""
+
+    code: str
+    repairs: tuple[str, ...] = ()
+    status: SubmissionStatus | None = None
+    error: str = ""
+
+
+def expected_interface(snippet: str) -> tuple[str, tuple[ExpectedMethod, ...]] | None:
+    """The starter code's class and its methods, ignoring helper types in comments and strings.
+
+    ``Solution`` wins when the starter defines several classes; otherwise the
+    last one does, since helper types come before the class to implement.
+    """
+    code = STRING_PATTERN.sub("", snippet)
+    code = "\n".join(line for line in code.splitlines() if not line.lstrip().startswith("#"))
+    classes = list(CLASS_PATTERN.finditer(code))
+    if not classes:
+        return None
+    owner = next((match for match in classes if match.group(1) == "Solution"), classes[-1])
+    end = next((match.start() for match in classes if match.start() > owner.start()), len(code))
+    methods = tuple(
+        ExpectedMethod(name, len([part for part in split_top_level(params) if part]))
+        for name, params, _ in SIGNATURE_PATTERN.findall(code, owner.end(), end)
+    )
+    return owner.group(1), methods
+
+
+def validate(problem: Problem, code: str) -> StaticReport:
+    """Parse ``code``, check it against the starter code and repair what is safe to."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        error = f"SyntaxError: {e.msg} (line {e.lineno})"
+        return StaticReport(code, status=SubmissionStatus.COMPILE_ERROR, error=error)
+
+    repairs: list[str] = []
+    interface = expected_interface(problem.code_snippet)
+    if interface is not None:
+        class_name, methods = interface
+        if _find_class(tree, class_name) is None:
+            wrapped = _wrap_in_class(code, tree, class_name, methods)
+            if wrapped is None:
+                return StaticReport(
+                    code,
+                    status=SubmissionStatus.RUNTIME_ERROR,
+                    error=f"The code does not define class {class_name}",
+                )
+            code, tree = wrapped, ast.parse(wrapped)
+            repairs.append(f"wrapped methods in class {class_name}")
+        code, error = _check_methods(code, class_name, methods, repairs)
+        if error:
+            return StaticReport(code, status=SubmissionStatus.RUNTIME_ERROR, error=error)
+        tree = ast.parse(code)
+
+    imports = _missing_imports(tree)
+    if imports:
+        code = _insert_imports(code, tree, imports)
+        repairs.append("added " + "; ".join(imports))
+    return StaticReport(code, tuple(repairs))
+
+
+class StaticCheck:
+    """Rejects code LeetCode would fail to compile or call, after fixing the easy cases.
+
+    Needs no sandbox. Repairs (missing standard imports, methods written
+    outside the class, a single renamed method) are applied to the solution
+    that carries on to the other checks and to LeetCode.
+    """
+
+    async def check(self, problem: Problem, solution: Solution) -> CheckOutcome:
+        report = validate(problem, solution.code)
+        if report.status is not None:
+            return CheckOutcome(
+                solution,
+                SubmissionResult(
+                    problem_id=solution.problem_id,
+                    status=report.status,
+                    runtime_ms=None,
+                    memory_mb=None,
+                    error_message=f"Local static check: {report.error}",
+                    solution=solution,
+                ),
+            )
+        if report.repairs:
+            logger.info("Problem #%d: static check %s", problem.id, ", ".join(report.repairs))
+            solution = replace(solution, code=report.code)
+        return CheckOutcome(solution)
+
+
+def _find_class(tree: ast.Module, name: str) -> ast.ClassDef | None:
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == name:
+            return node
+    return None
+
+
+def _wrap_in_class(
+    code: str, tree: ast.Module, class_name: str, methods: tuple[ExpectedMethod, ...]
+) -> str | None:
+    """Move top-level functions taking ``self`` into the expected class."""
+    wanted = {method.name for method in methods}
+    functions = [
+        node
+        for node in tree.body
+        if isinstance(node, ast.FunctionDef) and node.args.args and node.args.args[0].arg == "self"
+    ]
+    if not wanted or not wanted <= {node.name for node in functions}:
+        return None
+    lines = code.splitlines()
+    moved: set[int] = set()
+    body: list[str] = []
+    for node in functions:
+        start = min([node.lineno, *(d.lineno for d in node.decorator_list)]) - 1
+        end = node.end_lineno or node.lineno
+        moved.update(range(start, end))
+        body.extend(f"    {line}" if line.strip() else "" for line in lines[start:end])
+    kept = [line for index, line in enumerate(lines) if index not in moved]
+    return "\n".join([*kept, f"class {class_name}:", *body]).strip() + "\n"
+
+
+def _check_methods(
+    code: str, class_name: str, methods: tuple[ExpectedMethod, ...], repairs: list[str]
+) -> tuple[str, str]:
+    """The code, with a lone misnamed method renamed, and an error if it still does not fit."""
+    defined = _methods(code, class_name)
+    missing = [method for method in methods if method.name not in defined]
+    expected_names = {method.name for method in methods}
+    extra = [
+        node
+        for name, node in defined.items()
+        if name not in expected_names and not name.startswith("_")
+    ]
+    if len(missing) == 1 and len(extra) == 1 and _accepts(extra[0], missing[0].arity):
+        code = _rename_method(code, extra[0], missing[0].name)
+        repairs.append(f"renamed {extra[0].name} to {missing[0].name}")
+        defined = _methods(code, class_name)
+        missing = []
+    if missing:
+        names = ", ".join(sorted(name for name in defined if not name.startswith("_"))) or "none"
+        return code, f"class {class_name} has no method {missing[0].name} (defines: {names})"
+    for method in methods:
+        if not _accepts(defined[method.name], method.arity):
+            return code, f"{class_name}.{method.name} must take {method.arity} arguments after self"
+    return code, ""
+
+
+def _methods(code: str, class_name: str) -> dict[str, ast.FunctionDef]:
+    class_def = _find_class(ast.parse(code), class_name)
+    assert class_def is not None
+    return {node.name: node for node in class_def.body if isinstance(node, ast.FunctionDef)}
+
+
+def _accepts(function: ast.FunctionDef, arity: int) -> bool:
+    """Whether the method can be called with ``arity`` positional arguments after self."""
+    args = function.args
+    positional = len(args.posonlyargs) + len(args.args) - 1
+    required = positional - len(args.defaults)
+    return required <= arity and (arity <= positional or args.vararg is not None)
+
+
+def _rename_method(code: str, function: ast.FunctionDef, new_name: str) -> str:
+    lines = code.splitlines(keepends=True)
+    index = function.lineno - 1
+    lines[index] = re.sub(rf"\bdef\s+{function.name}\b", f"def {new_name}", lines[index], count=1)
+    # Recursive calls go through ``self``.
+    return re.sub(rf"\bself\.{function.name}\b", f"self.{new_name}", "".join(lines))
+
+
+def _missing_imports(tree: ast.Module) -> list[str]:
+    bound: set[str] = set(dir(builtins)) | JUDGE_TYPES
+    used: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            (bound if isinstance(node.ctx, ast.Store | ast.Del) else used).add(node.id)
+        elif isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef):
+            bound.add(node.name)
+        elif isinstance(node, ast.arg):
+            bound.add(node.arg)
+        elif isinstance(node, ast.alias):
+            bound.add((node.asname or node.name).split(".")[0])
+        elif isinstance(node, ast.Global | ast.Nonlocal):
+            bound.update(node.names)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            bound.add(node.name)
+    unresolved = used - bound
+
+    modules = sorted(name for name in unresolved if name in IMPLICIT_MODULES)
+    from_imports: dict[str, list[str]] = {}
+    for name in sorted(unresolved - set(modules)):
+        module = IMPLICIT_IMPORTS.get(name)
+        if module is not None:
+            from_imports.setdefault(module, []).append(name)
+    return [
+        *(f"import {module}" for module in modules),
+        *(
+            f"from {module} import {', '.join(names)}"
+            for module, names in sorted(from_imports.items())
+        ),
+    ]
+
+
+def _insert_imports(code: str, tree: ast.Module, imports: list[str]) -> str:
+    # ``from __future__`` imports must stay first.
+    position = 0
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module == "__future__":
+            position = node.end_lineno or node.lineno
+    lines = code.splitlines()
+    return "\n".join([*lines[:position], *imports, *lines[position:]]) + "\n"
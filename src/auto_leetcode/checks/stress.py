@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import ast
+import asyncio
+import logging
+import random
+import re
+import string
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from auto_leetcode.checks.protocol import CheckOutcome
+from auto_leetcode.checks.sandbox import SandboxJob, SandboxPool
+from auto_leetcode.checks.signature import Signature, parse_signature
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
+
+logger = logging.getLogger(__name__)
+
+# Seconds one max-size case may take locally before the candidate is predicted to TLE.
+STRESS_BUDGET_SECONDS = {"Easy": 1.0, "Medium": 1.5, "Hard": 2.0}
+DEFAULT_BUDGET_SECONDS = 1.5
+MAX_STRESS_ELEMENTS = 1_000_000
+DEFAULT_VALUE_RANGE = (0, 10**4)
+DEFAULT_LENGTH = 10
+
+INLINE_CODE = re.compile(r"`([^`\n]+)`")
+CHAIN = re.compile(r"^(?P<low>[^<=>]+?)<=?(?P<subjects>[^<=>]+?)<=?(?P<high>[^<=>]+)$")
+EQUALITY = re.compile(r"^(?P<left>[^<=>]+?)==(?P<right>[^<=>]+)$")
+INDEX = re.compile(r"\[\w+\]")
+SORTED_PHRASES = ("sorted in", "non-decreasing", "ascending order")
+DISTINCT_PHRASES = ("distinct", "unique")
+
+
+class Constraints:
+    """Numeric bounds from a problem's Constraints section.
+
+    Subjects are normalised so ``nums[j].length`` and ``nums[i].length`` match,
+    and ``m == grid.length`` makes ``m`` and ``grid.length`` share bounds.
+    """
+
+    def __init__(self, description: str) -> None:
+        self._ranges: dict[str, tuple[str, str]] = {}
+        self._aliases: dict[str, str] = {}
+        for snippet in INLINE_CODE.findall(description):
+            self._read(snippet.replace(" ", ""))
+
+    def high(self, subject: str) -> int | None:
+        return self._bound(_normalise(subject), upper=True, depth=0)
+
+    def low(self, subject: str) -> int | None:
+        return self._bound(_normalise(subject), upper=False, depth=0)
+
+    def _read(self, text: str) -> None:
+        if (chain := CHAIN.match(text)) is not None:
+            for subject in chain.group("subjects").split(","):
+                self._ranges[_normalise(subject)] = (chain.group("low"), chain.group("high"))
+        elif (equality := EQUALITY.match(text)) is not None:
+            left, right = _normalise(equality.group("left")), _normalise(equality.group("right"))
+            if right.lstrip("-").isdigit():
+                self._ranges[left] = (right, right)
+            else:
+                self._aliases[left] = right
+                self._aliases[right] = left
+
+    def _bound(self, subject: str, upper: bool, depth: int) -> int | None:
+        if depth > 4:
+            return None
+        for key in (subject, self._aliases.get(subject)):
+            if key is None or key not in self._ranges:
+                continue
+            low, high = self._ranges[key]
+            return _evaluate(
+                high if upper else low,
+                lambda name: self._bound(_normalise(name), upper, depth + 1),
+            )
+        return None
+
+
+@dataclass(frozen=True)
+class StressInput:
+    args: list[Any]
+    summary: str
+
+
+class InputBuilder:
+    """Builds max-size arguments for a starter signature from the problem's constraints."""
+
+    def __init__(self, problem: Problem, signature: Signature) -> None:
+        self._constraints = Constraints(problem.description)
+        self._signature = signature
+        self._rng = random.Random(problem.id)
+        description = problem.description.lower()
+        self._sorted = any(phrase in description for phrase in SORTED_PHRASES)
+        self._distinct = any(phrase in description for phrase in DISTINCT_PHRASES)
+        self._alphabet = _alphabet(description)
+
+    def build(self) -> StressInput | None:
+        """Max-size arguments, or None if the signature or constraints are not understood."""
+        if len(self._signature.types) != len(self._signature.params):
+            return None
+        if not any(self._has_bounds(name) for name in self._signature.params):
+            return None
+        args: list[Any] = []
+        parts: list[str] = []
+        for name, annotation in zip(self._signature.params, self._signature.types, strict=True):
+            built = self._build(name, annotation.replace(" ", "").replace("list[", "List["))
+            if built is None:
+                return None
+            value, summary = built
+            args.append(value)
+            parts.append(f"{name}: {summary}")
+        return StressInput(args, "; ".join(parts))
+
+    def _has_bounds(self, name: str) -> bool:
+        return any(
+            self._constraints.high(subject) is not None
+            for subject in (name, f"{name}.length", f"{name}[i].length")
+        )
+
+    def _build(self, name: str, annotation: str) -> tuple[Any, str] | None:
+        if annotation == "int":
+            value = self._constraints.high(name)
+            value = DEFAULT_LENGTH if value is None else value
+            return value, str(value)
+        if annotation == "float":
+            value = self._constraints.high(name)
+            return float(1 if value is None else value), str(value)
+        if annotation == "bool":
+            return True, "True"
+        if annotation == "str":
+            length = self._length(f"{name}.length")
+            text = "".join(self._rng.choices(self._alphabet, k=length))
+            return text, f"string of length {length}"
+        if annotation == "List[int]":
+            length = self._length(f"{name}.length")
+            low, high = self._value_range(f"{name}[i]")
+            return self._ints(length, low, high), f"{length} ints in [{low}, {high}]"
+        if annotation == "List[str]":
+            count = self._length(f"{name}.length")
+            width = self._length(f"{name}[i].length", cap=MAX_STRESS_ELEMENTS // max(count, 1))
+            words = ["".join(self._rng.choices(self._alphabet, k=width)) for _ in range(count)]
+            return words, f"{count} strings of length {width}"
+        if annotation in ("List[List[int]]", "List[List[str]]"):
+            rows = self._length(f"{name}.length")
+            cols = self._length(f"{name}[i].length", cap=MAX_STRESS_ELEMENTS // max(rows, 1))
+            if annotation == "List[List[str]]":
+                grid: list[Any] = [self._rng.choices(self._alphabet, k=cols) for _ in range(rows)]
+                return grid, f"{rows}x{cols} grid of characters"
+            low, high = self._value_range(f"{name}[i][j]")
+            grid = [self._ints(cols, low, high) for _ in range(rows)]
+            return grid, f"{rows}x{cols} grid of ints in [{low}, {high}]"
+        return None
+
+    def _length(self, subject: str, cap: int = MAX_STRESS_ELEMENTS) -> int:
+        value = self._constraints.high(subject)
+        return max(0, min(DEFAULT_LENGTH if value is None else value, cap))
+
+    def _value_range(self, subject: str) -> tuple[int, int]:
+        low, high = self._constraints.low(subject), self._constraints.high(subject)
+        if low is None or high is None or low > high:
+            return DEFAULT_VALUE_RANGE
+        return low, high
+
+    def _ints(self, count: int, low: int, high: int) -> list[int]:
+        if self._distinct and high - low + 1 >= count:
+            values = self._rng.sample(range(low, high + 1), count)
+        else:
+            values = [self._rng.randint(low, high) for _ in range(count)]
+        return sorted(values) if self._sorted else values
+
+
+class StressCheck:
+    """Predicts Time Limit Exceeded by timing the candidate on a max-size input."""
+
+    def __init__(self, sandbox: SandboxPool) -> None:
+        self._sandbox = sandbox
+
+    async def check(self, problem: Problem, solution: Solution) -> CheckOutcome:
+        signature = parse_signature(problem.code_snippet)
+        if signature is None:
+            return CheckOutcome(solution)
+        # Max-size inputs take a while to build; keep other problems' polling responsive.
+        stress_input = await asyncio.to_thread(InputBuilder(problem, signature).build)
+        if stress_input is None:
+            return CheckOutcome(solution)
+
+        budget = STRESS_BUDGET_SECONDS.get(problem.difficulty, DEFAULT_BUDGET_SECONDS)
+        timeout = budget * 2
+        result = await self._sandbox.run(
+            SandboxJob(
+                code=solution.code,
+                method=signature.method,
+                cases=[stress_input.args],
+                in_place=signature.in_place,
+                collect_outputs=False,
+                timeout=timeout,
+            )
+        )
+        if result.status != "ok" or not result.timings:
+            # Errors and timeouts on synthesized input prove nothing: it may break an
+            # unstated precondition and send a correct solution into a loop.
+            logger.info(
+                "Problem #%d stress run inconclusive (%s), leaving it to LeetCode",
+                problem.id,
+                result.status,
+            )
+            return CheckOutcome(solution)
+        elapsed = result.timings[0]
+        if elapsed <= budget:
+            logger.info(
+                "Problem #%d stress run took %.2fs (budget %.1fs)", problem.id, elapsed, budget
+            )
+            return CheckOutcome(solution)
+
+        failure = SubmissionResult(
+            problem_id=solution.problem_id,
+            status=SubmissionStatus.TIME_LIMIT,
+            runtime_ms=None,
+            memory_mb=None,
+            error_message=(
+                f"Local stress test: took {elapsed:.2f}s on a max-size input "
+                f"({stress_input.summary}), over the {budget:.1f}s budget for "
+                f"{problem.difficulty or 'this'} problems. "
+                "Use an asymptotically faster approach."
+            ),
+            solution=solution,
+        )
+        return CheckOutcome(solution, failure)
+
+
+def _normalise(subject: str) -> str:
+    return INDEX.sub("[i]", subject.strip())
+
+
+def _alphabet(description: str) -> str:
+    if "'0'" in description and "'1'" in description:
+        return "01"
+    if "digits" in description and "letters" not in description:
+        return string.digits
+    if "uppercase" in description and "lowercase" not in description:
+        return string.ascii_uppercase
+    return string.ascii_lowercase
+
+
+def _evaluate(expression: str, resolve: Callable[[str], int | None]) -> int | None:
+    """Evaluate a bound like ``2 * 10^4`` or ``nums.length - 1``; None if unknown."""
+    try:
+        tree = ast.parse(expression.replace("^", "**"), mode="eval")
+    except SyntaxError:
+        return None
+    return _evaluate_node(tree.body, resolve)
+
+
+def _evaluate_node(node: ast.expr, resolve: Callable[[str], int | None]) -> int | None:
+    if isinstance(node, ast.Constant) and isinstance(node.value, int):
+        return node.value
+    if isinstance(node, ast.Name | ast.Attribute | ast.Subscript):
+        return resolve(ast.unparse(node))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = _evaluate_node(node.operand, resolve)
+        return None if value is None else -value
+    if isinstance(node, ast.BinOp):
+        left = _evaluate_node(node.left, resolve)
+        right = _evaluate_node(node.right, resolve)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, ast.Add):
+            return left + right
+        if isinstance(node.op, ast.Sub):
+            return left - right
+        if isinstance(node.op, ast.Mult):
+            return left * right
+        if isinstance(node.op, ast.Pow) and 0 <= right <= 64:
+            return int(left**right)
+        if isinstance(node.op, ast.FloorDiv | ast.Div) and right:
+            return left // right
+    return None
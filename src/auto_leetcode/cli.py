@@ -9,6 +9,7 @@ import click
 from auto_leetcode.config import load_config
 from auto_leetcode.errors import AutoLeetCodeError, ConfigError
 from auto_leetcode.runner import run
+from auto_leetcode.scheduler import SCORING_POLICIES
 from auto_leetcode.storage.json_repository import JsonRepository
 
 
@@ -27,10 +28,131 @@ def main() -> None:
 @click.option("--end", default=3000, help="Ending problem ID")
 @click.option("--retries", default=3, help="Max retries per problem")
 @click.option("--skip-solved/--no-skip-solved", default=True, help="Skip already solved problems")
-def solve(start: int, end: int, retries: int, skip_solved: bool) -> None:
-    """Solve problems sequentially."""
+@click.option(
+    "--concurrency",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Problems in flight at once (1 = sequential)",
+)
+@click.option(
+    "--candidates",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Solutions sampled per generation; the best is submitted, the rest kept as fallbacks",
+)
+@click.option(
+    "--escalate-after",
+    default=2,
+    type=click.IntRange(min=1),
+    help="With AI_FAST_MODEL set, failed attempts before retries move to AI_MODEL",
+)
+@click.option(
+    "--order",
+    default="id",
+    type=click.Choice(sorted(SCORING_POLICIES)),
+    help="Problem order: numeric ID, or best expected accepted-per-token first",
+)
+@click.option(
+    "--refresh-problems",
+    is_flag=True,
+    help="Re-fetch problem details instead of using the local problem cache",
+)
+@click.option(
+    "--local-checks/--no-local-checks",
+    default=True,
+    help="Run each solution on the problem's examples locally before submitting",
+)
+@click.option(
+    "--stress-checks/--no-stress-checks",
+    default=True,
+    help="Time each solution locally on max-size inputs to catch likely TLEs",
+)
+@click.option(
+    "--prompt-budget",
+    default=6000,
+    type=click.IntRange(min=500),
+    help="Estimated tokens per prompt before older failed attempts are summarized",
+)
+@click.option(
+    "--stream/--no-stream",
+    default=True,
+    help="Stream model output and stop reading once the code block is complete",
+)
+@click.option(
+    "--ai-rpm",
+    type=click.FloatRange(min=1),
+    help="Requests per minute allowed per model (learned from response headers if unset)",
+)
+@click.option(
+    "--ai-tpm",
+    type=click.FloatRange(min=1),
+    help="Tokens per minute allowed per model (learned from response headers if unset)",
+)
+@click.option(
+    "--ai-concurrency",
+    default=8,
+    type=click.IntRange(min=1),
+    help="Most AI calls in flight per model; halved on every 429 and regrown on success",
+)
+@click.option(
+    "--hedge/--no-hedge",
+    default=True,
+    help="With AI_FALLBACK_MODEL set, duplicate calls running past their p95 to the fallback",
+)
+@click.option(
+    "--bypass-ai-cache",
+    is_flag=True,
+    help="Ask the model again even when a cached response exists (the new one is cached)",
+)
+@click.option(
+    "--batch-generate",
+    is_flag=True,
+    help="Generate first attempts for the whole range through the provider's batch API",
+)
+def solve(
+    start: int,
+    end: int,
+    retries: int,
+    skip_solved: bool,
+    concurrency: int,
+    candidates: int,
+    escalate_after: int,
+    order: str,
+    refresh_problems: bool,
+    local_checks: bool,
+    stress_checks: bool,
+    prompt_budget: int,
+    stream: bool,
+    ai_rpm: float | None,
+    ai_tpm: float | None,
+    ai_concurrency: int,
+    hedge: bool,
+    bypass_ai_cache: bool,
+    batch_generate: bool,
+) -> None:
+    """Solve problems, sequentially or pipelined."""
     try:
-        config = load_config(start_id=start, end_id=end, max_retries=retries, skip_solved=skip_solved)
+        config = load_config(
+            start_id=start,
+            end_id=end,
+            max_retries=retries,
+            skip_solved=skip_solved,
+            concurrency=concurrency,
+            candidates=candidates,
+            escalate_after=escalate_after,
+            order=order,
+            refresh_problems=refresh_problems,
+            local_checks=local_checks,
+            stress_checks=stress_checks,
+            prompt_token_budget=prompt_budget,
+            ai_stream=stream,
+            ai_requests_per_minute=ai_rpm,
+            ai_tokens_per_minute=ai_tpm,
+            ai_max_concurrency=ai_concurrency,
+            hedge=hedge,
+            ai_cache_bypass=bypass_ai_cache,
+            batch_generate=batch_generate,
+        )
     except ConfigError as e:
         click.echo(f"Configuration error: {e}", err=True)
         sys.exit(1)
@@ -57,3 +179,14 @@ def status() -> None:
     accepted = repo.find_all_accepted()
     total_solved = len({r.problem_id for r in accepted})
     click.echo(f"Solved: {total_solved} problems")
+
+    model_stats = repo.model_stats()
+    if model_stats:
+        click.echo("By model:")
+    for model, stats in sorted(model_stats.items()):
+        latency = stats.mean_generation_seconds
+        latency_text = f", {latency:.1f}s mean generation" if latency is not None else ""
+        click.echo(
+            f"  {model or 'unknown'}: {stats.accepted}/{stats.submissions} accepted "
+            f"({stats.acceptance_rate:.0%}){latency_text}"
+        )
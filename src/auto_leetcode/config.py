@@ -8,6 +8,12 @@ from dotenv import load_dotenv
 from auto_leetcode.errors import ConfigError
 
 
+@dataclass(frozen=True)
+class LeetCodeAccount:
+    session: str
+    csrf_token: str
+
+
 @dataclass(frozen=True)
 class Config:
     leetcode_session: str
@@ -16,14 +22,64 @@ class Config:
     ai_api_key: str
     ai_base_url: str
     ai_model: str
+    fast_provider: str = ""
+    fast_api_key: str = ""
+    fast_base_url: str = ""
+    fast_model: str = ""
+    strong_difficulties: tuple[str, ...] = ("Hard",)
+    escalate_after: int = 2
+    fallback_provider: str = ""
+    fallback_api_key: str = ""
+    fallback_base_url: str = ""
+    fallback_model: str = ""
+    hedge: bool = True
+    hedge_percentile: float = 0.95
     start_id: int = 1
     end_id: int = 3000
     max_retries: int = 3
-    retry_delay_seconds: float = 5.0
-    submit_delay_seconds: float = 10.0
+    candidates: int = 1
+    leetcode_initial_rps: float = 0.5
+    leetcode_max_rps: float = 2.0
+    leetcode_http2: bool = True
+    leetcode_max_connections: int = 10
+    leetcode_keepalive_connections: int = 5
+    leetcode_keepalive_expiry: float = 30.0
+    leetcode_connect_timeout: float = 10.0
+    leetcode_read_timeout: float = 30.0
+    leetcode_pool_timeout: float = 10.0
     skip_solved: bool = True
+    concurrency: int = 1
+    order: str = "id"
     solutions_dir: Path = field(default_factory=lambda: Path("solutions"))
     results_path: Path = field(default_factory=lambda: Path("results.jsonl"))
+    checkpoint_dir: Path = field(default_factory=lambda: Path("checkpoints"))
+    catalog_path: Path = field(default_factory=lambda: Path("catalog.json"))
+    catalog_ttl_seconds: float = 24 * 3600
+    problems_dir: Path = field(default_factory=lambda: Path("problems"))
+    refresh_problems: bool = False
+    local_checks: bool = True
+    stress_checks: bool = True
+    sandbox_workers: int = 2
+    sandbox_timeout_seconds: float = 5.0
+    sandbox_memory_mb: int = 512
+    ai_stream: bool = True
+    ai_requests_per_minute: float | None = None
+    ai_tokens_per_minute: float | None = None
+    ai_max_concurrency: int = 8
+    prompt_token_budget: int = 6000
+    ai_cache: bool = True
+    ai_cache_bypass: bool = False
+    ai_cache_path: Path = field(default_factory=lambda: Path("ai_cache.sqlite3"))
+    ai_cache_max_mb: int = 256
+    ai_cache_ttl_seconds: float = 30 * 24 * 3600
+    batch_generate: bool = False
+    batch_path: Path = field(default_factory=lambda: Path("batch.json"))
+    batch_poll_seconds: float = 30.0
+    extra_accounts: tuple[LeetCodeAccount, ...] = ()
+
+    @property
+    def accounts(self) -> tuple[LeetCodeAccount, ...]:
+        return (LeetCodeAccount(self.leetcode_session, self.csrf_token), *self.extra_accounts)
 
 
 def _require_env(key: str) -> str:
@@ -33,6 +89,21 @@ def _require_env(key: str) -> str:
     return value
 
 
+def _parse_accounts(raw: str) -> tuple[LeetCodeAccount, ...]:
+    accounts: list[LeetCodeAccount] = []
+    for entry in raw.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        session, sep, csrf_token = entry.partition(":")
+        if not sep or not session or not csrf_token:
+            raise ConfigError(
+                "LEETCODE_EXTRA_ACCOUNTS entries must look like <session>:<csrf_token>"
+            )
+        accounts.append(LeetCodeAccount(session.strip(), csrf_token.strip()))
+    return tuple(accounts)
+
+
 def load_config(**overrides: Any) -> Config:
     load_dotenv()
     kwargs: dict[str, Any] = {
@@ -42,6 +113,14 @@ def load_config(**overrides: Any) -> Config:
         "ai_api_key": _require_env("AI_API_KEY"),
         "ai_base_url": os.environ.get("AI_BASE_URL", "https://api.openai.com/v1"),
         "ai_model": os.environ.get("AI_MODEL", "gpt-4o"),
+        "fast_model": os.environ.get("AI_FAST_MODEL", ""),
+        "fallback_model": os.environ.get("AI_FALLBACK_MODEL", ""),
+        "extra_accounts": _parse_accounts(os.environ.get("LEETCODE_EXTRA_ACCOUNTS", "")),
     }
+    # The fast and fallback models share the main provider's settings unless given their own.
+    for prefix, env in (("fast", "AI_FAST"), ("fallback", "AI_FALLBACK")):
+        kwargs[f"{prefix}_provider"] = os.environ.get(f"{env}_PROVIDER", kwargs["ai_provider"])
+        kwargs[f"{prefix}_api_key"] = os.environ.get(f"{env}_API_KEY", kwargs["ai_api_key"])
+        kwargs[f"{prefix}_base_url"] = os.environ.get(f"{env}_BASE_URL", kwargs["ai_base_url"])
     kwargs.update(overrides)
     return Config(**kwargs)
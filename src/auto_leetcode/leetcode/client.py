@@ -1,4 +1,7 @@
+import asyncio
+import hashlib
 import logging
+from collections.abc import Callable, Iterable
 from typing import Any, Self
 
 import httpx
@@ -8,18 +11,27 @@ from auto_leetcode.errors import (
     LeetCodeClientError,
     LeetCodeRateLimitError,
 )
-from auto_leetcode.leetcode.parser import extract_code_snippet, strip_html
-from auto_leetcode.models.problem import Problem
+from auto_leetcode.leetcode.http import ConnectionStats, HttpSettings, build_http_client
+from auto_leetcode.leetcode.parser import PARSER_VERSION, extract_code_snippet, strip_html
+from auto_leetcode.leetcode.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+from auto_leetcode.leetcode.submitter import SubmissionPoller
+from auto_leetcode.models.problem import Problem, ProblemSummary
 from auto_leetcode.models.solution import Solution
-from auto_leetcode.models.submission import SubmissionResult
+from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
+from auto_leetcode.storage.catalog_cache import CachedCatalog, CatalogCache
+from auto_leetcode.storage.problem_store import ProblemStore
 
 logger = logging.getLogger(__name__)
 
 GRAPHQL_URL = "https://leetcode.com/graphql"
 
-PROBLEM_QUERY = """
-query questionData($titleSlug: String!) {
-    question(titleSlug: $titleSlug) {
+PAGE_PARALLELISM = 4
+PAGE_MAX_RETRIES = 3
+
+# Problem categories that never come with a python3 starter snippet.
+NON_PYTHON_CATEGORIES = frozenset({"Database", "Shell", "JavaScript", "pandas"})
+
+PROBLEM_FIELDS = """
         questionId
         questionFrontendId
         title
@@ -31,10 +43,16 @@ query questionData($titleSlug: String!) {
             langSlug
             code
         }
-    }
-}
 """
 
+PROBLEM_QUERY = f"""
+query questionData($titleSlug: String!) {{
+    question(titleSlug: $titleSlug) {{{PROBLEM_FIELDS}    }}
+}}
+"""
+
+PROBLEM_BATCH_SIZE = 20
+
 PROBLEM_LIST_QUERY = """
 query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
     problemsetQuestionList: questionList(
@@ -48,6 +66,9 @@ query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $fi
             questionFrontendId
             titleSlug
             isPaidOnly
+            difficulty
+            acRate
+            categoryTitle
         }
     }
 }
@@ -70,11 +91,26 @@ query solvedQuestions($categorySlug: String, $limit: Int, $skip: Int, $filters:
 """
 
 
+def session_key(session: str) -> str:
+    """A stable, non-secret identifier for the account a session cookie belongs to."""
+    return hashlib.sha256(session.encode()).hexdigest()[:12]
+
+
 class LeetCodeClient:
-    def __init__(self, session: str, csrf_token: str) -> None:
-        self._http = httpx.AsyncClient(
-            base_url="https://leetcode.com",
-            headers={
+    def __init__(
+        self,
+        session: str,
+        csrf_token: str,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        problem_store: ProblemStore | None = None,
+        refresh_problems: bool = False,
+        http_settings: HttpSettings | None = None,
+    ) -> None:
+        self.account_key = session_key(session)
+        self._connection_stats = ConnectionStats()
+        self._http = build_http_client(
+            "https://leetcode.com",
+            {
                 "Cookie": f"LEETCODE_SESSION={session}; csrftoken={csrf_token}",
                 "X-CSRFToken": csrf_token,
                 "Referer": "https://leetcode.com",
@@ -87,9 +123,16 @@ class LeetCodeClient:
                 "Accept": "application/json",
                 "Accept-Language": "en-US,en;q=0.9",
             },
-            timeout=30.0,
+            http_settings or HttpSettings(),
+            self._connection_stats,
         )
         self._slug_map: dict[int, str] = {}
+        self._catalog: dict[int, ProblemSummary] = {}
+        self._limiter = rate_limiter or AdaptiveRateLimiter()
+        self._problem_store = problem_store
+        self._refresh_problems = refresh_problems
+        self._prefetched: dict[int, Problem] = {}
+        self._poller: SubmissionPoller | None = None
 
     async def __aenter__(self) -> Self:
         return self
@@ -98,9 +141,22 @@ class LeetCodeClient:
         await self.close()
 
     async def close(self) -> None:
+        if self._poller is not None:
+            await self._poller.close()
         await self._http.aclose()
+        if self._connection_stats.requests:
+            logger.info("LeetCode HTTP: %s", self._connection_stats.summary())
+
+    @property
+    def connection_stats(self) -> ConnectionStats:
+        return self._connection_stats
+
+    @property
+    def rate_limiter(self) -> AdaptiveRateLimiter:
+        return self._limiter
 
     async def _graphql(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        await self._limiter.acquire()
         try:
             resp = await self._http.post(
                 "/graphql",
@@ -112,93 +168,286 @@ class LeetCodeClient:
         if resp.status_code in (401, 403):
             raise LeetCodeAuthError("LeetCode session expired or invalid")
         if resp.status_code == 429:
+            self._limiter.on_throttle(parse_retry_after(resp.headers.get("Retry-After")))
             raise LeetCodeRateLimitError("Rate limited by LeetCode")
         if resp.status_code != 200:
             raise LeetCodeClientError(f"Unexpected status {resp.status_code}: {resp.text}")
+        self._limiter.on_success()
 
         data = resp.json()
         if "errors" in data:
             raise LeetCodeClientError(f"GraphQL errors: {data['errors']}")
         return data.get("data", {})
 
-    async def build_slug_map(self) -> None:
-        all_questions: list[dict[str, Any]] = []
-        skip = 0
-        limit = 100
-        while True:
-            data = await self._graphql(
-                PROBLEM_LIST_QUERY,
-                {"categorySlug": "", "limit": limit, "skip": skip, "filters": {}},
-            )
-            question_list = data.get("problemsetQuestionList", {})
-            questions = question_list.get("data", [])
-            if not questions:
-                break
-            all_questions.extend(questions)
-            total = question_list.get("totalNum", 0)
-            skip += limit
-            if skip >= total:
-                break
+    @property
+    def catalog(self) -> dict[int, ProblemSummary]:
+        return dict(self._catalog)
 
-        self._slug_map = {
-            int(q["questionFrontendId"]): q["titleSlug"]
-            for q in all_questions
-        }
+    def use_catalog(self, catalog: dict[int, ProblemSummary]) -> None:
+        """Reuse a catalog built by another client instead of paging the problem list again."""
+        self._catalog = dict(catalog)
+        self._slug_map = {problem_id: entry.slug for problem_id, entry in catalog.items()}
+
+    async def build_slug_map(self, cache: CatalogCache | None = None) -> None:
+        cached = cache.load() if cache is not None else None
+        if cache is not None and cached is not None and cache.is_fresh(cached):
+            self.use_catalog(cached.entries)
+            logger.info("Loaded slug map with %d problems from cache", len(self._slug_map))
+            return
+
+        if cached is not None:
+            catalog, total = await self._refresh_catalog(cached)
+        else:
+            questions, total = await self._paginate(PROBLEM_LIST_QUERY, {})
+            catalog = _parse_catalog(questions)
+
+        self.use_catalog(catalog)
+        if cache is not None:
+            cache.save(catalog, total)
         logger.info("Built slug map with %d problems", len(self._slug_map))
 
-    async def fetch_solved_ids(self) -> set[int]:
-        solved: list[int] = []
-        skip = 0
-        limit = 100
-        while True:
-            data = await self._graphql(
-                SOLVED_LIST_QUERY,
-                {"categorySlug": "", "limit": limit, "skip": skip, "filters": {"status": "AC"}},
-            )
-            question_list = data.get("problemsetQuestionList", {})
-            questions = question_list.get("data", [])
-            if not questions:
-                break
-            solved.extend(int(q["questionFrontendId"]) for q in questions)
-            total = question_list.get("totalNum", 0)
-            skip += limit
-            if skip >= total:
-                break
+    async def _refresh_catalog(
+        self, cached: CachedCatalog
+    ) -> tuple[dict[int, ProblemSummary], int]:
+        # New problems are appended to the end of the list, so only the pages past
+        # what we already hold need fetching. A shrinking list means it was reshuffled.
+        questions, total = await self._paginate(PROBLEM_LIST_QUERY, {}, skip=cached.total)
+        if total < cached.total:
+            logger.info("Problem list shrank (%d -> %d), rebuilding catalog", cached.total, total)
+            questions, total = await self._paginate(PROBLEM_LIST_QUERY, {})
+            return _parse_catalog(questions), total
 
-        result = set(solved)
+        logger.info("Catalog cache stale, fetched %d new problems", len(questions))
+        return {**cached.entries, **_parse_catalog(questions)}, total
+
+    async def fetch_solved_ids(self) -> set[int]:
+        questions, _ = await self._paginate(SOLVED_LIST_QUERY, {"status": "AC"})
+        result = {int(q["questionFrontendId"]) for q in questions}
         logger.info("Fetched %d solved problems from LeetCode", len(result))
         return result
 
-    async def fetch_problem(self, problem_id: int) -> Problem | None:
-        if not self._slug_map:
-            raise LeetCodeClientError("Slug map not built. Call build_slug_map() first.")
+    async def _paginate(
+        self,
+        query: str,
+        filters: dict[str, Any],
+        skip: int = 0,
+        limit: int = 100,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Fetch every question list page from ``skip`` on. Returns them and ``totalNum``.
 
-        slug = self._slug_map.get(problem_id)
+        The first page reports ``totalNum``; the rest are fetched concurrently
+        (at most ``PAGE_PARALLELISM`` at a time) and reassembled in order.
+        """
+        first, total = await self._fetch_page(query, filters, skip, limit)
+        if not first:
+            return [], total
+
+        semaphore = asyncio.Semaphore(PAGE_PARALLELISM)
+
+        async def bounded(page_skip: int) -> list[dict[str, Any]]:
+            async with semaphore:
+                page, _ = await self._fetch_page(query, filters, page_skip, limit)
+                return page
+
+        rest = await asyncio.gather(
+            *(bounded(page_skip) for page_skip in range(skip + limit, total, limit))
+        )
+        return [q for page in (first, *rest) for q in page], total
+
+    async def _fetch_page(
+        self,
+        query: str,
+        filters: dict[str, Any],
+        skip: int,
+        limit: int,
+    ) -> tuple[list[dict[str, Any]], int]:
+        for page_try in range(1, PAGE_MAX_RETRIES + 1):
+            try:
+                data = await self._graphql(
+                    query,
+                    {"categorySlug": "", "limit": limit, "skip": skip, "filters": filters},
+                )
+                break
+            except LeetCodeAuthError:
+                raise
+            except LeetCodeClientError as e:
+                if page_try == PAGE_MAX_RETRIES:
+                    raise
+                logger.warning(
+                    "Page at skip=%d failed (attempt %d/%d): %s",
+                    skip,
+                    page_try,
+                    PAGE_MAX_RETRIES,
+                    e,
+                )
+        question_list = data.get("problemsetQuestionList", {})
+        return question_list.get("data", []), question_list.get("totalNum", 0)
+
+    async def fetch_problem(self, problem_id: int) -> Problem | None:
+        slug = self._resolve_slug(problem_id)
         if slug is None:
-            logger.warning("Problem #%d not found in slug map", problem_id)
             return None
 
+        if (problem := self._prefetched.pop(problem_id, None)) is not None:
+            return problem
+        if (problem := self._cached_problem(slug)) is not None:
+            return problem
+
         data = await self._graphql(PROBLEM_QUERY, {"titleSlug": slug})
         q = data.get("question")
         if q is None:
             return None
+        return self._remember(slug, q)
 
-        return Problem(
-            id=int(q["questionFrontendId"]),
-            title=q["title"],
-            slug=q["titleSlug"],
-            difficulty=q["difficulty"],
-            description=strip_html(q.get("content", "") or ""),
-            code_snippet=extract_code_snippet(q.get("codeSnippets", []) or []),
-            paid_only=bool(q.get("isPaidOnly", False)),
-        )
+    async def fetch_problems(
+        self,
+        problem_ids: list[int],
+        batch_size: int = PROBLEM_BATCH_SIZE,
+    ) -> dict[int, Problem | None]:
+        """Fetch several problems with aliased ``question`` fields, ``batch_size`` per request.
+
+        Results are also kept for the next ``fetch_problem`` call, so this doubles
+        as a prefetch. A batch the server rejects is retried in halves.
+        """
+        results: dict[int, Problem | None] = {}
+        to_fetch: list[tuple[int, str]] = []
+        for problem_id in problem_ids:
+            slug = self._resolve_slug(problem_id)
+            if slug is None:
+                results[problem_id] = None
+            elif problem := self._prefetched.get(problem_id) or self._cached_problem(slug):
+                results[problem_id] = problem
+            else:
+                to_fetch.append((problem_id, slug))
+
+        for start in range(0, len(to_fetch), batch_size):
+            fetched = await self._fetch_batch(to_fetch[start : start + batch_size])
+            for problem_id, problem in fetched.items():
+                results[problem_id] = problem
+                if problem is not None:
+                    self._prefetched[problem_id] = problem
+        return results
+
+    async def _fetch_batch(self, batch: list[tuple[int, str]]) -> dict[int, Problem | None]:
+        variables = {f"s{i}": slug for i, (_, slug) in enumerate(batch)}
+        try:
+            data = await self._graphql(_batch_problem_query(len(batch)), variables)
+        except (LeetCodeAuthError, LeetCodeRateLimitError):
+            raise
+        except LeetCodeClientError as e:
+            if len(batch) == 1:
+                raise
+            half = len(batch) // 2
+            logger.warning("Batch of %d problems rejected, splitting: %s", len(batch), e)
+            return {
+                **await self._fetch_batch(batch[:half]),
+                **await self._fetch_batch(batch[half:]),
+            }
+
+        results: dict[int, Problem | None] = {}
+        for i, (problem_id, slug) in enumerate(batch):
+            q = data.get(f"q{i}")
+            results[problem_id] = self._remember(slug, q) if q is not None else None
+        return results
+
+    def _resolve_slug(self, problem_id: int) -> str | None:
+        if not self._slug_map:
+            raise LeetCodeClientError("Slug map not built. Call build_slug_map() first.")
+        slug = self._slug_map.get(problem_id)
+        if slug is None:
+            logger.warning("Problem #%d not found in slug map", problem_id)
+        return slug
+
+    def _cached_problem(self, slug: str) -> Problem | None:
+        if self._problem_store is None or self._refresh_problems:
+            return None
+        stored = self._problem_store.get(slug)
+        if stored is None:
+            return None
+        if stored.parser_version == PARSER_VERSION:
+            return stored.problem
+        problem = _parse_problem(stored.raw)
+        self._problem_store.put(slug, stored.raw, problem, PARSER_VERSION)
+        return problem
+
+    def _remember(self, slug: str, q: dict[str, Any]) -> Problem:
+        problem = _parse_problem(q)
+        if self._problem_store is not None:
+            changed = self._problem_store.put(slug, q, problem, PARSER_VERSION)
+            if changed and self._refresh_problems:
+                logger.info("Problem #%d content changed since last fetch", problem.id)
+        return problem
+
+    async def submit(
+        self,
+        solution: Solution,
+        on_submitted: Callable[[int], None] | None = None,
+    ) -> SubmissionResult:
+        submission_id = await self.start_submission(solution)
+        if on_submitted is not None:
+            on_submitted(submission_id)
+        return await self.check_submission(submission_id, solution)
+
+    async def start_submission(self, solution: Solution) -> int:
+        from auto_leetcode.leetcode.submitter import post_submission
 
-    async def submit(self, solution: Solution) -> SubmissionResult:
-        from auto_leetcode.leetcode.submitter import submit_solution
+        return await post_submission(self._http, self._slug_for(solution), solution, self._limiter)
 
+    async def check_submission(self, submission_id: int, solution: Solution) -> SubmissionResult:
+        summary = self._catalog.get(solution.problem_id)
+        difficulty = summary.difficulty if summary is not None else ""
+        return await self.poller.wait(submission_id, solution, difficulty)
+
+    @property
+    def poller(self) -> SubmissionPoller:
+        if self._poller is None:
+            self._poller = SubmissionPoller(self._http, self._limiter)
+        return self._poller
+
+    def learn_judge_latency(self, samples: Iterable[tuple[int, SubmissionStatus, float]]) -> None:
+        """Seed the poller's latency model from past (problem_id, status, seconds)."""
+        for problem_id, status, seconds in samples:
+            summary = self._catalog.get(problem_id)
+            if summary is not None:
+                self.poller.latency.observe(summary.difficulty, status, seconds)
+
+    def _slug_for(self, solution: Solution) -> str:
         slug = self._slug_map.get(solution.problem_id)
         if slug is None:
-            raise LeetCodeClientError(
-                f"No slug found for problem #{solution.problem_id}"
-            )
-        return await submit_solution(self._http, slug, solution)
+            raise LeetCodeClientError(f"No slug found for problem #{solution.problem_id}")
+        return slug
+
+
+def _batch_problem_query(count: int) -> str:
+    params = ", ".join(f"$s{i}: String!" for i in range(count))
+    fields = "".join(
+        f"    q{i}: question(titleSlug: $s{i}) {{{PROBLEM_FIELDS}    }}\n" for i in range(count)
+    )
+    return f"query batchQuestionData({params}) {{\n{fields}}}\n"
+
+
+def _parse_problem(q: dict[str, Any]) -> Problem:
+    return Problem(
+        id=int(q["questionFrontendId"]),
+        title=q["title"],
+        slug=q["titleSlug"],
+        difficulty=q["difficulty"],
+        description=strip_html(q.get("content", "") or ""),
+        code_snippet=extract_code_snippet(q.get("codeSnippets", []) or []),
+        paid_only=bool(q.get("isPaidOnly", False)),
+    )
+
+
+def _parse_catalog(questions: list[dict[str, Any]]) -> dict[int, ProblemSummary]:
+    return {int(q["questionFrontendId"]): _parse_summary(q) for q in questions}
+
+
+def _parse_summary(q: dict[str, Any]) -> ProblemSummary:
+    return ProblemSummary(
+        id=int(q["questionFrontendId"]),
+        slug=q["titleSlug"],
+        difficulty=q.get("difficulty") or "",
+        ac_rate=float(q.get("acRate") or 0.0),
+        paid_only=bool(q.get("isPaidOnly", False)),
+        has_python=q.get("categoryTitle") not in NON_PYTHON_CATEGORIES,
+    )
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import importlib.util
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HttpSettings:
+    http2: bool = True
+    max_connections: int = 10
+    max_keepalive_connections: int = 5
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 10.0
+
+
+@dataclass
+class ConnectionStats:
+    """Connection reuse counters fed by httpcore trace events.
+
+    Pool wait is the time from handing a request to the transport until it
+    either starts opening a connection or starts writing on a pooled one.
+    """
+
+    requests: int = 0
+    new_connections: int = 0
+    pool_wait_seconds: float = 0.0
+    max_pool_wait_seconds: float = 0.0
+
+    @property
+    def reused_connections(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    def record_wait(self, seconds: float) -> None:
+        self.pool_wait_seconds += seconds
+        self.max_pool_wait_seconds = max(self.max_pool_wait_seconds, seconds)
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} requests, {self.new_connections} new connections, "
+            f"{self.reused_connections} reused, pool wait {self.pool_wait_seconds:.2f}s "
+            f"total / {self.max_pool_wait_seconds:.2f}s max"
+        )
+
+
+class _RequestTrace:
+    def __init__(self, stats: ConnectionStats, clock: Callable[[], float]) -> None:
+        self._stats = stats
+        self._clock = clock
+        self._started = clock()
+        self._waited = False
+
+    async def __call__(self, event: str, info: dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.started":
+            self._stats.new_connections += 1
+            self._end_wait()
+        elif event.endswith(".send_request_headers.started"):
+            self._stats.requests += 1
+            self._end_wait()
+
+    def _end_wait(self) -> None:
+        if not self._waited:
+            self._waited = True
+            self._stats.record_wait(self._clock() - self._started)
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_http_client(
+    base_url: str,
+    headers: dict[str, str],
+    settings: HttpSettings,
+    stats: ConnectionStats,
+    clock: Callable[[], float] = time.monotonic,
+) -> httpx.AsyncClient:
+    http2 = settings.http2
+    if http2 and not http2_available():
+        logger.warning("HTTP/2 requested but h2 is not installed, using HTTP/1.1")
+        http2 = False
+
+    async def attach_trace(request: httpx.Request) -> None:
+        request.extensions["trace"] = _RequestTrace(stats, clock)
+
+    return httpx.AsyncClient(
+        base_url=base_url,
+        headers=headers,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.connect_timeout,
+            read=settings.read_timeout,
+            write=settings.write_timeout,
+            pool=settings.pool_timeout,
+        ),
+        event_hooks={"request": [attach_trace]},
+    )
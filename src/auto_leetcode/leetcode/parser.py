@@ -1,9 +1,163 @@
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+
+# Bump when strip_html/extract_code_snippet output changes so cached problems get re-parsed.
+PARSER_VERSION = 2
+
+_BLOCK_TAGS = frozenset({"p", "div", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "table"})
+_SKIPPED_TAGS = frozenset({"script", "style"})
+
+
+class _MarkdownWriter(HTMLParser):
+    """Streams problem HTML into compact Markdown.
+
+    Keeps the structure the model needs (code blocks, inline code, lists,
+    ``^`` exponents) and drops the rest, collapsing whitespace as it goes.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._out: list[str] = []
+        self._pending_newlines = 0
+        self._space = False
+        self._item_start = False
+        self._lists: list[list[int]] = []
+        self._pre: list[str] | None = None
+        self._pre_depth = 0
+        self._code_depth = 0
+        self._skip_depth = 0
+        self._row_cells = 0
+
+    def markdown(self) -> str:
+        if self._pre is not None:
+            self._end_pre(self._pre)
+        return "".join(self._out).strip()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif self._pre is not None:
+            if tag == "pre":
+                self._pre_depth += 1
+            elif tag == "br":
+                self._pre.append("\n")
+        elif tag == "pre":
+            self._pre = []
+            self._pre_depth = 1
+        elif tag in _BLOCK_TAGS:
+            self._break(2)
+        elif tag == "br":
+            self._break(1)
+        elif tag in ("ul", "ol"):
+            self._break(1 if self._lists else 2)
+            self._lists.append([tag == "ol", 0])
+        elif tag == "li":
+            self._start_item()
+        elif tag == "code":
+            if self._code_depth == 0:
+                self._write("`")
+            self._code_depth += 1
+        elif tag == "sup":
+            self._write("^", glue=True)
+        elif tag == "sub":
+            self._write("_", glue=True)
+        elif tag == "tr":
+            self._break(1)
+            self._row_cells = 0
+        elif tag in ("td", "th"):
+            if self._row_cells:
+                self._write(" | ", glue=True)
+            self._row_cells += 1
+        elif tag == "img":
+            alt = dict(attrs).get("alt")
+            if alt:
+                self._write(f"[{alt}]")
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif self._pre is not None:
+            if tag == "pre":
+                self._pre_depth -= 1
+                if self._pre_depth == 0:
+                    self._end_pre(self._pre)
+        elif tag in _BLOCK_TAGS:
+            self._break(2)
+        elif tag in ("ul", "ol"):
+            self._item_start = False
+            if self._lists:
+                self._lists.pop()
+            self._break(1 if self._lists else 2)
+        elif tag == "code" and self._code_depth:
+            self._code_depth -= 1
+            if self._code_depth == 0:
+                self._write("`", glue=True)
+        elif tag == "tr":
+            self._break(1)
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        data = data.replace("\xa0", " ")
+        if self._pre is not None:
+            self._pre.append(data)
+            return
+        words = data.split()
+        if not words:
+            self._space = self._space or bool(data)
+            return
+        if data[0].isspace():
+            self._space = True
+        self._write(" ".join(words))
+        self._space = data[-1].isspace()
+
+    def _start_item(self) -> None:
+        self._item_start = False
+        self._break(1)
+        if not self._lists:
+            self._lists.append([False, 0])
+        current = self._lists[-1]
+        current[1] += 1
+        marker = f"{current[1]}. " if current[0] else "- "
+        self._write("  " * (len(self._lists) - 1) + marker)
+        self._item_start = True
+
+    def _end_pre(self, chunks: list[str]) -> None:
+        self._pre = None
+        lines = [line.rstrip() for line in "".join(chunks).strip("\n").split("\n")]
+        self._break(2)
+        self._write("```\n" + "\n".join(lines) + "\n```")
+        self._break(2)
+
+    def _break(self, newlines: int) -> None:
+        self._space = False
+        if self._item_start:
+            # A block opening right inside a list item stays on the marker's line.
+            return
+        if self._lists:
+            newlines = 1
+        self._pending_newlines = max(self._pending_newlines, newlines)
+
+    def _write(self, text: str, glue: bool = False) -> None:
+        if self._out:
+            if self._pending_newlines:
+                self._out.append("\n" * self._pending_newlines)
+            elif self._space and not glue and not self._out[-1][-1].isspace():
+                self._out.append(" ")
+        self._pending_newlines = 0
+        self._space = False
+        self._item_start = False
+        self._out.append(text)
 
 
 def strip_html(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    return soup.get_text(separator="\n").strip()
+    """Convert problem HTML into compact Markdown for the prompt."""
+    writer = _MarkdownWriter()
+    writer.feed(html)
+    writer.close()
+    return writer.markdown()
 
 
 def extract_code_snippet(snippets: list[dict[str, str]], lang: str = "python3") -> str:
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THROTTLE_PAUSE_SECONDS = 30.0
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate follows AIMD.
+
+    Every healthy response adds ``increase`` requests/second to the rate, every
+    throttled one multiplies it by ``decrease`` and pauses the bucket until the
+    server's ``Retry-After`` (or a default pause) has elapsed.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = 0.5,
+        min_rate: float = 0.02,
+        max_rate: float = 2.0,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+        burst: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._rate = min(max(initial_rate, min_rate), max_rate)
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._increase = increase
+        self._decrease = decrease
+        self._burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = burst
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Current allowed requests per second."""
+        return self._rate
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._paused_until:
+                    await self._sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await self._sleep((1.0 - self._tokens) / self._rate)
+
+    def on_success(self) -> None:
+        self._refill(self._clock())
+        self._rate = min(self._max_rate, self._rate + self._increase)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        now = self._clock()
+        self._refill(now)
+        self._rate = max(self._min_rate, self._rate * self._decrease)
+        self._tokens = 0.0
+        pause = retry_after if retry_after is not None else DEFAULT_THROTTLE_PAUSE_SECONDS
+        self._paused_until = max(self._paused_until, now + pause)
+        logger.warning(
+            "Throttled by LeetCode, pausing %.1fs and slowing to %.2f req/s", pause, self._rate
+        )
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+        self._updated = now
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import heapq
+import itertools
 import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
 import httpx
 
 from auto_leetcode.errors import LeetCodeClientError, LeetCodeRateLimitError
+from auto_leetcode.leetcode.rate_limiter import AdaptiveRateLimiter, parse_retry_after
 from auto_leetcode.models.solution import Solution
 from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
 
@@ -21,15 +28,218 @@ STATUS_MAP: dict[int, SubmissionStatus] = {
     15: SubmissionStatus.TIME_LIMIT,
 }
 
-POLL_INTERVAL = 2.0
-MAX_POLL_ATTEMPTS = 30
+DEFAULT_VERDICT_SECONDS = 3.0
+LATENCY_SMOOTHING = 0.3
+MIN_POLL_INTERVAL = 0.5
+MAX_POLL_INTERVAL = 5.0
+POLL_BACKOFF = 1.5
+POLL_TIMEOUT_SECONDS = 60.0
 
 
-async def submit_solution(
+class JudgeLatencyModel:
+    """Moving average of time-to-verdict per (difficulty, status).
+
+    The verdict is unknown while waiting, so the first check is aimed at the
+    fastest status seen for the difficulty: compile errors and quick wrong
+    answers come back first, and anything slower is caught by the backoff.
+    """
+
+    def __init__(
+        self,
+        default_seconds: float = DEFAULT_VERDICT_SECONDS,
+        smoothing: float = LATENCY_SMOOTHING,
+    ) -> None:
+        self._default = default_seconds
+        self._smoothing = smoothing
+        self._averages: dict[tuple[str, SubmissionStatus], float] = {}
+
+    def observe(self, difficulty: str, status: SubmissionStatus, seconds: float) -> None:
+        key = (difficulty, status)
+        previous = self._averages.get(key)
+        if previous is None:
+            self._averages[key] = seconds
+        else:
+            self._averages[key] = previous + self._smoothing * (seconds - previous)
+
+    def estimate(self, difficulty: str, status: SubmissionStatus) -> float | None:
+        return self._averages.get((difficulty, status))
+
+    def first_check_delay(self, difficulty: str) -> float:
+        same_difficulty = [v for (d, _), v in self._averages.items() if d == difficulty]
+        estimates = same_difficulty or list(self._averages.values())
+        return min(estimates) if estimates else self._default
+
+
+@dataclass
+class _Watch:
+    submission_id: int
+    solution: Solution
+    difficulty: str
+    started: float
+    interval: float
+    future: asyncio.Future[SubmissionResult]
+
+
+class SubmissionPoller:
+    """Polls every outstanding submission from a single loop.
+
+    Each submission is checked first after the learned judge latency for its
+    difficulty, then at intervals growing by ``backoff`` up to ``max_interval``.
+    Checks go through the shared rate limiter one at a time, so many in-flight
+    submissions cost no more concurrent requests than one.
+    """
+
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        limiter: AdaptiveRateLimiter,
+        latency: JudgeLatencyModel | None = None,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+        backoff: float = POLL_BACKOFF,
+        timeout: float = POLL_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._http = http
+        self._limiter = limiter
+        self.latency = latency or JudgeLatencyModel()
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._timeout = timeout
+        self._clock = clock
+        self._watches: dict[int, _Watch] = {}
+        self._schedule: list[tuple[float, int, int]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._loop_task: asyncio.Task[None] | None = None
+
+    async def wait(
+        self,
+        submission_id: int,
+        solution: Solution,
+        difficulty: str = "",
+        submitted_at: float | None = None,
+    ) -> SubmissionResult:
+        """Wait for a verdict; ``submitted_at`` is a ``clock`` reading, defaulting to now."""
+        now = self._clock()
+        first_delay = max(self.latency.first_check_delay(difficulty), self._min_interval)
+        watch = _Watch(
+            submission_id=submission_id,
+            solution=solution,
+            difficulty=difficulty,
+            started=now if submitted_at is None else submitted_at,
+            interval=max(first_delay / 2, self._min_interval),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._watches[submission_id] = watch
+        self._push(now + first_delay, submission_id)
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+        try:
+            return await watch.future
+        finally:
+            if self._watches.get(submission_id) is watch:
+                del self._watches[submission_id]
+
+    async def close(self) -> None:
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+
+    def _push(self, due: float, submission_id: int) -> None:
+        heapq.heappush(self._schedule, (due, next(self._sequence), submission_id))
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while self._schedule:
+            due, _, submission_id = self._schedule[0]
+            delay = due - self._clock()
+            if delay > 0:
+                # A newly added submission may fall due before the current head.
+                self._wakeup.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                continue
+            heapq.heappop(self._schedule)
+            watch = self._watches.get(submission_id)
+            if watch is None or watch.future.done():
+                continue
+            await self._check(watch)
+
+    async def _check(self, watch: _Watch) -> None:
+        """Check one submission; a failure resolves only that submission's wait."""
+        try:
+            await self._poll(watch)
+        except Exception as e:
+            error = f"Poll failed for submission {watch.submission_id}: {e}"
+            self._fail(watch, LeetCodeClientError(error))
+
+    async def _poll(self, watch: _Watch) -> None:
+        await self._limiter.acquire()
+        # The waiter may have been cancelled while this check queued for the limiter.
+        if watch.future.done():
+            return
+        resp = await self._http.get(f"/submissions/detail/{watch.submission_id}/check/")
+
+        if resp.status_code == 429:
+            self._limiter.on_throttle(parse_retry_after(resp.headers.get("Retry-After")))
+            self._reschedule(watch)
+            return
+        if resp.status_code != 200:
+            self._reschedule(watch)
+            return
+        self._limiter.on_success()
+
+        try:
+            data: dict[str, Any] = resp.json()
+        except ValueError:
+            # An HTML error page served with 200; the next check usually gets JSON.
+            self._reschedule(watch)
+            return
+        if data.get("state") != "SUCCESS":
+            self._reschedule(watch)
+            return
+
+        elapsed = self._clock() - watch.started
+        result = _parse_verdict(data, watch.solution, elapsed)
+        self.latency.observe(watch.difficulty, result.status, elapsed)
+        logger.info(
+            "Submission %d for #%d judged %s in %.1fs",
+            watch.submission_id,
+            watch.solution.problem_id,
+            result.status.value,
+            elapsed,
+        )
+        if not watch.future.done():
+            watch.future.set_result(result)
+
+    def _reschedule(self, watch: _Watch) -> None:
+        now = self._clock()
+        if now - watch.started >= self._timeout:
+            self._fail(
+                watch,
+                LeetCodeClientError(
+                    f"Submission {watch.submission_id} did not complete after {self._timeout:.0f}s"
+                ),
+            )
+            return
+        self._push(now + watch.interval, watch.submission_id)
+        watch.interval = min(watch.interval * self._backoff, self._max_interval)
+
+    @staticmethod
+    def _fail(watch: _Watch, error: Exception) -> None:
+        if not watch.future.done():
+            watch.future.set_exception(error)
+
+
+async def post_submission(
     http: httpx.AsyncClient,
     slug: str,
     solution: Solution,
-) -> SubmissionResult:
+    limiter: AdaptiveRateLimiter,
+) -> int:
+    await limiter.acquire()
     try:
         resp = await http.post(
             f"/problems/{slug}/submit/",
@@ -42,6 +252,8 @@ async def submit_solution(
     except httpx.HTTPError as e:
         raise LeetCodeClientError(f"Submit failed for problem #{solution.problem_id}: {e}") from e
 
+    if resp.status_code in (403, 429):
+        limiter.on_throttle(parse_retry_after(resp.headers.get("Retry-After")))
     if resp.status_code == 429:
         raise LeetCodeRateLimitError("Rate limited during submission")
     if resp.status_code == 403:
@@ -50,51 +262,27 @@ async def submit_solution(
         )
     if resp.status_code != 200:
         raise LeetCodeClientError(f"Submit returned status {resp.status_code}: {resp.text}")
+    limiter.on_success()
 
     data: dict[str, Any] = resp.json()
     submission_id = data.get("submission_id")
     if not submission_id:
         raise LeetCodeClientError(f"No submission_id in response: {data}")
+    return int(submission_id)
 
-    return await _poll_result(http, submission_id, solution)
 
-
-async def _poll_result(
-    http: httpx.AsyncClient,
-    submission_id: int,
-    solution: Solution,
+def _parse_verdict(
+    data: dict[str, Any], solution: Solution, verdict_seconds: float
 ) -> SubmissionResult:
-    for _ in range(MAX_POLL_ATTEMPTS):
-        await asyncio.sleep(POLL_INTERVAL)
-
-        try:
-            resp = await http.get(f"/submissions/detail/{submission_id}/check/")
-        except httpx.HTTPError as e:
-            raise LeetCodeClientError(f"Poll failed for submission {submission_id}: {e}") from e
-
-        if resp.status_code != 200:
-            continue
-
-        data: dict[str, Any] = resp.json()
-        state = data.get("state")
-
-        if state != "SUCCESS":
-            continue
-
-        status_code = data.get("status_code", -1)
-        status = STATUS_MAP.get(status_code, SubmissionStatus.UNKNOWN)
-
-        return SubmissionResult(
-            problem_id=solution.problem_id,
-            status=status,
-            runtime_ms=_parse_int(data.get("status_runtime")),
-            memory_mb=_parse_float(data.get("status_memory")),
-            error_message=data.get("full_runtime_error") or data.get("compile_error"),
-            solution=solution,
-        )
-
-    raise LeetCodeClientError(
-        f"Submission {submission_id} did not complete after {MAX_POLL_ATTEMPTS} polls"
+    status_code = data.get("status_code", -1)
+    return SubmissionResult(
+        problem_id=solution.problem_id,
+        status=STATUS_MAP.get(status_code, SubmissionStatus.UNKNOWN),
+        runtime_ms=_parse_int(data.get("status_runtime")),
+        memory_mb=_parse_float(data.get("status_memory")),
+        error_message=data.get("full_runtime_error") or data.get("compile_error"),
+        solution=solution,
+        verdict_seconds=verdict_seconds,
     )
 
 
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class BatchProgress:
+    done: bool
+    succeeded: int
+    failed: int
+    total: int
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """A provider batch of first-attempt generations that may outlive the process."""
+
+    batch_id: str
+    provider: str
+    model: str
+    problem_ids: tuple[int, ...]
+    submitted_at: float
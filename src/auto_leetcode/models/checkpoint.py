@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.submission import SubmissionResult
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    problem_id: int
+    attempt: int
+    previous_attempts: tuple[SubmissionResult, ...]
+    pending_solution: Solution | None = None
+    pending_submission_id: int | None = None
+    # ``LeetCodeClient.account_key`` of the session that made the pending submission.
+    pending_account: str | None = None
+    fallbacks: tuple[Solution, ...] = ()
@@ -10,3 +10,15 @@ class Problem:
     description: str
     code_snippet: str
     paid_only: bool
+
+
+@dataclass(frozen=True)
+class ProblemSummary:
+    """Catalog entry from the problem list, available without a per-problem fetch."""
+
+    id: int
+    slug: str
+    difficulty: str
+    ac_rate: float
+    paid_only: bool
+    has_python: bool = True
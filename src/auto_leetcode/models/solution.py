@@ -1,4 +1,28 @@
-from dataclasses import dataclass
+import ast
+import hashlib
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class GenerationStats:
+    """How one model call went.
+
+    ``time_to_code`` is when the first complete code block had arrived, and
+    ``output_tokens`` is estimated from the text when a stream was cut short.
+    Prompt token counts are None when the provider did not report them.
+    ``batched`` results came from a provider batch and have no latency.
+    """
+
+    seconds: float
+    time_to_code: float | None
+    output_tokens: int
+    tokens_estimated: bool = False
+    stopped_early: bool = False
+    cached: bool = False
+    batched: bool = False
+    input_tokens: int | None = None
+    cache_read_tokens: int | None = None
+    cache_write_tokens: int | None = None
 
 
 @dataclass(frozen=True)
@@ -9,3 +33,33 @@ class Solution:
     model_used: str
     attempt: int
     reasoning: str = ""
+    stats: GenerationStats | None = field(default=None, compare=False)
+
+
+DOCSTRING_OWNERS = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def code_hash(code: str) -> str:
+    """A hash of the code that ignores formatting, comments and docstrings.
+
+    Code that does not parse is hashed with its whitespace collapsed instead.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        normalized = " ".join(code.split())
+    else:
+        for node in ast.walk(tree):
+            if isinstance(node, DOCSTRING_OWNERS) and _has_docstring(node.body):
+                node.body = node.body[1:] or [ast.Pass()]
+        normalized = ast.dump(tree)
+    return hashlib.sha256(normalized.encode()).hexdigest()[:16]
+
+
+def _has_docstring(body: list[ast.stmt]) -> bool:
+    return (
+        bool(body)
+        and isinstance(body[0], ast.Expr)
+        and isinstance(body[0].value, ast.Constant)
+        and isinstance(body[0].value.value, str)
+    )
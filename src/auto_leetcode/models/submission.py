@@ -22,3 +22,29 @@ class SubmissionResult:
     memory_mb: float | None
     error_message: str | None
     solution: Solution
+    verdict_seconds: float | None = None
+
+
+@dataclass(frozen=True)
+class SubmissionHistory:
+    attempts: int
+    last_status: SubmissionStatus
+
+
+@dataclass(frozen=True)
+class ModelStats:
+    """Verdicts and generation latency for the submissions one model produced."""
+
+    submissions: int
+    accepted: int
+    # Sum and count over submissions with a fresh (uncached) generation time.
+    generation_seconds: float = 0.0
+    timed: int = 0
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.submissions if self.submissions else 0.0
+
+    @property
+    def mean_generation_seconds(self) -> float | None:
+        return self.generation_seconds / self.timed if self.timed else None
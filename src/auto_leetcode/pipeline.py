@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Coroutine, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from auto_leetcode.ai.protocol import SolutionGenerator
+from auto_leetcode.checks.protocol import SolutionCheck
+from auto_leetcode.config import Config
+from auto_leetcode.errors import LeetCodeAuthError, LeetCodeClientError
+from auto_leetcode.leetcode.client import PROBLEM_BATCH_SIZE, LeetCodeClient
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.problem_run import ProblemRun
+from auto_leetcode.runner import load_problem, prefetch_problems, retry_submit
+from auto_leetcode.storage.checkpoint_store import CheckpointStore
+from auto_leetcode.storage.file_saver import FileSaver
+from auto_leetcode.storage.json_repository import JsonRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StageLimits:
+    fetch: int
+    generate: int
+    submit: int
+    poll: int
+
+    @classmethod
+    def from_config(cls, config: Config) -> StageLimits:
+        # Submissions stay serialized: they are what LeetCode throttles hardest.
+        return cls(
+            fetch=max(1, config.concurrency // 2),
+            generate=config.concurrency,
+            submit=1,
+            poll=config.concurrency,
+        )
+
+
+@dataclass
+class _Job:
+    run: ProblemRun
+    solution: Solution | None = None
+    submission_id: int | None = None
+    resubmitted: bool = False
+
+
+class Pipeline:
+    """Overlaps fetch, generate, submit and poll work across several problems.
+
+    Stages are connected by bounded queues. At most ``config.concurrency`` problems
+    are admitted at once, and every queue can hold that many jobs, so a job moving
+    back from poll to generate for a retry never blocks on a full queue.
+    """
+
+    def __init__(
+        self,
+        client: LeetCodeClient,
+        generator: SolutionGenerator,
+        repository: JsonRepository,
+        saver: FileSaver,
+        config: Config,
+        remote_solved: set[int],
+        checkpoints: CheckpointStore | None = None,
+        checks: Sequence[SolutionCheck] = (),
+    ) -> None:
+        self._client = client
+        self._generator = generator
+        self._repository = repository
+        self._saver = saver
+        self._config = config
+        self._remote_solved = remote_solved
+        self._checkpoints = checkpoints
+        self._checks = checks
+        self._jobs: dict[int, _Job] = {}
+        self._limits = StageLimits.from_config(config)
+
+        capacity = max(1, config.concurrency)
+        self._capacity = capacity
+        self._admission = asyncio.Semaphore(capacity)
+        self._fetch_queue: asyncio.Queue[int] = asyncio.Queue(capacity)
+        self._generate_queue: asyncio.Queue[_Job] = asyncio.Queue(capacity)
+        self._submit_queue: asyncio.Queue[_Job] = asyncio.Queue(capacity)
+        self._poll_queue: asyncio.Queue[_Job] = asyncio.Queue(capacity)
+        self._on_finished: Callable[[int], None] | None = None
+
+    async def run(
+        self,
+        problem_ids: Iterable[int],
+        on_finished: Callable[[int], None] | None = None,
+    ) -> None:
+        self._on_finished = on_finished
+        workers = [
+            *self._spawn(self._limits.fetch, self._fetch_worker),
+            *self._spawn(self._limits.generate, self._generate_worker),
+            *self._spawn(self._limits.submit, self._submit_worker),
+            *self._spawn(self._limits.poll, self._poll_worker),
+        ]
+        feeder = asyncio.create_task(self._feed(problem_ids))
+        try:
+            done, _ = await asyncio.wait([feeder, *workers], return_when=asyncio.FIRST_COMPLETED)
+            # Workers loop forever, so anything that finished besides the feeder failed.
+            for task in done:
+                task.result()
+        except asyncio.CancelledError:
+            for job in self._jobs.values():
+                job.run.suspend()
+            raise
+        finally:
+            for task in [feeder, *workers]:
+                task.cancel()
+            await asyncio.gather(feeder, *workers, return_exceptions=True)
+
+    def _spawn(
+        self, count: int, worker: Callable[[], Coroutine[Any, Any, None]]
+    ) -> list[asyncio.Task[None]]:
+        return [asyncio.create_task(worker()) for _ in range(count)]
+
+    async def _feed(self, problem_ids: Iterable[int]) -> None:
+        # Take a slot before pulling the next ID so lazy sources hand out work only
+        # when the pipeline can actually start it.
+        iterator = iter(problem_ids)
+        while True:
+            await self._admission.acquire()
+            problem_id = next(iterator, None)
+            if problem_id is None:
+                self._admission.release()
+                break
+            await self._fetch_queue.put(problem_id)
+        # Every admitted problem releases its slot when done; owning all slots means drained.
+        for _ in range(self._capacity):
+            await self._admission.acquire()
+
+    def _finish(self, problem_id: int) -> None:
+        logger.debug("Problem #%d left the pipeline", problem_id)
+        self._jobs.pop(problem_id, None)
+        self._admission.release()
+        if self._on_finished is not None:
+            self._on_finished(problem_id)
+
+    async def _fetch_worker(self) -> None:
+        while True:
+            # Take whatever else is already waiting so it shares one batched request.
+            problem_ids = [await self._fetch_queue.get()]
+            while len(problem_ids) < PROBLEM_BATCH_SIZE and not self._fetch_queue.empty():
+                problem_ids.append(self._fetch_queue.get_nowait())
+            await prefetch_problems(
+                self._client, self._repository, problem_ids, self._remote_solved
+            )
+            for problem_id in problem_ids:
+                await self._load(problem_id)
+
+    async def _load(self, problem_id: int) -> None:
+        problem = await load_problem(
+            self._client, self._repository, problem_id, self._remote_solved
+        )
+        if problem is None:
+            self._finish(problem_id)
+            return
+        run = ProblemRun(
+            problem,
+            self._generator,
+            self._repository,
+            self._saver,
+            self._config,
+            self._checkpoints,
+            self._checks,
+        )
+        job = _Job(run)
+        self._jobs[problem_id] = job
+        run.adopt(self._client.account_key)
+        if (pending := run.pending_submission) is not None:
+            job.submission_id, job.solution = pending
+            await self._poll_queue.put(job)
+            return
+        await self._generate_queue.put(job)
+
+    async def _generate_worker(self) -> None:
+        while True:
+            job = await self._generate_queue.get()
+            job.solution = await job.run.next_solution()
+            if job.solution is None:
+                self._finish(job.run.problem_id)
+                continue
+            await self._submit_queue.put(job)
+
+    async def _submit_worker(self) -> None:
+        while True:
+            job = await self._submit_queue.get()
+            job.submission_id = await self._start_submission(job)
+            if job.submission_id is None:
+                self._finish(job.run.problem_id)
+                continue
+            job.run.mark_submitted(job.submission_id, self._client.account_key)
+            await self._poll_queue.put(job)
+
+    async def _poll_worker(self) -> None:
+        while True:
+            job = await self._poll_queue.get()
+            assert job.solution is not None and job.submission_id is not None
+            try:
+                result = await self._client.check_submission(job.submission_id, job.solution)
+            except LeetCodeAuthError:
+                raise
+            except LeetCodeClientError as e:
+                if job.resubmitted:
+                    logger.error("Polling failed for #%d: %s", job.run.problem_id, e)
+                    self._finish(job.run.problem_id)
+                    continue
+                logger.warning(
+                    "Could not poll submission %d for #%d, resubmitting: %s",
+                    job.submission_id,
+                    job.run.problem_id,
+                    e,
+                )
+                # The pending solution stays, so the generate stage hands it straight back.
+                job.run.forget_submission()
+                job.submission_id, job.resubmitted = None, True
+                await self._generate_queue.put(job)
+                continue
+            job.resubmitted = False
+            if job.run.record(result):
+                self._finish(job.run.problem_id)
+                continue
+            await self._generate_queue.put(job)
+
+    async def _start_submission(self, job: _Job) -> int | None:
+        solution = job.solution
+        assert solution is not None
+        return await retry_submit(
+            self._client, lambda: self._client.start_submission(solution), job.run.problem_id
+        )
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import ast
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import replace
+
+from auto_leetcode.ai.protocol import SolutionGenerator
+from auto_leetcode.checks.dedup import DuplicateCheck
+from auto_leetcode.checks.protocol import CheckOutcome, SolutionCheck
+from auto_leetcode.config import Config
+from auto_leetcode.errors import AIGenerationError
+from auto_leetcode.models.checkpoint import Checkpoint
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import Solution, code_hash
+from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
+from auto_leetcode.storage.checkpoint_store import CheckpointStore
+from auto_leetcode.storage.file_saver import FileSaver
+from auto_leetcode.storage.json_repository import JsonRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ProblemRun:
+    """Retry state for one problem, shared by the sequential runner and the pipeline.
+
+    With a checkpoint store, every transition (solution generated, submission
+    sent, verdict received) is persisted, so a restarted run picks up the retry
+    chain, the unsent solution or the outstanding submission where it stopped.
+    """
+
+    def __init__(
+        self,
+        problem: Problem,
+        generator: SolutionGenerator,
+        repository: JsonRepository,
+        saver: FileSaver,
+        config: Config,
+        checkpoints: CheckpointStore | None = None,
+        checks: Sequence[SolutionCheck] = (),
+    ) -> None:
+        self.problem = problem
+        self._generator = generator
+        self._checks = checks
+        self._repository = repository
+        self._saver = saver
+        self._checkpoints = checkpoints
+        self._max_retries = config.max_retries
+        self._candidates = config.candidates
+        self.attempt = 0
+        self.previous_attempts: list[SubmissionResult] = []
+        self._pending_solution: Solution | None = None
+        self._pending_submission_id: int | None = None
+        self._pending_account: str | None = None
+        self._fallbacks: list[Solution] = []
+        self._dedup = DuplicateCheck(repository)
+        self._restore()
+
+    @property
+    def problem_id(self) -> int:
+        return self.problem.id
+
+    @property
+    def pending_submission(self) -> tuple[int, Solution] | None:
+        """A submission sent before a restart whose verdict was never read."""
+        if self._pending_submission_id is None or self._pending_solution is None:
+            return None
+        return self._pending_submission_id, self._pending_solution
+
+    async def next_solution(self) -> Solution | None:
+        if self._pending_solution is not None:
+            logger.info(
+                "Problem #%d resuming attempt %d from checkpoint", self.problem_id, self.attempt
+            )
+            return self._pending_solution
+
+        while self.attempt < self._max_retries:
+            if self._fallbacks:
+                fallback = self._fallbacks.pop(0)
+                # Verdicts received since it was held back may already cover this code.
+                if (await self._dedup.check(self.problem, fallback)).failure is not None:
+                    logger.info(
+                        "Problem #%d drops a held-back candidate LeetCode already rejected",
+                        self.problem_id,
+                    )
+                    continue
+                self.attempt += 1
+                solution = replace(fallback, attempt=self.attempt)
+                logger.info(
+                    "Problem #%d attempt %d uses a held-back candidate (%d left)",
+                    self.problem_id,
+                    self.attempt,
+                    len(self._fallbacks),
+                )
+                return self._accept(solution)
+
+            try:
+                candidates = await self._generate()
+            except AIGenerationError as e:
+                logger.error(
+                    "AI generation failed for #%d attempt %d: %s",
+                    self.problem_id,
+                    self.attempt + 1,
+                    e,
+                )
+                return None
+
+            self.attempt += 1
+            outcomes = await asyncio.gather(
+                *(self._run_checks(candidate) for candidate in rank_candidates(candidates))
+            )
+            # Repairs can turn distinct candidates into the same code, so dedupe again.
+            distinct: dict[str, Solution] = {}
+            for outcome in outcomes:
+                if outcome.failure is None:
+                    distinct.setdefault(code_hash(outcome.solution.code), outcome.solution)
+            passed = list(distinct.values())
+            if not passed:
+                failure = outcomes[0].failure
+                assert failure is not None
+                self._saver.save(failure.solution)
+                self._reject(failure)
+                continue
+            self._fallbacks = passed[1:]
+            return self._accept(passed[0])
+        return None
+
+    async def _generate(self) -> list[Solution]:
+        if self._candidates <= 1:
+            return [await self._generator.generate(self.problem, self.previous_attempts)]
+        candidates = await self._generator.generate_many(
+            self.problem, self.previous_attempts, self._candidates
+        )
+        logger.info(
+            "Problem #%d attempt %d: sampled %d candidates",
+            self.problem_id,
+            self.attempt + 1,
+            len(candidates),
+        )
+        return candidates
+
+    def _accept(self, solution: Solution) -> Solution:
+        self._saver.save(solution)
+        self._pending_solution = solution
+        self.checkpoint()
+        return solution
+
+    async def _run_checks(self, solution: Solution) -> CheckOutcome:
+        outcome = CheckOutcome(solution)
+        for check in self._checks:
+            outcome = await check.check(self.problem, outcome.solution)
+            if outcome.failure is not None:
+                break
+        return outcome
+
+    def _reject(self, failure: SubmissionResult) -> None:
+        """Feed a locally caught failure back without spending a submission on it."""
+        self.previous_attempts = [*self.previous_attempts, failure]
+        logger.warning(
+            "Problem #%d attempt %d failed local checks: %s",
+            self.problem_id,
+            self.attempt,
+            failure.status.value,
+        )
+        if self.attempt >= self._max_retries:
+            logger.error(
+                "Problem #%d failed local checks on all %d attempts, skipping",
+                self.problem_id,
+                self._max_retries,
+            )
+            self._clear()
+            return
+        self.checkpoint()
+
+    def mark_submitted(self, submission_id: int, account: str | None = None) -> None:
+        self._pending_submission_id = submission_id
+        self._pending_account = account
+        self.checkpoint()
+
+    def forget_submission(self) -> None:
+        """Drop a submission ID whose verdict cannot be read; its code is sent again."""
+        self._pending_submission_id = None
+        self._pending_account = None
+        self.checkpoint()
+
+    def adopt(self, account: str) -> None:
+        """Forget a pending submission another account made; only its session can poll it."""
+        if self._pending_submission_id is None or self._pending_account in (None, account):
+            return
+        logger.warning(
+            "Problem #%d: submission %d belongs to another account, resubmitting",
+            self.problem_id,
+            self._pending_submission_id,
+        )
+        self.forget_submission()
+
+    def suspend(self) -> None:
+        """Persist in-flight state when the run is interrupted."""
+        if self._checkpoints is None:
+            return
+        self.checkpoint()
+        logger.info("Problem #%d checkpointed at attempt %d", self.problem_id, self.attempt)
+
+    def record(self, result: SubmissionResult) -> bool:
+        """Store a verdict and return True when the problem needs no further attempts."""
+        self._repository.save(result)
+        self._pending_solution = None
+        self._pending_submission_id = None
+        self._pending_account = None
+
+        if result.status == SubmissionStatus.ACCEPTED:
+            logger.info(
+                "Problem #%d ACCEPTED on attempt %d (runtime: %s ms)",
+                self.problem_id,
+                self.attempt,
+                result.runtime_ms,
+            )
+            self._clear()
+            return True
+
+        self.previous_attempts = [*self.previous_attempts, result]
+        logger.warning(
+            "Problem #%d attempt %d: %s",
+            self.problem_id,
+            self.attempt,
+            result.status.value,
+        )
+        if self.attempt >= self._max_retries:
+            logger.error(
+                "Problem #%d failed after %d attempts, skipping",
+                self.problem_id,
+                self._max_retries,
+            )
+            self._clear()
+            return True
+        self.checkpoint()
+        return False
+
+    def checkpoint(self) -> None:
+        if self._checkpoints is None:
+            return
+        self._checkpoints.save(
+            Checkpoint(
+                problem_id=self.problem_id,
+                attempt=self.attempt,
+                previous_attempts=tuple(self.previous_attempts),
+                pending_solution=self._pending_solution,
+                pending_submission_id=self._pending_submission_id,
+                pending_account=self._pending_account,
+                fallbacks=tuple(self._fallbacks),
+            )
+        )
+
+    def _restore(self) -> None:
+        if self._checkpoints is None:
+            return
+        saved = self._checkpoints.load(self.problem_id)
+        if saved is None:
+            return
+        self.attempt = saved.attempt
+        self.previous_attempts = list(saved.previous_attempts)
+        self._pending_solution = saved.pending_solution
+        self._pending_submission_id = saved.pending_submission_id
+        self._pending_account = saved.pending_account
+        self._fallbacks = list(saved.fallbacks)
+        logger.info(
+            "Problem #%d restored from checkpoint at attempt %d (%d failed attempts kept)",
+            self.problem_id,
+            self.attempt,
+            len(self.previous_attempts),
+        )
+
+    def _clear(self) -> None:
+        if self._checkpoints is not None:
+            self._checkpoints.delete(self.problem_id)
+
+
+def rank_candidates(candidates: Sequence[Solution]) -> list[Solution]:
+    """Distinct candidates, best first.
+
+    Candidates that parse come before ones that do not, then candidates the
+    model produced more often (ignoring formatting and comments) come first;
+    ties keep the sampling order.
+    """
+    fingerprints = [code_hash(candidate.code) for candidate in candidates]
+    votes = Counter(fingerprints)
+    distinct: dict[str, Solution] = {}
+    for fingerprint, candidate in zip(fingerprints, candidates, strict=True):
+        distinct.setdefault(fingerprint, candidate)
+    return sorted(
+        distinct.values(),
+        key=lambda c: (not _parses(c.code), -votes[code_hash(c.code)]),
+    )
+
+
+def _parses(code: str) -> bool:
+    try:
+        ast.parse(code)
+    except SyntaxError:
+        return False
+    return True
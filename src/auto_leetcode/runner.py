@@ -2,60 +2,348 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from itertools import islice
 
+from auto_leetcode.ai.cascade import CascadeGenerator, CascadePolicy
 from auto_leetcode.ai.claude_generator import ClaudeGenerator
+from auto_leetcode.ai.hedging import HedgedGenerator
 from auto_leetcode.ai.openai_generator import OpenAIGenerator
-from auto_leetcode.ai.protocol import SolutionGenerator
-from auto_leetcode.config import Config
-from auto_leetcode.errors import (
-    AIGenerationError,
-    LeetCodeClientError,
-    LeetCodeRateLimitError,
-)
-from auto_leetcode.leetcode.client import LeetCodeClient
+from auto_leetcode.ai.protocol import BatchGenerator, SolutionGenerator
+from auto_leetcode.ai.rate_limiter import AIRateLimiter
+from auto_leetcode.checks.dedup import DuplicateCheck
+from auto_leetcode.checks.examples import ExampleCheck
+from auto_leetcode.checks.protocol import SolutionCheck
+from auto_leetcode.checks.sandbox import SandboxPool, sandbox_supported
+from auto_leetcode.checks.static import StaticCheck
+from auto_leetcode.checks.stress import StressCheck
+from auto_leetcode.config import Config, LeetCodeAccount
+from auto_leetcode.errors import LeetCodeAuthError, LeetCodeClientError, LeetCodeRateLimitError
+from auto_leetcode.leetcode.client import PROBLEM_BATCH_SIZE, LeetCodeClient
+from auto_leetcode.leetcode.http import HttpSettings
+from auto_leetcode.leetcode.rate_limiter import AdaptiveRateLimiter
+from auto_leetcode.models.problem import Problem
 from auto_leetcode.models.solution import Solution
-from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
+from auto_leetcode.models.submission import SubmissionResult
+from auto_leetcode.problem_run import ProblemRun
+from auto_leetcode.scheduler import SCORING_POLICIES, schedule
+from auto_leetcode.storage.catalog_cache import CatalogCache
+from auto_leetcode.storage.checkpoint_store import CheckpointStore
 from auto_leetcode.storage.file_saver import FileSaver
 from auto_leetcode.storage.json_repository import JsonRepository
+from auto_leetcode.storage.problem_store import ProblemStore
+from auto_leetcode.storage.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
-RATE_LIMIT_BACKOFF_SECONDS = 60
-CLOUDFLARE_MAX_RETRIES = 3
+RATE_LIMIT_MAX_RETRIES = 3
 
 
-def create_generator(config: Config) -> SolutionGenerator:
-    if config.ai_provider == "claude":
+def create_generator(config: Config, cache: ResponseCache | None = None) -> SolutionGenerator:
+    fallback = None
+    if config.fallback_model:
+        fallback = _provider_generator(
+            config,
+            config.fallback_provider,
+            config.fallback_api_key,
+            config.fallback_base_url,
+            config.fallback_model,
+            cache,
+        )
+        logger.info(
+            "Fallback model: %s/%s%s",
+            config.fallback_provider,
+            config.fallback_model,
+            " (hedging slow calls)" if config.hedge else "",
+        )
+    strong = _provider_generator(
+        config, config.ai_provider, config.ai_api_key, config.ai_base_url, config.ai_model, cache
+    )
+    if not config.fast_model:
+        return _with_fallback(config, strong, fallback)
+    fast = _provider_generator(
+        config,
+        config.fast_provider,
+        config.fast_api_key,
+        config.fast_base_url,
+        config.fast_model,
+        cache,
+    )
+    logger.info(
+        "Model cascade: %s/%s first, escalating to %s/%s",
+        config.fast_provider,
+        config.fast_model,
+        config.ai_provider,
+        config.ai_model,
+    )
+    policy = CascadePolicy(
+        strong_difficulties=frozenset(config.strong_difficulties),
+        escalate_after=config.escalate_after,
+    )
+    return CascadeGenerator(
+        _with_fallback(config, fast, fallback), _with_fallback(config, strong, fallback), policy
+    )
+
+
+def _with_fallback(
+    config: Config, generator: SolutionGenerator, fallback: SolutionGenerator | None
+) -> SolutionGenerator:
+    # Each tier tracks its own latency, so the fast model hedges on its own p95.
+    if fallback is None:
+        return generator
+    return HedgedGenerator(
+        generator, fallback, hedge=config.hedge, percentile=config.hedge_percentile
+    )
+
+
+def _provider_generator(
+    config: Config,
+    provider: str,
+    api_key: str,
+    base_url: str,
+    model: str,
+    cache: ResponseCache | None,
+) -> ClaudeGenerator | OpenAIGenerator:
+    # Providers set quotas per model, so every model gets its own limiter.
+    limiter = AIRateLimiter(
+        requests_per_minute=config.ai_requests_per_minute,
+        tokens_per_minute=config.ai_tokens_per_minute,
+        max_concurrency=config.ai_max_concurrency,
+    )
+    if provider == "claude":
         return ClaudeGenerator(
-            api_key=config.ai_api_key,
-            base_url=config.ai_base_url,
-            model=config.ai_model,
+            api_key=api_key,
+            base_url=base_url,
+            model=model,
+            cache=cache,
+            stream=config.ai_stream,
+            prompt_budget=config.prompt_token_budget,
+            limiter=limiter,
         )
     return OpenAIGenerator(
-        api_key=config.ai_api_key,
-        base_url=config.ai_base_url,
-        model=config.ai_model,
+        api_key=api_key,
+        base_url=base_url,
+        model=model,
+        cache=cache,
+        stream=config.ai_stream,
+        prompt_budget=config.prompt_token_budget,
+        limiter=limiter,
     )
 
 
+def create_response_cache(config: Config) -> ResponseCache | None:
+    if not config.ai_cache:
+        return None
+    return ResponseCache(
+        config.ai_cache_path,
+        max_bytes=config.ai_cache_max_mb * 1024 * 1024,
+        max_age_seconds=config.ai_cache_ttl_seconds,
+        bypass=config.ai_cache_bypass,
+    )
+
+
+def create_rate_limiter(config: Config) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(
+        initial_rate=config.leetcode_initial_rps,
+        max_rate=config.leetcode_max_rps,
+    )
+
+
+def create_http_settings(config: Config) -> HttpSettings:
+    return HttpSettings(
+        http2=config.leetcode_http2,
+        max_connections=config.leetcode_max_connections,
+        max_keepalive_connections=config.leetcode_keepalive_connections,
+        keepalive_expiry=config.leetcode_keepalive_expiry,
+        connect_timeout=config.leetcode_connect_timeout,
+        read_timeout=config.leetcode_read_timeout,
+        pool_timeout=config.leetcode_pool_timeout,
+    )
+
+
+def create_client(config: Config, account: LeetCodeAccount) -> LeetCodeClient:
+    return LeetCodeClient(
+        account.session,
+        account.csrf_token,
+        create_rate_limiter(config),
+        problem_store=ProblemStore(config.problems_dir),
+        refresh_problems=config.refresh_problems,
+        http_settings=create_http_settings(config),
+    )
+
+
+def create_checks(
+    config: Config, sandbox: SandboxPool, repository: JsonRepository
+) -> list[SolutionCheck]:
+    # Repeats are caught whether or not anything runs locally.
+    dedup = DuplicateCheck(repository)
+    if not config.local_checks:
+        return [dedup]
+    # Static repairs come first so repeats are recognised in the form that was submitted.
+    checks: list[SolutionCheck] = [StaticCheck(), dedup]
+    if not sandbox_supported():
+        logger.warning("Running solutions locally needs fork(); only static checks will run")
+        return checks
+    checks.append(ExampleCheck(sandbox))
+    if config.stress_checks:
+        checks.append(StressCheck(sandbox))
+    return checks
+
+
 async def run(config: Config) -> None:
-    async with LeetCodeClient(config.leetcode_session, config.csrf_token) as client:
-        generator = create_generator(config)
-        repository = JsonRepository(config.results_path)
-        saver = FileSaver(config.solutions_dir)
+    cache = create_response_cache(config)
+    try:
+        await _run(config, create_generator(config, cache))
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+async def _run(config: Config, generator: SolutionGenerator) -> None:
+    repository = JsonRepository(config.results_path)
+    saver = FileSaver(config.solutions_dir)
+    checkpoints = CheckpointStore(config.checkpoint_dir)
 
-        logger.info("Building problem slug map...")
-        await client.build_slug_map()
+    # The pool only starts interpreters once a check first needs one.
+    async with SandboxPool(
+        config.sandbox_workers, config.sandbox_timeout_seconds, config.sandbox_memory_mb
+    ) as sandbox:
+        checks = create_checks(config, sandbox, repository)
+        if len(config.accounts) > 1:
+            from auto_leetcode.sharding import run_sharded
 
-        remote_solved: set[int] = set()
-        if config.skip_solved:
-            logger.info("Fetching solved problems from LeetCode...")
-            remote_solved = await client.fetch_solved_ids()
+            await run_sharded(config, generator, repository, saver, checkpoints, checks)
+            return
 
-        for problem_id in range(config.start_id, config.end_id + 1):
+        async with create_client(config, config.accounts[0]) as client:
+            logger.info("Building problem slug map...")
+            await client.build_slug_map(
+                CatalogCache(config.catalog_path, config.catalog_ttl_seconds)
+            )
+            client.learn_judge_latency(repository.verdict_times())
+            problem_ids = plan_problems(client, repository, config)
+            remote_solved = await fetch_remote_solved(client, config)
+            generator = await prefill_batch(
+                client, generator, repository, checkpoints, config, problem_ids, remote_solved
+            )
+            await solve_range(
+                client,
+                generator,
+                repository,
+                saver,
+                config,
+                problem_ids,
+                remote_solved,
+                checkpoints,
+                checks=checks,
+            )
+
+
+def plan_problems(
+    client: LeetCodeClient,
+    repository: JsonRepository,
+    config: Config,
+) -> list[int]:
+    policy = SCORING_POLICIES[config.order]()
+    return schedule(
+        range(config.start_id, config.end_id + 1),
+        client.catalog,
+        repository.history(),
+        policy,
+    )
+
+
+async def prefill_batch(
+    client: LeetCodeClient,
+    generator: SolutionGenerator,
+    repository: JsonRepository,
+    checkpoints: CheckpointStore,
+    config: Config,
+    problem_ids: list[int],
+    remote_solved: set[int],
+) -> SolutionGenerator:
+    if not config.batch_generate:
+        return generator
+    if not isinstance(generator, BatchGenerator):
+        logger.warning(
+            "Batch generation does not support model cascades or fallbacks; generating live"
+        )
+        return generator
+    from auto_leetcode.batch import PrefilledGenerator, prefill_first_attempts
+
+    solutions = await prefill_first_attempts(
+        client, generator, repository, checkpoints, config, problem_ids, remote_solved
+    )
+    return PrefilledGenerator(generator, solutions)
+
+
+async def fetch_remote_solved(client: LeetCodeClient, config: Config) -> set[int]:
+    if not config.skip_solved:
+        return set()
+    logger.info("Fetching solved problems from LeetCode...")
+    return await client.fetch_solved_ids()
+
+
+async def solve_range(
+    client: LeetCodeClient,
+    generator: SolutionGenerator,
+    repository: JsonRepository,
+    saver: FileSaver,
+    config: Config,
+    problem_ids: Iterable[int],
+    remote_solved: set[int],
+    checkpoints: CheckpointStore | None = None,
+    on_finished: Callable[[int], None] | None = None,
+    checks: Sequence[SolutionCheck] = (),
+) -> None:
+    if config.concurrency > 1:
+        from auto_leetcode.pipeline import Pipeline
+
+        pipeline = Pipeline(
+            client, generator, repository, saver, config, remote_solved, checkpoints, checks
+        )
+        await pipeline.run(problem_ids, on_finished)
+        return
+
+    iterator = iter(problem_ids)
+    while chunk := list(islice(iterator, PROBLEM_BATCH_SIZE)):
+        await prefetch_problems(client, repository, chunk, remote_solved)
+        for problem_id in chunk:
             await _solve_problem(
-                client, generator, repository, saver, config, problem_id, remote_solved
+                client,
+                generator,
+                repository,
+                saver,
+                config,
+                problem_id,
+                remote_solved,
+                checkpoints,
+                checks,
             )
+            if on_finished is not None:
+                on_finished(problem_id)
+
+
+async def prefetch_problems(
+    client: LeetCodeClient,
+    repository: JsonRepository,
+    problem_ids: list[int],
+    remote_solved: set[int],
+) -> None:
+    """Batch-fetch the problems about to be attempted; failures fall back to single fetches."""
+    wanted = [
+        problem_id
+        for problem_id in problem_ids
+        if not repository.is_solved(problem_id) and problem_id not in remote_solved
+    ]
+    if not wanted:
+        return
+    try:
+        await client.fetch_problems(wanted)
+    except LeetCodeAuthError:
+        raise
+    except LeetCodeClientError as e:
+        logger.warning("Prefetching %d problems failed, fetching one by one: %s", len(wanted), e)
 
 
 async def _solve_problem(
@@ -66,90 +354,135 @@ async def _solve_problem(
     config: Config,
     problem_id: int,
     remote_solved: set[int],
+    checkpoints: CheckpointStore | None = None,
+    checks: Sequence[SolutionCheck] = (),
 ) -> None:
+    problem = await load_problem(client, repository, problem_id, remote_solved)
+    if problem is None:
+        return
+
+    problem_run = ProblemRun(problem, generator, repository, saver, config, checkpoints, checks)
+    try:
+        problem_run.adopt(client.account_key)
+        if problem_run.pending_submission is not None:
+            result = await _poll_pending(client, problem_run)
+            if result is not None and problem_run.record(result):
+                return
+
+        while (solution := await problem_run.next_solution()) is not None:
+            result = await _submit_with_retry(
+                client,
+                solution,
+                problem_id,
+                lambda submission_id: problem_run.mark_submitted(submission_id, client.account_key),
+            )
+            if result is None:
+                break
+            if problem_run.record(result):
+                break
+    except asyncio.CancelledError:
+        problem_run.suspend()
+        raise
+
+
+async def _poll_pending(client: LeetCodeClient, problem_run: ProblemRun) -> SubmissionResult | None:
+    pending = problem_run.pending_submission
+    assert pending is not None
+    submission_id, solution = pending
+    logger.info(
+        "Problem #%d re-polling submission %d from checkpoint",
+        problem_run.problem_id,
+        submission_id,
+    )
+    try:
+        return await client.check_submission(submission_id, solution)
+    except LeetCodeAuthError:
+        raise
+    except LeetCodeClientError as e:
+        logger.warning(
+            "Could not re-poll submission %d for #%d, resubmitting: %s",
+            submission_id,
+            problem_run.problem_id,
+            e,
+        )
+        problem_run.forget_submission()
+        return None
+
+
+async def load_problem(
+    client: LeetCodeClient,
+    repository: JsonRepository,
+    problem_id: int,
+    remote_solved: set[int],
+) -> Problem | None:
     if repository.is_solved(problem_id) or problem_id in remote_solved:
         logger.info("Problem #%d already solved, skipping", problem_id)
-        return
+        return None
 
     try:
-        problem = await client.fetch_problem(problem_id)
-    except LeetCodeRateLimitError:
-        logger.warning("Rate limited fetching #%d, waiting %ds", problem_id, RATE_LIMIT_BACKOFF_SECONDS)
-        await asyncio.sleep(RATE_LIMIT_BACKOFF_SECONDS)
-        return
+        problem = await _with_rate_limit_retry(
+            client, lambda: client.fetch_problem(problem_id), problem_id, "fetching"
+        )
+    except LeetCodeAuthError:
+        raise
     except LeetCodeClientError as e:
         logger.error("Failed to fetch #%d: %s", problem_id, e)
-        return
+        return None
 
     if problem is None or problem.paid_only:
         logger.info("Problem #%d not available or paid-only, skipping", problem_id)
-        return
+        return None
 
     if not problem.code_snippet:
         logger.warning("Problem #%d has no Python3 snippet, skipping", problem_id)
-        return
+        return None
 
-    previous_attempts: list[SubmissionResult] = []
+    return problem
 
-    for attempt in range(1, config.max_retries + 1):
-        try:
-            solution = await generator.generate(problem, previous_attempts)
-        except AIGenerationError as e:
-            logger.error("AI generation failed for #%d attempt %d: %s", problem_id, attempt, e)
-            break
-
-        saver.save(solution)
-
-        result = await _submit_with_retry(client, solution, problem_id)
-        if result is None:
-            break
-
-        repository.save(result)
 
-        if result.status == SubmissionStatus.ACCEPTED:
-            logger.info(
-                "Problem #%d ACCEPTED on attempt %d (runtime: %s ms)",
-                problem_id,
-                attempt,
-                result.runtime_ms,
-            )
-            break
+async def _submit_with_retry(
+    client: LeetCodeClient,
+    solution: Solution,
+    problem_id: int,
+    on_submitted: Callable[[int], None] | None = None,
+) -> SubmissionResult | None:
+    return await retry_submit(client, lambda: client.submit(solution, on_submitted), problem_id)
 
-        previous_attempts = [*previous_attempts, result]
-        logger.warning(
-            "Problem #%d attempt %d: %s",
-            problem_id,
-            attempt,
-            result.status.value,
-        )
-        await asyncio.sleep(config.retry_delay_seconds)
-    else:
-        logger.error(
-            "Problem #%d failed after %d attempts, skipping",
-            problem_id,
-            config.max_retries,
-        )
 
-    await asyncio.sleep(config.submit_delay_seconds)
+async def retry_submit[T](
+    client: LeetCodeClient,
+    call: Callable[[], Awaitable[T]],
+    problem_id: int,
+) -> T | None:
+    try:
+        return await _with_rate_limit_retry(client, call, problem_id, "submitting")
+    except LeetCodeAuthError:
+        raise
+    except LeetCodeClientError as e:
+        logger.error("Submit failed for #%d: %s", problem_id, e)
+        return None
 
 
-async def _submit_with_retry(
+async def _with_rate_limit_retry[T](
     client: LeetCodeClient,
-    solution: Solution,
+    call: Callable[[], Awaitable[T]],
     problem_id: int,
-) -> SubmissionResult | None:
-    for submit_try in range(1, CLOUDFLARE_MAX_RETRIES + 1):
+    action: str,
+) -> T:
+    # The client's limiter has already paused itself, so retrying right away
+    # simply queues behind the backoff instead of sleeping a fixed amount here.
+    for try_number in range(1, RATE_LIMIT_MAX_RETRIES + 1):
         try:
-            return await client.submit(solution)
+            return await call()
         except LeetCodeRateLimitError:
+            if try_number == RATE_LIMIT_MAX_RETRIES:
+                raise
             logger.warning(
-                "Rate limited/blocked submitting #%d (attempt %d/%d), waiting %ds",
-                problem_id, submit_try, CLOUDFLARE_MAX_RETRIES,
-                RATE_LIMIT_BACKOFF_SECONDS,
+                "Rate limited/blocked %s #%d (attempt %d/%d), limiter now at %.2f req/s",
+                action,
+                problem_id,
+                try_number,
+                RATE_LIMIT_MAX_RETRIES,
+                client.rate_limiter.rate,
             )
-            await asyncio.sleep(RATE_LIMIT_BACKOFF_SECONDS)
-        except LeetCodeClientError as e:
-            logger.error("Submit failed for #%d: %s", problem_id, e)
-            return None
-    logger.error("Submit gave up for #%d after %d retries", problem_id, CLOUDFLARE_MAX_RETRIES)
-    return None
+    raise AssertionError("unreachable")
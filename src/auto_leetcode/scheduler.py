@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from typing import Protocol
+
+from auto_leetcode.models.problem import ProblemSummary
+from auto_leetcode.models.submission import SubmissionHistory, SubmissionStatus
+
+logger = logging.getLogger(__name__)
+
+# Rough first-attempt acceptance odds and tokens spent per attempt, by difficulty.
+BASE_ACCEPT_RATE: dict[str, float] = {"Easy": 0.9, "Medium": 0.7, "Hard": 0.45}
+EXPECTED_TOKENS: dict[str, int] = {"Easy": 1500, "Medium": 2500, "Hard": 4000}
+
+# How much a previous verdict says about the odds of the next attempt.
+LAST_STATUS_FACTOR: dict[SubmissionStatus, float] = {
+    SubmissionStatus.WRONG_ANSWER: 0.7,
+    SubmissionStatus.RUNTIME_ERROR: 0.8,
+    SubmissionStatus.COMPILE_ERROR: 0.9,
+    SubmissionStatus.TIME_LIMIT: 0.5,
+    SubmissionStatus.MEMORY_LIMIT: 0.5,
+    SubmissionStatus.UNKNOWN: 0.8,
+}
+
+
+class ScoringPolicy(Protocol):
+    def score(self, summary: ProblemSummary, history: SubmissionHistory | None) -> float: ...
+
+
+class NumericOrderPolicy:
+    """The original behaviour: lowest problem ID first."""
+
+    def score(self, summary: ProblemSummary, history: SubmissionHistory | None) -> float:
+        return -float(summary.id)
+
+
+class ExpectedYieldPolicy:
+    """Expected accepted problems per generated token."""
+
+    def score(self, summary: ProblemSummary, history: SubmissionHistory | None) -> float:
+        if summary.paid_only or not summary.has_python:
+            return 0.0
+
+        accept = BASE_ACCEPT_RATE.get(summary.difficulty, 0.5)
+        # Community acceptance rate (0-100) nudges the estimate around its baseline.
+        accept *= 0.5 + min(max(summary.ac_rate, 0.0), 100.0) / 100.0
+        tokens = float(EXPECTED_TOKENS.get(summary.difficulty, 3000))
+
+        if history is not None:
+            accept *= LAST_STATUS_FACTOR.get(history.last_status, 1.0) ** history.attempts
+            # Retry prompts carry previous code and errors, so they cost more.
+            tokens *= 1.0 + 0.5 * min(history.attempts, 4)
+
+        return min(accept, 1.0) / tokens
+
+
+SCORING_POLICIES: dict[str, type[ScoringPolicy]] = {
+    "id": NumericOrderPolicy,
+    "yield": ExpectedYieldPolicy,
+}
+
+
+def schedule(
+    problem_ids: Iterable[int],
+    catalog: dict[int, ProblemSummary],
+    history: dict[int, SubmissionHistory],
+    policy: ScoringPolicy,
+) -> list[int]:
+    """Order pending problems best-first. IDs missing from the catalog go last.
+
+    Problems the catalog marks paid-only or without a Python version are left
+    out, since fetching their details would only end in a skip.
+    """
+    known: list[tuple[float, int]] = []
+    unknown: list[int] = []
+    unavailable = 0
+    for problem_id in problem_ids:
+        summary = catalog.get(problem_id)
+        if summary is None:
+            unknown.append(problem_id)
+            continue
+        if summary.paid_only or not summary.has_python:
+            unavailable += 1
+            continue
+        known.append((policy.score(summary, history.get(problem_id)), problem_id))
+
+    known.sort(key=lambda item: (-item[0], item[1]))
+    ordered = [problem_id for _, problem_id in known] + sorted(unknown)
+    logger.info(
+        "Scheduled %d problems (%d not in catalog, %d paid-only or without Python)",
+        len(ordered),
+        len(unknown),
+        unavailable,
+    )
+    return ordered
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import AsyncExitStack
+
+from auto_leetcode.ai.protocol import SolutionGenerator
+from auto_leetcode.checks.protocol import SolutionCheck
+from auto_leetcode.config import Config
+from auto_leetcode.errors import LeetCodeAuthError
+from auto_leetcode.leetcode.client import LeetCodeClient
+from auto_leetcode.runner import (
+    create_client,
+    fetch_remote_solved,
+    plan_problems,
+    prefill_batch,
+    solve_range,
+)
+from auto_leetcode.storage.catalog_cache import CatalogCache
+from auto_leetcode.storage.checkpoint_store import CheckpointStore
+from auto_leetcode.storage.file_saver import FileSaver
+from auto_leetcode.storage.json_repository import JsonRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ShardDispatcher:
+    """Hands out problem IDs to accounts, with work stealing and failover.
+
+    IDs are dealt round-robin, so each account's shard keeps the scheduler's
+    best-first order. An account that drains its own shard steals from the tail
+    of the largest remaining one. IDs
+    are leased until reported finished, so when an account is retired both its
+    pending and its leased IDs are redistributed to the healthy accounts.
+
+    ``pinned`` maps IDs with a submission still awaiting its verdict to the
+    account that made it: only that session can poll it, so they go first in
+    its shard and are never stolen. Retiring the account releases them.
+    """
+
+    def __init__(
+        self,
+        problem_ids: Iterable[int],
+        account_count: int,
+        pinned: dict[int, int] | None = None,
+    ) -> None:
+        self._pinned = dict(pinned or {})
+        ids = [problem_id for problem_id in problem_ids if problem_id not in self._pinned]
+        self._pending: list[deque[int]] = [
+            deque(ids[i::account_count]) for i in range(account_count)
+        ]
+        for problem_id, account in sorted(self._pinned.items(), reverse=True):
+            self._pending[account].appendleft(problem_id)
+        self._leased: list[set[int]] = [set() for _ in range(account_count)]
+        self._healthy: set[int] = set(range(account_count))
+
+    @property
+    def healthy(self) -> list[int]:
+        return sorted(self._healthy)
+
+    @property
+    def remaining(self) -> int:
+        return sum(len(q) for q in self._pending) + sum(len(s) for s in self._leased)
+
+    def lease(self, account: int) -> int | None:
+        if account not in self._healthy:
+            return None
+        own = self._pending[account]
+        if own:
+            problem_id = own.popleft()
+        else:
+            stolen = self._steal()
+            if stolen is None:
+                return None
+            problem_id = stolen
+        self._leased[account].add(problem_id)
+        return problem_id
+
+    def _steal(self) -> int | None:
+        for victim in sorted(self._pending, key=len, reverse=True):
+            for problem_id in reversed(victim):
+                if problem_id not in self._pinned:
+                    victim.remove(problem_id)
+                    return problem_id
+        return None
+
+    def complete(self, account: int, problem_id: int) -> None:
+        self._leased[account].discard(problem_id)
+
+    def retire(self, account: int) -> int:
+        """Mark an account unusable and hand its work to the others. Returns IDs moved."""
+        self._healthy.discard(account)
+        orphaned = sorted(self._leased[account]) + list(self._pending[account])
+        for problem_id in orphaned:
+            self._pinned.pop(problem_id, None)
+        self._leased[account] = set()
+        self._pending[account] = deque()
+        if self._healthy:
+            targets = sorted(self._healthy)
+            for i, problem_id in enumerate(orphaned):
+                self._pending[targets[i % len(targets)]].append(problem_id)
+        else:
+            # Nobody left to take it; keep the work visible in ``remaining``.
+            self._pending[account] = deque(orphaned)
+        return len(orphaned)
+
+    def iter_for(self, account: int) -> Iterator[int]:
+        while (problem_id := self.lease(account)) is not None:
+            yield problem_id
+
+
+async def run_sharded(
+    config: Config,
+    generator: SolutionGenerator,
+    repository: JsonRepository,
+    saver: FileSaver,
+    checkpoints: CheckpointStore,
+    checks: Sequence[SolutionCheck] = (),
+) -> None:
+    accounts = config.accounts
+
+    async with AsyncExitStack() as stack:
+        clients = [
+            await stack.enter_async_context(create_client(config, account)) for account in accounts
+        ]
+        logger.info("Building problem slug map...")
+        await clients[0].build_slug_map(
+            CatalogCache(config.catalog_path, config.catalog_ttl_seconds)
+        )
+        verdict_times = repository.verdict_times()
+        for client in clients:
+            if client is not clients[0]:
+                client.use_catalog(clients[0].catalog)
+            client.learn_judge_latency(verdict_times)
+        problem_ids = plan_problems(clients[0], repository, config)
+        # A problem solved on any account counts as solved for all of them.
+        solved, expired = await _solved_on_any_account(clients, config)
+        generator = await prefill_batch(
+            clients[0], generator, repository, checkpoints, config, problem_ids, solved
+        )
+        dispatcher = ShardDispatcher(
+            problem_ids, len(accounts), _pending_submissions(clients, checkpoints, problem_ids)
+        )
+        for index in expired:
+            dispatcher.retire(index)
+
+        # Work handed over from a retired account can land on accounts that had
+        # already finished, so keep going in rounds until nothing is left.
+        while dispatcher.remaining and dispatcher.healthy:
+            await asyncio.gather(
+                *(
+                    _run_shard(
+                        index,
+                        clients[index],
+                        dispatcher,
+                        solved,
+                        generator,
+                        repository,
+                        saver,
+                        checkpoints,
+                        config,
+                        checks,
+                    )
+                    for index in dispatcher.healthy
+                )
+            )
+
+    if dispatcher.remaining:
+        raise LeetCodeAuthError(
+            f"All LeetCode sessions expired with {dispatcher.remaining} problems left"
+        )
+
+
+async def _solved_on_any_account(
+    clients: Sequence[LeetCodeClient], config: Config
+) -> tuple[set[int], list[int]]:
+    """The union of every account's solved problems, and the accounts already expired."""
+    results = await asyncio.gather(
+        *(fetch_remote_solved(client, config) for client in clients), return_exceptions=True
+    )
+    solved: set[int] = set()
+    expired: list[int] = []
+    for index, result in enumerate(results):
+        if isinstance(result, LeetCodeAuthError):
+            logger.error("Account %d: %s; leaving it out", index + 1, result)
+            expired.append(index)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            solved |= result
+    return solved, expired
+
+
+def _pending_submissions(
+    clients: Sequence[LeetCodeClient], checkpoints: CheckpointStore, problem_ids: Iterable[int]
+) -> dict[int, int]:
+    """Problem ID -> index of the account whose checkpointed submission is still unread."""
+    accounts = {client.account_key: index for index, client in enumerate(clients)}
+    pinned: dict[int, int] = {}
+    for problem_id in problem_ids:
+        checkpoint = checkpoints.load(problem_id)
+        if checkpoint is None or checkpoint.pending_submission_id is None:
+            continue
+        index = accounts.get(checkpoint.pending_account or "")
+        if index is not None:
+            pinned[problem_id] = index
+    return pinned
+
+
+async def _run_shard(
+    index: int,
+    client: LeetCodeClient,
+    dispatcher: ShardDispatcher,
+    solved: set[int],
+    generator: SolutionGenerator,
+    repository: JsonRepository,
+    saver: FileSaver,
+    checkpoints: CheckpointStore,
+    config: Config,
+    checks: Sequence[SolutionCheck],
+) -> None:
+    try:
+        await solve_range(
+            client,
+            generator,
+            repository,
+            saver,
+            config,
+            dispatcher.iter_for(index),
+            solved,
+            checkpoints,
+            on_finished=lambda problem_id: dispatcher.complete(index, problem_id),
+            checks=checks,
+        )
+    except LeetCodeAuthError as e:
+        moved = dispatcher.retire(index)
+        logger.error(
+            "Account %d: %s; moving %d problems to %d healthy account(s)",
+            index + 1,
+            e,
+            moved,
+            len(dispatcher.healthy),
+        )
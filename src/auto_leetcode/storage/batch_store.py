@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import asdict
+from pathlib import Path
+
+from auto_leetcode.errors import StorageError
+from auto_leetcode.models.batch import BatchJob
+
+logger = logging.getLogger(__name__)
+
+
+class BatchStore:
+    """The outstanding generation batch, so an interrupted run resumes polling it."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    def load(self) -> BatchJob | None:
+        if not self._path.exists():
+            return None
+        try:
+            record = json.loads(self._path.read_text())
+            return BatchJob(
+                batch_id=record["batch_id"],
+                provider=record["provider"],
+                model=record["model"],
+                problem_ids=tuple(int(i) for i in record["problem_ids"]),
+                submitted_at=float(record["submitted_at"]),
+            )
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            logger.warning("Ignoring unreadable batch state %s: %s", self._path, e)
+            return None
+        except OSError as e:
+            raise StorageError(f"Failed to read batch state {self._path}: {e}") from e
+
+    def save(self, job: BatchJob) -> None:
+        record = {**asdict(job), "problem_ids": list(job.problem_ids)}
+        tmp_path = self._path.with_suffix(".tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(record))
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            raise StorageError(f"Failed to write batch state {self._path}: {e}") from e
+
+    def delete(self) -> None:
+        try:
+            self._path.unlink(missing_ok=True)
+        except OSError as e:
+            raise StorageError(f"Failed to delete batch state {self._path}: {e}") from e
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from auto_leetcode.errors import StorageError
+from auto_leetcode.models.problem import ProblemSummary
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedCatalog:
+    entries: dict[int, ProblemSummary]
+    total: int
+    fetched_at: float
+
+
+class CatalogCache:
+    """The problem list on disk, so warm runs skip paging the GraphQL catalog."""
+
+    def __init__(self, path: Path, ttl_seconds: float) -> None:
+        self._path = path
+        self._ttl = ttl_seconds
+
+    def load(self) -> CachedCatalog | None:
+        if not self._path.exists():
+            return None
+        try:
+            record = json.loads(self._path.read_text())
+            entries = {int(e["id"]): ProblemSummary(**e) for e in record["entries"]}
+            return CachedCatalog(
+                entries=entries,
+                total=int(record["total"]),
+                fetched_at=float(record["fetched_at"]),
+            )
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            logger.warning("Ignoring unreadable catalog cache %s: %s", self._path, e)
+            return None
+        except OSError as e:
+            raise StorageError(f"Failed to read catalog cache {self._path}: {e}") from e
+
+    def save(self, entries: dict[int, ProblemSummary], total: int) -> None:
+        record = {
+            "total": total,
+            "fetched_at": time.time(),
+            "entries": [asdict(entry) for _, entry in sorted(entries.items())],
+        }
+        tmp_path = self._path.with_suffix(".tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(record))
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            raise StorageError(f"Failed to write catalog cache {self._path}: {e}") from e
+
+    def is_fresh(self, cached: CachedCatalog) -> bool:
+        return time.time() - cached.fetched_at < self._ttl
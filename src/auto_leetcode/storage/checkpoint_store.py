@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from auto_leetcode.errors import StorageError
+from auto_leetcode.models.checkpoint import Checkpoint
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """One JSON file per in-progress problem, replaced atomically on every update."""
+
+    def __init__(self, directory: Path) -> None:
+        self._dir = directory
+        self._dir.mkdir(parents=True, exist_ok=True)
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        path = self._path(checkpoint.problem_id)
+        tmp_path = path.with_suffix(".tmp")
+        record = {
+            "problem_id": checkpoint.problem_id,
+            "attempt": checkpoint.attempt,
+            "previous_attempts": [_result_to_record(r) for r in checkpoint.previous_attempts],
+            "pending_solution": (
+                _solution_to_record(checkpoint.pending_solution)
+                if checkpoint.pending_solution is not None
+                else None
+            ),
+            "pending_submission_id": checkpoint.pending_submission_id,
+            "pending_account": checkpoint.pending_account,
+            "fallbacks": [_solution_to_record(s) for s in checkpoint.fallbacks],
+        }
+        try:
+            tmp_path.write_text(json.dumps(record))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            raise StorageError(f"Failed to write checkpoint {path}: {e}") from e
+
+    def load(self, problem_id: int) -> Checkpoint | None:
+        path = self._path(problem_id)
+        if not path.exists():
+            return None
+        try:
+            record = json.loads(path.read_text())
+        except (json.JSONDecodeError, OSError) as e:
+            raise StorageError(f"Failed to read checkpoint {path}: {e}") from e
+
+        pending = record.get("pending_solution")
+        return Checkpoint(
+            problem_id=record["problem_id"],
+            attempt=record["attempt"],
+            previous_attempts=tuple(
+                _result_from_record(r) for r in record.get("previous_attempts", [])
+            ),
+            pending_solution=_solution_from_record(pending) if pending else None,
+            pending_submission_id=record.get("pending_submission_id"),
+            pending_account=record.get("pending_account"),
+            fallbacks=tuple(_solution_from_record(s) for s in record.get("fallbacks", [])),
+        )
+
+    def delete(self, problem_id: int) -> None:
+        try:
+            self._path(problem_id).unlink(missing_ok=True)
+        except OSError as e:
+            raise StorageError(f"Failed to delete checkpoint for #{problem_id}: {e}") from e
+
+    def _path(self, problem_id: int) -> Path:
+        return self._dir / f"{problem_id:04d}.json"
+
+
+def _solution_to_record(solution: Solution) -> dict[str, Any]:
+    return {
+        "problem_id": solution.problem_id,
+        "code": solution.code,
+        "language": solution.language,
+        "model": solution.model_used,
+        "attempt": solution.attempt,
+        "reasoning": solution.reasoning,
+    }
+
+
+def _solution_from_record(record: dict[str, Any]) -> Solution:
+    return Solution(
+        problem_id=record["problem_id"],
+        code=record["code"],
+        language=record.get("language", "python3"),
+        model_used=record.get("model", ""),
+        attempt=record.get("attempt", 0),
+        reasoning=record.get("reasoning", ""),
+    )
+
+
+def _result_to_record(result: SubmissionResult) -> dict[str, Any]:
+    return {
+        "problem_id": result.problem_id,
+        "status": result.status.value,
+        "runtime_ms": result.runtime_ms,
+        "memory_mb": result.memory_mb,
+        "error_message": result.error_message,
+        "solution": _solution_to_record(result.solution),
+    }
+
+
+def _result_from_record(record: dict[str, Any]) -> SubmissionResult:
+    return SubmissionResult(
+        problem_id=record["problem_id"],
+        status=SubmissionStatus(record["status"]),
+        runtime_ms=record.get("runtime_ms"),
+        memory_mb=record.get("memory_mb"),
+        error_message=record.get("error_message"),
+        solution=_solution_from_record(record["solution"]),
+    )
@@ -8,8 +8,13 @@ from pathlib import Path
 from typing import Any
 
 from auto_leetcode.errors import StorageError
-from auto_leetcode.models.solution import Solution
-from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
+from auto_leetcode.models.solution import Solution, code_hash
+from auto_leetcode.models.submission import (
+    ModelStats,
+    SubmissionHistory,
+    SubmissionResult,
+    SubmissionStatus,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +23,10 @@ class JsonRepository:
     def __init__(self, path: Path) -> None:
         self._path = path
         self._solved_ids: set[int] = set()
-        self._load_solved_ids()
+        self._verdicts: dict[tuple[int, str], SubmissionResult] = {}
+        self._load_index()
 
-    def _load_solved_ids(self) -> None:
+    def _load_index(self) -> None:
         if not self._path.exists():
             return
         try:
@@ -32,9 +38,19 @@ class JsonRepository:
                     record = json.loads(stripped)
                     if record.get("status") == "Accepted":
                         self._solved_ids.add(record["problem_id"])
+                    self._index_verdict(record)
         except (json.JSONDecodeError, OSError) as e:
             raise StorageError(f"Failed to load results from {self._path}: {e}") from e
 
+    def _index_verdict(self, record: dict[str, Any]) -> None:
+        # Only rejections are remembered; an unknown verdict says nothing about the code.
+        rejected = record["status"] not in (
+            SubmissionStatus.ACCEPTED.value,
+            SubmissionStatus.UNKNOWN.value,
+        )
+        if rejected and "code_hash" in record:
+            self._verdicts[(record["problem_id"], record["code_hash"])] = _result(record)
+
     def save(self, result: SubmissionResult) -> None:
         record = {
             "problem_id": result.problem_id,
@@ -43,10 +59,26 @@ class JsonRepository:
             "memory_mb": result.memory_mb,
             "model": result.solution.model_used,
             "attempt": result.solution.attempt,
+            "code_hash": code_hash(result.solution.code),
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
         if result.error_message:
             record["error_message"] = result.error_message
+        if result.verdict_seconds is not None:
+            record["verdict_seconds"] = round(result.verdict_seconds, 3)
+        stats = result.solution.stats
+        if stats is not None and not stats.cached:
+            # Batch results were generated offline, so only their tokens mean anything.
+            if stats.batched:
+                record["batched"] = True
+            else:
+                record["generation_seconds"] = round(stats.seconds, 3)
+                if stats.time_to_code is not None:
+                    record["time_to_code"] = round(stats.time_to_code, 3)
+            record["output_tokens"] = stats.output_tokens
+            if stats.input_tokens is not None:
+                record["input_tokens"] = stats.input_tokens
+                record["cache_read_tokens"] = stats.cache_read_tokens or 0
 
         try:
             with open(self._path, "a") as f:
@@ -56,6 +88,7 @@ class JsonRepository:
 
         if result.status == SubmissionStatus.ACCEPTED:
             self._solved_ids = self._solved_ids | {result.problem_id}
+        self._index_verdict(record)
 
     def find_by_problem_id(self, problem_id: int) -> list[SubmissionResult]:
         return self._read_all(lambda r: r["problem_id"] == problem_id)
@@ -66,6 +99,53 @@ class JsonRepository:
     def is_solved(self, problem_id: int) -> bool:
         return problem_id in self._solved_ids
 
+    def known_rejection(self, problem_id: int, code: str) -> SubmissionResult | None:
+        """The latest rejection of code equal to ``code`` up to formatting and comments."""
+        return self._verdicts.get((problem_id, code_hash(code)))
+
+    def history(self) -> dict[int, SubmissionHistory]:
+        counts: dict[int, int] = {}
+        last: dict[int, SubmissionStatus] = {}
+        for result in self._read_all():
+            counts[result.problem_id] = counts.get(result.problem_id, 0) + 1
+            last[result.problem_id] = result.status
+        return {
+            problem_id: SubmissionHistory(attempts=count, last_status=last[problem_id])
+            for problem_id, count in counts.items()
+        }
+
+    def verdict_times(self) -> list[tuple[int, SubmissionStatus, float]]:
+        """(problem_id, status, seconds to verdict) for every result that recorded it."""
+        return [
+            (result.problem_id, result.status, result.verdict_seconds)
+            for result in self._read_all(lambda r: r.get("verdict_seconds") is not None)
+            if result.verdict_seconds is not None
+        ]
+
+    def model_stats(self) -> dict[str, ModelStats]:
+        """Acceptance and generation latency per ``Solution.model_used``."""
+        stats: dict[str, ModelStats] = {}
+        for record in self._records():
+            model = record.get("model", "")
+            current = stats.get(model, ModelStats(submissions=0, accepted=0))
+            seconds = record.get("generation_seconds")
+            stats[model] = ModelStats(
+                submissions=current.submissions + 1,
+                accepted=current.accepted + (record["status"] == SubmissionStatus.ACCEPTED.value),
+                generation_seconds=current.generation_seconds + (seconds or 0.0),
+                timed=current.timed + (seconds is not None),
+            )
+        return stats
+
+    def _records(self) -> list[dict[str, Any]]:
+        if not self._path.exists():
+            return []
+        try:
+            with open(self._path) as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except (json.JSONDecodeError, OSError) as e:
+            raise StorageError(f"Failed to read results: {e}") from e
+
     def _read_all(
         self, predicate: Callable[[dict[str, Any]], bool] | None = None
     ) -> list[SubmissionResult]:
@@ -81,22 +161,25 @@ class JsonRepository:
                     record = json.loads(stripped)
                     if predicate and not predicate(record):
                         continue
-                    results.append(
-                        SubmissionResult(
-                            problem_id=record["problem_id"],
-                            status=SubmissionStatus(record["status"]),
-                            runtime_ms=record.get("runtime_ms"),
-                            memory_mb=record.get("memory_mb"),
-                            error_message=record.get("error_message"),
-                            solution=Solution(
-                                problem_id=record["problem_id"],
-                                code="",
-                                language="python3",
-                                model_used=record.get("model", ""),
-                                attempt=record.get("attempt", 0),
-                            ),
-                        )
-                    )
+                    results.append(_result(record))
         except (json.JSONDecodeError, OSError) as e:
             raise StorageError(f"Failed to read results: {e}") from e
         return results
+
+
+def _result(record: dict[str, Any]) -> SubmissionResult:
+    return SubmissionResult(
+        problem_id=record["problem_id"],
+        status=SubmissionStatus(record["status"]),
+        runtime_ms=record.get("runtime_ms"),
+        memory_mb=record.get("memory_mb"),
+        error_message=record.get("error_message"),
+        verdict_seconds=record.get("verdict_seconds"),
+        solution=Solution(
+            problem_id=record["problem_id"],
+            code="",
+            language="python3",
+            model_used=record.get("model", ""),
+            attempt=record.get("attempt", 0),
+        ),
+    )
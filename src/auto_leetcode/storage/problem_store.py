@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from auto_leetcode.errors import StorageError
+from auto_leetcode.models.problem import Problem
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StoredProblem:
+    slug: str
+    raw: dict[str, Any]
+    problem: Problem
+    content_hash: str
+    fetched_at: float
+    parser_version: int
+
+
+class ProblemStore:
+    """Fetched problem details on disk, one JSON file per slug.
+
+    Each entry keeps the raw GraphQL payload next to the parsed ``Problem`` so a
+    parser change can re-derive problems without going back to LeetCode.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._dir = directory
+        self._dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, slug: str) -> StoredProblem | None:
+        path = self._path(slug)
+        if not path.exists():
+            return None
+        try:
+            record = json.loads(path.read_text())
+            return StoredProblem(
+                slug=record["slug"],
+                raw=record["raw"],
+                problem=Problem(**record["problem"]),
+                content_hash=record["content_hash"],
+                fetched_at=float(record["fetched_at"]),
+                parser_version=int(record.get("parser_version", 0)),
+            )
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            logger.warning("Ignoring unreadable problem cache %s: %s", path, e)
+            return None
+        except OSError as e:
+            raise StorageError(f"Failed to read problem cache {path}: {e}") from e
+
+    def put(
+        self,
+        slug: str,
+        raw: dict[str, Any],
+        problem: Problem,
+        parser_version: int,
+    ) -> bool:
+        """Store a problem and return True if its content differs from what was stored."""
+        content_hash = content_digest(raw)
+        previous = self.get(slug)
+        record = {
+            "slug": slug,
+            "raw": raw,
+            "problem": asdict(problem),
+            "content_hash": content_hash,
+            "fetched_at": time.time(),
+            "parser_version": parser_version,
+        }
+        path = self._path(slug)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(json.dumps(record))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            raise StorageError(f"Failed to write problem cache {path}: {e}") from e
+        return previous is None or previous.content_hash != content_hash
+
+    def _path(self, slug: str) -> Path:
+        return self._dir / f"{slug}.json"
+
+
+def content_digest(raw: dict[str, Any]) -> str:
+    canonical = json.dumps(raw, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
@@ -2,7 +2,11 @@ from __future__ import annotations
 
 from typing import Protocol
 
-from auto_leetcode.models.submission import SubmissionResult
+from auto_leetcode.models.submission import (
+    SubmissionHistory,
+    SubmissionResult,
+    SubmissionStatus,
+)
 
 
 class ResultRepository(Protocol):
@@ -13,3 +17,7 @@ class ResultRepository(Protocol):
     def find_all_accepted(self) -> list[SubmissionResult]: ...
 
     def is_solved(self, problem_id: int) -> bool: ...
+
+    def history(self) -> dict[int, SubmissionHistory]: ...
+
+    def verdict_times(self) -> list[tuple[int, SubmissionStatus, float]]: ...
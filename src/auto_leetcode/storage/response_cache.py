@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from auto_leetcode.errors import StorageError
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+# Deletes the least recently used rows beyond the byte budget.
+EVICT_LRU = """
+DELETE FROM responses WHERE key IN (
+    SELECT key FROM (
+        SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS running
+        FROM responses
+    ) WHERE running > ?
+)
+"""
+
+
+def response_key(
+    provider: str,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    params: dict[str, Any],
+) -> str:
+    """A stable hash of everything that determines a provider's answer."""
+    canonical = json.dumps(
+        [provider, model, system_prompt, user_prompt, params],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return (
+            f"{self.hits} hits, {self.misses} misses ({rate:.0%} hit rate), "
+            f"{self.evictions} evicted"
+        )
+
+
+class ResponseCache:
+    """Raw AI responses in SQLite, evicted by age and least-recent use.
+
+    With ``bypass`` set every lookup misses, but fresh responses are still
+    stored so the next run can reuse them. Read and write failures are logged
+    and treated as misses: the cache never fails a generation.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age_seconds: float = 30 * 24 * 3600,
+        bypass: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = path
+        self._max_bytes = max_bytes
+        self._max_age = max_age_seconds
+        self._bypass = bypass
+        self._clock = clock
+        self.stats = CacheStats()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            raise StorageError(f"Failed to open AI response cache {path}: {e}") from e
+
+    def get(self, key: str) -> str | None:
+        if self._bypass:
+            self.stats.misses += 1
+            return None
+        now = self._clock()
+        try:
+            row = self._db.execute(
+                "SELECT content, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self._max_age:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.stats.evictions += 1
+                row = None
+            if row is not None:
+                self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning("AI response cache lookup failed: %s", e)
+            row = None
+        if row is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return str(row[0])
+
+    def put(self, key: str, content: str) -> None:
+        now = self._clock()
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, content, len(content.encode()), now, now),
+            )
+            self._evict(now)
+        except sqlite3.Error as e:
+            logger.warning("AI response cache write failed: %s", e)
+
+    def close(self) -> None:
+        logger.info("AI response cache: %s", self.stats.summary())
+        self._db.close()
+
+    def _evict(self, now: float) -> None:
+        expired = self._db.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self._max_age,)
+        )
+        over_budget = self._db.execute(EVICT_LRU, (self._max_bytes,))
+        self.stats.evictions += expired.rowcount + over_budget.rowcount
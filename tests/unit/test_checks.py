@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from auto_leetcode.checks import stress
+from auto_leetcode.checks.examples import (
+    ORDER_FREE_PATTERN,
+    ExampleCheck,
+    _matches,
+    extract_examples,
+)
+from auto_leetcode.checks.sandbox import SandboxPool, sandbox_supported
+from auto_leetcode.checks.signature import parse_signature
+from auto_leetcode.checks.static import (
+    ExpectedMethod,
+    StaticCheck,
+    expected_interface,
+    validate,
+)
+from auto_leetcode.checks.stress import Constraints, InputBuilder, StressCheck
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.submission import SubmissionStatus
+
+TWO_SUM_SNIPPET = (
+    "class Solution:\n    def twoSum(self, nums: List[int], target: int) -> List[int]:\n        "
+)
+
+TWO_SUM_DESCRIPTION = """Given an array of integers `nums` and an integer `target`, return indices.
+
+Example 1:
+
+```
+Input: nums = [2,7,11,15], target = 9
+Output: [0,1]
+Explanation: Because nums[0] + nums[1] == 9, we return [0, 1].
+```
+
+Example 2:
+
+```
+Input: nums = [3,2,4], target = 6
+Output: [1,2]
+```
+"""
+
+TWO_SUM = """class Solution:
+    def twoSum(self, nums: List[int], target: int) -> List[int]:
+        seen = {}
+        for i, n in enumerate(nums):
+            if target - n in seen:
+                return [seen[target - n], i]
+            seen[n] = i
+"""
+
+
+TWO_SUM_CONSTRAINTS = """
+Constraints:
+
+- `2 <= nums.length <= 10^4`
+- `-10^9 <= nums[i] <= 10^9`
+- `-10^9 <= target <= 10^9`
+"""
+
+QUADRATIC_TWO_SUM = """class Solution:
+    def twoSum(self, nums: List[int], target: int) -> List[int]:
+        for i in range(len(nums)):
+            for j in range(i + 1, len(nums)):
+                if nums[i] + nums[j] == target:
+                    return [i, j]
+        return []
+"""
+
+
+def _problem(description: str = TWO_SUM_DESCRIPTION, snippet: str = TWO_SUM_SNIPPET) -> Problem:
+    return Problem(
+        id=1,
+        title="Two Sum",
+        slug="two-sum",
+        difficulty="Easy",
+        description=description,
+        code_snippet=snippet,
+        paid_only=False,
+    )
+
+
+def _solution(code: str) -> Solution:
+    return Solution(problem_id=1, code=code, language="python3", model_used="m", attempt=1)
+
+
+class TestParseSignature:
+    def test_reads_method_and_params(self) -> None:
+        signature = parse_signature(TWO_SUM_SNIPPET)
+        assert signature is not None
+        assert signature.method == "twoSum"
+        assert signature.params == ("nums", "target")
+        assert not signature.in_place
+
+    def test_none_return_is_in_place(self) -> None:
+        snippet = (
+            "class Solution:\n"
+            "    def rotate(self, nums: List[int], k: int) -> None:\n"
+            '        """\n        Do not return anything.\n        """\n'
+        )
+        signature = parse_signature(snippet)
+        assert signature is not None and signature.in_place
+
+    def test_skips_linked_structures_and_design_problems(self) -> None:
+        linked = (
+            "class Solution:\n"
+            "    def reverseList(self, head: Optional[ListNode]) -> Optional[ListNode]:\n"
+        )
+        design = "class LRUCache:\n    def __init__(self, capacity: int):\n"
+        assert parse_signature(linked) is None
+        assert parse_signature(design) is None
+
+
+class TestExtractExamples:
+    def test_parses_inputs_in_parameter_order(self) -> None:
+        signature = parse_signature(TWO_SUM_SNIPPET)
+        assert signature is not None
+        examples = extract_examples(_problem(), signature)
+        assert [e.args for e in examples] == [[[2, 7, 11, 15], 9], [[3, 2, 4], 6]]
+        assert [e.expected for e in examples] == [[0, 1], [1, 2]]
+
+    def test_skips_examples_with_unknown_names(self) -> None:
+        description = 'Input: s = "a,b", x = 1\nOutput: true'
+        signature = parse_signature(TWO_SUM_SNIPPET)
+        assert signature is not None
+        assert extract_examples(_problem(description), signature) == []
+
+
+class TestMatches:
+    def test_float_tolerance(self) -> None:
+        assert _matches(2.000001, 2.0, order_free=False)
+
+    def test_bool_is_not_int(self) -> None:
+        assert not _matches(1, True, order_free=False)
+
+    def test_order_free_comparison(self) -> None:
+        assert not _matches([[2, 1], [3]], [[3], [1, 2]], order_free=False)
+        assert _matches([[2, 1], [3]], [[3], [1, 2]], order_free=True)
+
+    @pytest.mark.parametrize(
+        "statement",
+        [
+            "You may return the answer in any order.",
+            "Notice that the order of the output and the order of the triplets does not matter.",
+            "The combinations may be returned in any sequence.",
+            "The order of the elements in the answer is not important.",
+        ],
+    )
+    def test_order_free_wording(self, statement: str) -> None:
+        assert ORDER_FREE_PATTERN.search(statement.lower())
+
+    def test_order_sensitive_wording(self) -> None:
+        assert not ORDER_FREE_PATTERN.search("return the indices in increasing order.")
+
+
+@pytest.mark.skipif(not sandbox_supported(), reason="sandbox needs fork()")
+class TestExampleCheck:
+    @pytest.mark.asyncio
+    async def test_passing_solution(self) -> None:
+        async with SandboxPool(size=1, timeout=2.0) as pool:
+            outcome = await ExampleCheck(pool).check(_problem(), _solution(TWO_SUM))
+        assert outcome.failure is None
+
+    @pytest.mark.asyncio
+    async def test_wrong_answer_names_the_example(self) -> None:
+        wrong = TWO_SUM.replace("[seen[target - n], i]", "[seen[target - n], i + 1]")
+        async with SandboxPool(size=1, timeout=2.0) as pool:
+            outcome = await ExampleCheck(pool).check(_problem(), _solution(wrong))
+        assert outcome.failure is not None
+        assert outcome.failure.status == SubmissionStatus.WRONG_ANSWER
+        assert "Input: nums = [2,7,11,15], target = 9" in (outcome.failure.error_message or "")
+
+    @pytest.mark.asyncio
+    async def test_order_only_mismatch_is_left_to_leetcode(self) -> None:
+        reversed_pair = TWO_SUM.replace("[seen[target - n], i]", "[i, seen[target - n]]")
+        async with SandboxPool(size=1, timeout=2.0) as pool:
+            outcome = await ExampleCheck(pool).check(_problem(), _solution(reversed_pair))
+        assert outcome.failure is None
+
+    @pytest.mark.asyncio
+    async def test_infinite_loop_times_out_and_worker_is_reusable(self) -> None:
+        looping = TWO_SUM.replace("seen = {}", "while True:\n            pass")
+        async with SandboxPool(size=1, timeout=0.5) as pool:
+            check = ExampleCheck(pool)
+            timed_out = await check.check(_problem(), _solution(looping))
+            passed = await check.check(_problem(), _solution(TWO_SUM))
+        assert timed_out.failure is not None
+        assert timed_out.failure.status == SubmissionStatus.TIME_LIMIT
+        assert passed.failure is None
+
+    @pytest.mark.asyncio
+    async def test_runtime_error(self) -> None:
+        crashing = TWO_SUM.replace("seen = {}", "return nums[100]")
+        async with SandboxPool(size=1, timeout=2.0) as pool:
+            outcome = await ExampleCheck(pool).check(_problem(), _solution(crashing))
+        assert outcome.failure is not None
+        assert outcome.failure.status == SubmissionStatus.RUNTIME_ERROR
+        assert "IndexError" in (outcome.failure.error_message or "")
+
+
+LINKED_SNIPPET = (
+    "# Definition for singly-linked list.\n"
+    "# class ListNode:\n"
+    "#     def __init__(self, val=0, next=None):\n"
+    "#         self.val = val\n"
+    "class Solution:\n"
+    "    def reverseList(self, head: Optional[ListNode]) -> Optional[ListNode]:\n"
+    "        "
+)
+
+NODE_SNIPPET = (
+    '"""\n'
+    "# Definition for a Node.\n"
+    "class Node:\n"
+    "    def __init__(self, val = 0, neighbors = None):\n"
+    "        self.val = val\n"
+    '"""\n'
+    "\n"
+    "from typing import Optional\n"
+    "class Solution:\n"
+    "    def cloneGraph(self, node: Optional['Node']) -> Optional['Node']:\n"
+    "        "
+)
+
+
+class TestStaticCheck:
+    @pytest.mark.asyncio
+    async def test_valid_code_passes_unchanged_apart_from_imports(self) -> None:
+        outcome = await StaticCheck().check(_problem(), _solution(TWO_SUM))
+        assert outcome.failure is None
+        assert outcome.solution.code == "from typing import List\n" + TWO_SUM
+
+    def test_imports_only_what_is_used_and_undefined(self) -> None:
+        code = (
+            "import heapq\n"
+            "class Solution:\n"
+            "    def twoSum(self, nums: List[int], target: int) -> List[int]:\n"
+            "        deque = []\n"
+            "        heapq.heapify(nums)\n"
+            "        return list(accumulate(Counter(nums).values())) + math.floor(deque)\n"
+        )
+        report = validate(_problem(), code)
+        assert report.status is None
+        assert report.code.splitlines()[:3] == [
+            "import math",
+            "from collections import Counter",
+            "from itertools import accumulate",
+        ]
+        assert "from typing import List" in report.code
+
+    @pytest.mark.asyncio
+    async def test_syntax_error_is_a_compile_error(self) -> None:
+        broken = _solution("class Solution:\n    def twoSum(self\n")
+        outcome = await StaticCheck().check(_problem(), broken)
+        assert outcome.failure is not None
+        assert outcome.failure.status == SubmissionStatus.COMPILE_ERROR
+        assert outcome.failure.error_message.startswith("Local static check: SyntaxError")
+
+    def test_functions_outside_the_class_are_wrapped(self) -> None:
+        code = (
+            "def twoSum(self, nums, target):\n"
+            "    return self.helper(nums)\n"
+            "\n"
+            "def helper(self, nums):\n"
+            "    return [0, 1]\n"
+        )
+        report = validate(_problem(), code)
+        assert report.status is None
+        namespace: dict = {}
+        exec(report.code, namespace)
+        assert namespace["Solution"]().twoSum([1, 2], 3) == [0, 1]
+
+    def test_a_lone_renamed_method_is_renamed_back(self) -> None:
+        code = (
+            "class Solution:\n"
+            "    def two_sum(self, nums, target, start=0):\n"
+            "        return self.two_sum(nums, target, 1) if start == 0 else [start]\n"
+        )
+        report = validate(_problem(), code)
+        assert report.repairs == ("renamed two_sum to twoSum",)
+        namespace: dict = {}
+        exec(report.code, namespace)
+        assert namespace["Solution"]().twoSum([1], 1) == [1]
+
+    @pytest.mark.parametrize(
+        ("code", "error"),
+        [
+            ("x = 1\n", "does not define class Solution"),
+            (
+                "class Solution:\n    def a(self, n, t): pass\n    def b(self, n, t): pass\n",
+                "has no method twoSum (defines: a, b)",
+            ),
+            ("class Solution:\n    def twoSum(self, nums): pass\n", "must take 2 arguments"),
+        ],
+    )
+    def test_unfixable_interfaces_are_rejected(self, code: str, error: str) -> None:
+        report = validate(_problem(), code)
+        assert report.status == SubmissionStatus.RUNTIME_ERROR
+        assert error in report.error
+
+    def test_judge_types_and_commented_helpers_are_ignored(self) -> None:
+        code = (
+            "class Solution:\n"
+            "    def reverseList(self, head: Optional[ListNode]) -> Optional[ListNode]:\n"
+            "        return head\n"
+        )
+        report = validate(_problem(snippet=LINKED_SNIPPET), code)
+        assert report.status is None
+        assert report.code.startswith("from typing import Optional\n")
+
+    def test_helper_types_in_starter_docstrings_are_ignored(self) -> None:
+        code = (
+            "class Solution:\n"
+            "    def cloneGraph(self, node: Optional['Node']) -> Optional['Node']:\n"
+            "        return node\n"
+        )
+        assert expected_interface(NODE_SNIPPET) == (
+            "Solution",
+            (ExpectedMethod("cloneGraph", 1),),
+        )
+        assert validate(_problem(snippet=NODE_SNIPPET), code).status is None
+
+
+class TestConstraints:
+    def test_reads_chains_exponents_and_references(self) -> None:
+        constraints = Constraints(
+            "- `1 <= n <= 2 * 10^4`\n- `0 <= k < n`\n- `m == grid.length`\n"
+            "- `1 <= m, q <= 300`\n- `1 <= grid[i].length <= 50`"
+        )
+        assert constraints.high("n") == 20000
+        assert constraints.high("k") == 20000
+        assert constraints.low("k") == 0
+        assert constraints.high("grid.length") == 300
+        assert constraints.high("grid[j].length") == 50
+        assert constraints.high("missing") is None
+
+
+class TestInputBuilder:
+    def test_builds_max_size_arguments(self) -> None:
+        signature = parse_signature(TWO_SUM_SNIPPET)
+        assert signature is not None
+        built = InputBuilder(_problem(TWO_SUM_CONSTRAINTS), signature).build()
+        assert built is not None
+        nums, target = built.args
+        assert len(nums) == 10_000
+        assert all(-(10**9) <= n <= 10**9 for n in nums)
+        assert target == 10**9
+        assert "nums: 10000 ints" in built.summary
+
+    def test_same_problem_gives_same_input(self) -> None:
+        signature = parse_signature(TWO_SUM_SNIPPET)
+        assert signature is not None
+        first = InputBuilder(_problem(TWO_SUM_CONSTRAINTS), signature).build()
+        second = InputBuilder(_problem(TWO_SUM_CONSTRAINTS), signature).build()
+        assert first == second
+
+    def test_skips_without_constraints_or_known_types(self) -> None:
+        signature = parse_signature(TWO_SUM_SNIPPET)
+        assert signature is not None
+        assert InputBuilder(_problem(TWO_SUM_DESCRIPTION), signature).build() is None
+        snippet = "class Solution:\n    def f(self, nums: Set[int]) -> int:\n"
+        odd = parse_signature(snippet)
+        assert odd is not None
+        assert InputBuilder(_problem("`1 <= nums.length <= 5`", snippet), odd).build() is None
+
+
+@pytest.mark.skipif(not sandbox_supported(), reason="sandbox needs fork()")
+class TestStressCheck:
+    @pytest.mark.asyncio
+    async def test_slow_solution_is_predicted_to_tle(self, monkeypatch) -> None:
+        monkeypatch.setitem(stress.STRESS_BUDGET_SECONDS, "Easy", 0.2)
+        slow = "import time\n" + TWO_SUM.replace("seen = {}", "seen = {}\n        time.sleep(0.3)")
+        async with SandboxPool(size=1, timeout=2.0) as pool:
+            outcome = await StressCheck(pool).check(_problem(TWO_SUM_CONSTRAINTS), _solution(slow))
+        assert outcome.failure is not None
+        assert outcome.failure.status == SubmissionStatus.TIME_LIMIT
+        assert "nums: 10000 ints" in (outcome.failure.error_message or "")
+
+    @pytest.mark.asyncio
+    async def test_timeout_is_inconclusive(self, monkeypatch) -> None:
+        monkeypatch.setitem(stress.STRESS_BUDGET_SECONDS, "Easy", 0.1)
+        async with SandboxPool(size=1, timeout=2.0) as pool:
+            outcome = await StressCheck(pool).check(
+                _problem(TWO_SUM_CONSTRAINTS), _solution(QUADRATIC_TWO_SUM)
+            )
+        assert outcome.failure is None
+
+    @pytest.mark.asyncio
+    async def test_linear_solution_passes(self) -> None:
+        async with SandboxPool(size=1, timeout=2.0) as pool:
+            outcome = await StressCheck(pool).check(
+                _problem(TWO_SUM_CONSTRAINTS), _solution(TWO_SUM)
+            )
+        assert outcome.failure is None
+
+    @pytest.mark.asyncio
+    async def test_input_is_built_off_the_event_loop(self, monkeypatch) -> None:
+        threads: list[threading.Thread] = []
+        build = InputBuilder.build
+
+        def recording_build(builder: InputBuilder) -> stress.StressInput | None:
+            threads.append(threading.current_thread())
+            return build(builder)
+
+        monkeypatch.setattr(InputBuilder, "build", recording_build)
+        async with SandboxPool(size=1, timeout=2.0) as pool:
+            await StressCheck(pool).check(_problem(TWO_SUM_CONSTRAINTS), _solution(TWO_SUM))
+        assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from auto_leetcode.leetcode.client import LeetCodeClient
+from auto_leetcode.leetcode.rate_limiter import AdaptiveRateLimiter
+from auto_leetcode.models.problem import ProblemSummary
+from auto_leetcode.storage.catalog_cache import CatalogCache
+from auto_leetcode.storage.problem_store import ProblemStore
+
+
+def _question(problem_id: int) -> dict[str, Any]:
+    return {
+        "questionFrontendId": str(problem_id),
+        "titleSlug": f"p-{problem_id}",
+        "isPaidOnly": False,
+        "difficulty": "Easy",
+        "acRate": 50.0,
+        "categoryTitle": "Algorithms",
+    }
+
+
+class _FakeLeetCode:
+    """Serves the problem list from memory and records every GraphQL request."""
+
+    def __init__(self, total: int, fail_once_at: int | None = None) -> None:
+        self.total = total
+        self.fail_once_at = fail_once_at
+        self.requests: list[dict[str, Any]] = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        variables = body["variables"]
+        self.requests.append(variables)
+        skip, limit = variables["skip"], variables["limit"]
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if skip == self.fail_once_at:
+            self.fail_once_at = None
+            return httpx.Response(502, text="bad gateway")
+        page = [_question(i) for i in range(skip + 1, min(skip + limit, self.total) + 1)]
+        return httpx.Response(
+            200,
+            json={"data": {"problemsetQuestionList": {"totalNum": self.total, "data": page}}},
+        )
+
+
+def _catalog(ids: range) -> dict[int, ProblemSummary]:
+    return {i: ProblemSummary(i, f"p-{i}", "Easy", 50.0, False) for i in ids}
+
+
+def _detail(problem_id: int, content: str = "<p>Add two numbers.</p>") -> dict[str, Any]:
+    return {
+        "questionId": str(problem_id),
+        "questionFrontendId": str(problem_id),
+        "title": f"Problem {problem_id}",
+        "titleSlug": f"p-{problem_id}",
+        "difficulty": "Easy",
+        "content": content,
+        "isPaidOnly": False,
+        "codeSnippets": [{"langSlug": "python3", "code": "class Solution:\n    def f(self):"}],
+    }
+
+
+class _FakeProblemDetails:
+    def __init__(self) -> None:
+        self.requests: list[dict[str, Any]] = []
+        self.content = "<p>Add two numbers.</p>"
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        variables = json.loads(request.content)["variables"]
+        self.requests.append(variables)
+        problem_id = int(variables["titleSlug"].removeprefix("p-"))
+        return httpx.Response(200, json={"data": {"question": _detail(problem_id, self.content)}})
+
+
+def _client(
+    server: Any,
+    problem_store: ProblemStore | None = None,
+    refresh_problems: bool = False,
+) -> LeetCodeClient:
+    client = LeetCodeClient(
+        "s",
+        "c",
+        AdaptiveRateLimiter(initial_rate=1000, max_rate=1000),
+        problem_store=problem_store,
+        refresh_problems=refresh_problems,
+    )
+    client._http = httpx.AsyncClient(
+        base_url="https://leetcode.com", transport=httpx.MockTransport(server)
+    )
+    return client
+
+
+class TestBuildSlugMap:
+    @pytest.mark.asyncio
+    async def test_cold_start_pages_whole_list_and_caches(self, tmp_path: Path) -> None:
+        server = _FakeLeetCode(total=250)
+        cache = CatalogCache(tmp_path / "catalog.json", ttl_seconds=3600)
+        async with _client(server) as client:
+            await client.build_slug_map(cache)
+        assert len(client.catalog) == 250
+        assert sorted(r["skip"] for r in server.requests) == [0, 100, 200]
+        cached = cache.load()
+        assert cached is not None
+        assert cached.total == 250
+
+    @pytest.mark.asyncio
+    async def test_fresh_cache_makes_no_requests(self, tmp_path: Path) -> None:
+        cache = CatalogCache(tmp_path / "catalog.json", ttl_seconds=3600)
+        cache.save({1: ProblemSummary(1, "p-1", "Easy", 50.0, False)}, total=1)
+        server = _FakeLeetCode(total=1)
+        async with _client(server) as client:
+            await client.build_slug_map(cache)
+        assert server.requests == []
+        assert client.catalog[1].slug == "p-1"
+
+    @pytest.mark.asyncio
+    async def test_stale_cache_fetches_only_tail(self, tmp_path: Path) -> None:
+        cache = CatalogCache(tmp_path / "catalog.json", ttl_seconds=0)
+        cache.save(_catalog(range(1, 201)), 200)
+        server = _FakeLeetCode(total=205)
+        async with _client(server) as client:
+            await client.build_slug_map(cache)
+        assert [r["skip"] for r in server.requests] == [200]
+        assert len(client.catalog) == 205
+        cached = cache.load()
+        assert cached is not None
+        assert cached.total == 205
+
+
+class TestPaginate:
+    @pytest.mark.asyncio
+    async def test_fetches_remaining_pages_concurrently_in_order(self) -> None:
+        server = _FakeLeetCode(total=1000)
+        async with _client(server) as client:
+            await client.build_slug_map()
+        assert sorted(client.catalog) == list(range(1, 1001))
+        assert server.requests[0]["skip"] == 0
+        assert server.peak > 1
+
+    @pytest.mark.asyncio
+    async def test_retries_only_the_failed_page(self) -> None:
+        server = _FakeLeetCode(total=300, fail_once_at=200)
+        async with _client(server) as client:
+            solved = await client.fetch_solved_ids()
+        assert solved == set(range(1, 301))
+        assert sorted(r["skip"] for r in server.requests) == [0, 100, 200, 200]
+
+
+class TestFetchProblem:
+    @pytest.mark.asyncio
+    async def test_second_fetch_is_served_from_store(self, tmp_path: Path) -> None:
+        server = _FakeProblemDetails()
+        store = ProblemStore(tmp_path / "problems")
+        async with _client(server, store) as client:
+            client.use_catalog({1: ProblemSummary(1, "p-1", "Easy", 50.0, False)})
+            first = await client.fetch_problem(1)
+            second = await client.fetch_problem(1)
+        assert first == second
+        assert first is not None and "Add two numbers" in first.description
+        assert len(server.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_revalidates(self, tmp_path: Path) -> None:
+        server = _FakeProblemDetails()
+        store = ProblemStore(tmp_path / "problems")
+        async with _client(server, store) as client:
+            client.use_catalog({1: ProblemSummary(1, "p-1", "Easy", 50.0, False)})
+            await client.fetch_problem(1)
+
+        server.content = "<p>Add two numbers, carefully.</p>"
+        async with _client(server, store, refresh_problems=True) as client:
+            client.use_catalog({1: ProblemSummary(1, "p-1", "Easy", 50.0, False)})
+            refreshed = await client.fetch_problem(1)
+        assert len(server.requests) == 2
+        assert refreshed is not None and "carefully" in refreshed.description
+
+
+class _FakeBatchServer:
+    """Answers aliased question queries, rejecting any with more than ``max_aliases``."""
+
+    def __init__(self, max_aliases: int) -> None:
+        self.max_aliases = max_aliases
+        self.batch_sizes: list[int] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        variables = json.loads(request.content)["variables"]
+        self.batch_sizes.append(len(variables))
+        if len(variables) > self.max_aliases:
+            return httpx.Response(200, json={"errors": [{"message": "query too complex"}]})
+        data = {
+            f"q{key.removeprefix('s')}": _detail(int(slug.removeprefix("p-")))
+            for key, slug in variables.items()
+        }
+        return httpx.Response(200, json={"data": data})
+
+
+class TestFetchProblems:
+    @pytest.mark.asyncio
+    async def test_one_request_per_batch(self) -> None:
+        server = _FakeBatchServer(max_aliases=20)
+        async with _client(server) as client:
+            client.use_catalog(_catalog(range(1, 26)))
+            problems = await client.fetch_problems(list(range(1, 26)))
+            prefetched = await client.fetch_problem(7)
+        assert server.batch_sizes == [20, 5]
+        assert all(problems[i] is not None for i in range(1, 26))
+        assert prefetched is not None and prefetched.id == 7
+        assert len(server.batch_sizes) == 2
+
+    @pytest.mark.asyncio
+    async def test_rejected_batch_is_split(self) -> None:
+        server = _FakeBatchServer(max_aliases=3)
+        async with _client(server) as client:
+            client.use_catalog(_catalog(range(1, 9)))
+            problems = await client.fetch_problems(list(range(1, 9)), batch_size=8)
+        assert server.batch_sizes[:3] == [8, 4, 2]
+        assert sorted(problems) == list(range(1, 9))
+        assert all(problem is not None for problem in problems.values())
+
+    @pytest.mark.asyncio
+    async def test_unknown_ids_map_to_none(self) -> None:
+        server = _FakeBatchServer(max_aliases=20)
+        async with _client(server) as client:
+            client.use_catalog({1: ProblemSummary(1, "p-1", "Easy", 50.0, False)})
+            problems = await client.fetch_problems([1, 999])
+        assert problems[999] is None
+        assert problems[1] is not None
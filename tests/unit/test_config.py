@@ -4,7 +4,7 @@ from unittest.mock import patch
 
 import pytest
 
-from auto_leetcode.config import Config, load_config
+from auto_leetcode.config import Config, LeetCodeAccount, load_config
 from auto_leetcode.errors import ConfigError
 
 
@@ -57,6 +57,22 @@ class TestLoadConfig:
         assert config.ai_provider == "claude"
         assert config.ai_model == "claude-sonnet-4-20250514"
 
+    def test_fast_tier_defaults_to_the_main_provider(self) -> None:
+        env = {
+            "LEETCODE_SESSION": "s",
+            "CSRF_TOKEN": "c",
+            "AI_API_KEY": "k",
+            "AI_PROVIDER": "claude",
+            "AI_FAST_MODEL": "claude-haiku",
+            "AI_FAST_BASE_URL": "http://fast.example.com",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            config = load_config()
+        assert config.fast_model == "claude-haiku"
+        assert config.fast_provider == "claude"
+        assert config.fast_api_key == "k"
+        assert config.fast_base_url == "http://fast.example.com"
+
     def test_overrides(self) -> None:
         env = {
             "LEETCODE_SESSION": "s",
@@ -67,3 +83,28 @@ class TestLoadConfig:
             config = load_config(start_id=100, end_id=200)
         assert config.start_id == 100
         assert config.end_id == 200
+
+    def test_extra_accounts(self) -> None:
+        env = {
+            "LEETCODE_SESSION": "s1",
+            "CSRF_TOKEN": "c1",
+            "AI_API_KEY": "k",
+            "LEETCODE_EXTRA_ACCOUNTS": "s2:c2, s3:c3",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            config = load_config()
+        assert config.accounts == (
+            LeetCodeAccount("s1", "c1"),
+            LeetCodeAccount("s2", "c2"),
+            LeetCodeAccount("s3", "c3"),
+        )
+
+    def test_malformed_extra_accounts_raise(self) -> None:
+        env = {
+            "LEETCODE_SESSION": "s",
+            "CSRF_TOKEN": "c",
+            "AI_API_KEY": "k",
+            "LEETCODE_EXTRA_ACCOUNTS": "missing-csrf",
+        }
+        with patch.dict(os.environ, env, clear=True), pytest.raises(ConfigError):
+            load_config()
@@ -0,0 +1,652 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from auto_leetcode.ai.cascade import CascadeGenerator, CascadePolicy
+from auto_leetcode.ai.claude_generator import EPHEMERAL, ClaudeGenerator
+from auto_leetcode.ai.hedging import HedgedGenerator, LatencyTracker
+from auto_leetcode.ai.openai_generator import OpenAIGenerator
+from auto_leetcode.ai.prompt import build_user_prompt
+from auto_leetcode.ai.rate_limiter import AIRateLimiter
+from auto_leetcode.ai.streaming import CACHED_STATS, CodeBlockWatcher
+from auto_leetcode.batch import PrefilledGenerator
+from auto_leetcode.errors import AIGenerationError
+from auto_leetcode.models.batch import BatchProgress
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import GenerationStats, Solution
+from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
+from auto_leetcode.storage.response_cache import ResponseCache
+
+PROBLEM = Problem(
+    id=1,
+    title="Two Sum",
+    slug="two-sum",
+    difficulty="Easy",
+    description="Find two numbers.",
+    code_snippet="class Solution: ...",
+    paid_only=False,
+)
+RESPONSE = "## Approach\nHash map.\n\n## Solution\n```python\nclass Solution: pass\n```"
+STATS = GenerationStats(seconds=1.0, time_to_code=1.0, output_tokens=10)
+# A response split the way a stream delivers it, with an epilogue after the code.
+CHUNKS = [
+    "## Approach\nHash map.\n\n## Solution\n``",
+    "`python\nclass Solution:",
+    " pass\n`",
+    "``",
+    "\n\nThis runs in O(n) time",
+    " because...",
+]
+
+
+class _FakeOpenAIStream:
+    def __init__(self, chunks: list[str], usage: Any = None) -> None:
+        self.chunks = chunks
+        self.usage = usage
+        self.read = 0
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        for chunk in self.chunks:
+            self.read += 1
+            delta = SimpleNamespace(content=chunk)
+            yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=delta)], usage=None)
+        # With ``include_usage`` the last chunk carries usage and no choices.
+        yield SimpleNamespace(choices=[], usage=self.usage)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+PROMPT_USAGE = SimpleNamespace(
+    input_tokens=50, cache_read_input_tokens=1200, cache_creation_input_tokens=0
+)
+
+
+class _FakeClaudeStream:
+    def __init__(self, chunks: list[str]) -> None:
+        self.chunks = chunks
+        self.read = 0
+        self.exited = False
+        self.text_stream = self._text()
+        self.current_message_snapshot = SimpleNamespace(usage=PROMPT_USAGE)
+        self.request: dict[str, Any] = {}
+
+    def __call__(self, **request: Any) -> _FakeClaudeStream:
+        self.request = request
+        return self
+
+    async def _text(self) -> AsyncIterator[str]:
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    async def __aenter__(self) -> _FakeClaudeStream:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        self.exited = True
+
+    async def get_final_message(self) -> Any:
+        return SimpleNamespace(usage=SimpleNamespace(output_tokens=321, **vars(PROMPT_USAGE)))
+
+
+def _openai_complete(texts: list[str], calls: list[int]) -> Any:
+    async def complete(
+        problem: Problem, user_prompt: str, n: int, temperature: float
+    ) -> list[tuple[str, GenerationStats]]:
+        calls.append(n)
+        return [(text, STATS) for text in texts]
+
+    return complete
+
+
+class TestResponseCaching:
+    @pytest.mark.asyncio
+    async def test_repeated_prompt_is_served_from_cache(self, tmp_path: Path) -> None:
+        calls: list[int] = []
+        cache = ResponseCache(tmp_path / "cache.sqlite3")
+        for _ in range(2):
+            generator = OpenAIGenerator("key", "https://example.invalid/v1", "m", cache=cache)
+            generator._complete = _openai_complete([RESPONSE], calls)  # type: ignore[method-assign]
+            solution = await generator.generate(PROBLEM, [])
+            assert solution.code == "class Solution: pass"
+        assert calls == [1]
+        assert cache.stats.hits == 1
+        assert solution.stats is not None and solution.stats.cached
+
+    @pytest.mark.asyncio
+    async def test_empty_responses_are_not_cached(self, tmp_path: Path) -> None:
+        cache = ResponseCache(tmp_path / "cache.sqlite3")
+        generator = OpenAIGenerator("key", "https://example.invalid/v1", "m", cache=cache)
+        generator._complete = _openai_complete([""], [])  # type: ignore[method-assign]
+        with pytest.raises(AIGenerationError, match="Empty code"):
+            await generator.generate(PROBLEM, [])
+        assert cache.get("anything") is None
+        assert cache.stats.misses == 2
+
+
+class TestCandidateSampling:
+    @pytest.mark.asyncio
+    async def test_openai_samples_in_one_request_and_caches_the_set(self, tmp_path: Path) -> None:
+        calls: list[int] = []
+        texts = [RESPONSE, "", RESPONSE.replace("pass", "x = 1")]
+        cache = ResponseCache(tmp_path / "cache.sqlite3")
+        for _ in range(2):
+            generator = OpenAIGenerator("key", "https://example.invalid/v1", "m", cache=cache)
+            generator._complete = _openai_complete(texts, calls)  # type: ignore[method-assign]
+            solutions = await generator.generate_many(PROBLEM, [], 3)
+            assert [s.code for s in solutions] == ["class Solution: pass", "class Solution: x = 1"]
+        assert calls == [3]
+
+
+class TestCodeBlockWatcher:
+    def test_reports_completion_when_the_fence_closes(self) -> None:
+        watcher = CodeBlockWatcher()
+        seen = [watcher.feed(chunk) for chunk in CHUNKS]
+        assert seen == [False, False, False, True, True, True]
+        stats = watcher.finish(None, stopped_early=True)
+        assert stats.time_to_code is not None
+        assert stats.tokens_estimated and stats.output_tokens > 0
+
+    def test_no_code_block(self) -> None:
+        watcher = CodeBlockWatcher()
+        assert not watcher.feed("just prose")
+        assert watcher.finish(7).time_to_code is None
+
+
+class TestStreaming:
+    @pytest.mark.asyncio
+    async def test_openai_stops_reading_after_the_code_block(self) -> None:
+        stream = _FakeOpenAIStream(CHUNKS)
+
+        async def create(**kwargs: Any) -> _FakeOpenAIStream:
+            assert kwargs["stream"] is True
+            return stream
+
+        generator = OpenAIGenerator("key", "https://example.invalid/v1", "m")
+        generator._client = SimpleNamespace(  # type: ignore[assignment]
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+        solution = await generator.generate(PROBLEM, [])
+        assert solution.code == "class Solution: pass"
+        assert stream.read == 4 and stream.closed
+        assert solution.stats is not None and solution.stats.stopped_early
+
+    @pytest.mark.asyncio
+    async def test_openai_reads_usage_when_the_stream_ends(self) -> None:
+        usage = SimpleNamespace(
+            prompt_tokens=1500,
+            completion_tokens=40,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1280),
+        )
+        stream = _FakeOpenAIStream(["no code here"], usage)
+        requests: list[dict[str, Any]] = []
+
+        async def create(**kwargs: Any) -> _FakeOpenAIStream:
+            requests.append(kwargs)
+            return stream
+
+        generator = OpenAIGenerator("key", "https://example.invalid/v1", "m")
+        generator._client = SimpleNamespace(  # type: ignore[assignment]
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+        [(text, stats)] = await generator._complete_streaming({"model": "m"}, 1, "Solution")
+        assert requests[0]["stream_options"] == {"include_usage": True}
+        assert text == "no code here" and not stats.stopped_early
+        assert (stats.input_tokens, stats.cache_read_tokens) == (1500, 1280)
+        assert stats.output_tokens == 40 and not stats.tokens_estimated
+
+    @pytest.mark.asyncio
+    async def test_claude_stops_reading_after_the_code_block(self) -> None:
+        stream = _FakeClaudeStream(CHUNKS)
+        generator = ClaudeGenerator("key", "https://example.invalid", "m")
+        generator._client = SimpleNamespace(  # type: ignore[assignment]
+            messages=SimpleNamespace(stream=stream)
+        )
+        solution = await generator.generate(PROBLEM, [])
+        assert solution.code == "class Solution: pass"
+        assert stream.read == 4 and stream.exited
+        assert solution.stats is not None and solution.stats.stopped_early
+        assert solution.stats.cache_read_tokens == 1200
+
+    @pytest.mark.asyncio
+    async def test_claude_reads_usage_when_the_stream_ends(self) -> None:
+        stream = _FakeClaudeStream(["no code here"])
+        generator = ClaudeGenerator("key", "https://example.invalid", "m")
+        generator._client = SimpleNamespace(  # type: ignore[assignment]
+            messages=SimpleNamespace(stream=stream)
+        )
+        solution = await generator.generate(PROBLEM, [])
+        assert solution.stats is not None
+        assert solution.stats.output_tokens == 321 and not solution.stats.stopped_early
+
+
+class TestPromptCaching:
+    @pytest.mark.asyncio
+    async def test_claude_marks_stable_prefix_and_newest_attempt(self) -> None:
+        failed = SubmissionResult(
+            problem_id=1,
+            status=SubmissionStatus.WRONG_ANSWER,
+            runtime_ms=None,
+            memory_mb=None,
+            error_message=None,
+            solution=Solution(
+                problem_id=1, code="x", language="python3", model_used="m", attempt=1
+            ),
+        )
+        stream = _FakeClaudeStream(CHUNKS)
+        generator = ClaudeGenerator("key", "https://example.invalid", "m")
+        generator._client = SimpleNamespace(  # type: ignore[assignment]
+            messages=SimpleNamespace(stream=stream)
+        )
+        await generator.generate(PROBLEM, [failed, failed])
+
+        assert stream.request["system"][0]["cache_control"] == {"type": "ephemeral"}
+        blocks = stream.request["messages"][0]["content"]
+        assert [("cache_control" in block) for block in blocks] == [True, False, True, False]
+        assert "".join(block["text"] for block in blocks) == build_user_prompt(
+            PROBLEM, [failed, failed]
+        )
+
+    @pytest.mark.asyncio
+    async def test_openai_reports_cached_prompt_tokens(self) -> None:
+        async def create(**kwargs: Any) -> Any:
+            message = SimpleNamespace(content=RESPONSE)
+            usage = SimpleNamespace(
+                prompt_tokens=1500,
+                completion_tokens=40,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=1280),
+            )
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+        generator = OpenAIGenerator("key", "https://example.invalid/v1", "m", stream=False)
+        generator._client = SimpleNamespace(  # type: ignore[assignment]
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+        solution = await generator.generate(PROBLEM, [])
+        assert solution.stats is not None
+        assert (solution.stats.input_tokens, solution.stats.cache_read_tokens) == (1500, 1280)
+        assert solution.stats.output_tokens == 40
+
+
+class _FakeClaudeBatches:
+    """Stands in for ``client.messages.batches``; one poll reports in progress."""
+
+    def __init__(self) -> None:
+        self.requests: list[dict[str, Any]] = []
+        self.polls = 0
+
+    async def create(self, requests: list[dict[str, Any]]) -> Any:
+        self.requests = requests
+        return SimpleNamespace(id="b1")
+
+    async def retrieve(self, batch_id: str) -> Any:
+        self.polls += 1
+        done = self.polls > 1
+        count = len(self.requests)
+        return SimpleNamespace(
+            processing_status="ended" if done else "in_progress",
+            request_counts=SimpleNamespace(
+                processing=0 if done else count,
+                succeeded=count if done else 0,
+                errored=0,
+                canceled=0,
+                expired=0,
+            ),
+        )
+
+    async def results(self, batch_id: str) -> AsyncIterator[Any]:
+        return self._results()
+
+    async def _results(self) -> AsyncIterator[Any]:
+        message = SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=RESPONSE)],
+            usage=SimpleNamespace(input_tokens=40, output_tokens=12),
+        )
+        for request in self.requests:
+            result = SimpleNamespace(type="succeeded", message=message)
+            yield SimpleNamespace(custom_id=request["custom_id"], result=result)
+        yield SimpleNamespace(custom_id="problem-999", result=SimpleNamespace(type="errored"))
+
+
+class _FakeBatchServer:
+    """Just enough of OpenAI's Files and Batches endpoints to run a batch end to end."""
+
+    def __init__(self, polls_until_done: int = 1, usage: bool = True) -> None:
+        self.polls_until_done = polls_until_done
+        self.usage = usage
+        self.polls = 0
+        self.requests: list[dict[str, Any]] = []
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self._handle)
+
+    def _status(self) -> bool:
+        self.polls += 1
+        return self.polls > self.polls_until_done
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/files" and request.method == "POST":
+            body = request.content.decode()
+            start = body.index('{"custom_id"')
+            end = body.rindex("}") + 1
+            self.requests = [json.loads(line) for line in body[start:end].splitlines()]
+            return httpx.Response(
+                200,
+                json={
+                    "id": "file-in",
+                    "object": "file",
+                    "bytes": 1,
+                    "created_at": 0,
+                    "filename": "batch.jsonl",
+                    "purpose": "batch",
+                    "status": "processed",
+                },
+            )
+        if path == "/v1/batches" and request.method == "POST":
+            return httpx.Response(200, json=self._openai_batch(False))
+        if path == "/v1/batches/b1":
+            return httpx.Response(200, json=self._openai_batch(self._status()))
+        if path == "/v1/files/file-out/content":
+            lines = [
+                {
+                    "custom_id": r["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "choices": [{"message": {"content": RESPONSE}}],
+                            "usage": (
+                                {"prompt_tokens": 40, "completion_tokens": 12}
+                                if self.usage
+                                else None
+                            ),
+                        },
+                    },
+                }
+                for r in self.requests
+            ]
+            return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+        return httpx.Response(404, json={"error": {"message": path}})
+
+    def _openai_batch(self, done: bool) -> dict[str, Any]:
+        count = len(self.requests)
+        return {
+            "id": "b1",
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "input_file_id": "file-in",
+            "completion_window": "24h",
+            "created_at": 0,
+            "status": "completed" if done else "in_progress",
+            "output_file_id": "file-out" if done else None,
+            "request_counts": {"total": count, "completed": count if done else 0, "failed": 0},
+        }
+
+
+PROBLEM_2 = replace(PROBLEM, id=2, title="Add Two Numbers", slug="add-two-numbers")
+
+
+class TestBatchGeneration:
+    @pytest.mark.asyncio
+    async def test_claude_batch_round_trip_fills_the_cache(self, tmp_path: Path) -> None:
+        batches = _FakeClaudeBatches()
+        cache = ResponseCache(tmp_path / "cache.sqlite3")
+        generator = ClaudeGenerator("key", "https://batch.test", "m", cache=cache)
+        generator._client = SimpleNamespace(  # type: ignore[assignment]
+            messages=SimpleNamespace(batches=batches)
+        )
+
+        batch_id = await generator.submit_batch([PROBLEM, PROBLEM_2])
+        assert [r["custom_id"] for r in batches.requests] == ["problem-1", "problem-2"]
+        assert batches.requests[0]["params"]["system"][0]["cache_control"] == EPHEMERAL
+        assert (await generator.batch_progress(batch_id)).done is False
+        progress = await generator.batch_progress(batch_id)
+        assert progress == BatchProgress(done=True, succeeded=2, failed=0, total=2)
+
+        solutions = await generator.batch_results(batch_id, [PROBLEM, PROBLEM_2])
+        assert [(s.problem_id, s.code, s.attempt) for s in solutions] == [
+            (1, "class Solution: pass", 1),
+            (2, "class Solution: pass", 1),
+        ]
+        assert solutions[0].stats is not None and solutions[0].stats.batched
+        # The interactive first attempt now hits the entry the batch wrote.
+        generator._complete = None  # type: ignore[assignment, method-assign]
+        assert (await generator.generate(PROBLEM, [])).stats == CACHED_STATS
+
+    @pytest.mark.asyncio
+    async def test_openai_batch_round_trip_fills_the_cache(self, tmp_path: Path) -> None:
+        server = _FakeBatchServer()
+        cache = ResponseCache(tmp_path / "cache.sqlite3")
+        generator = OpenAIGenerator("key", "https://batch.test/v1", "m", cache=cache)
+        generator._client = AsyncOpenAI(
+            api_key="key",
+            base_url="https://batch.test/v1",
+            http_client=httpx.AsyncClient(transport=server.transport()),
+        )
+
+        batch_id = await generator.submit_batch([PROBLEM, PROBLEM_2])
+        assert [r["url"] for r in server.requests] == ["/v1/chat/completions"] * 2
+        assert server.requests[0]["body"]["temperature"] == 0.2
+        assert (await generator.batch_progress(batch_id)).done is False
+        assert (await generator.batch_progress(batch_id)).succeeded == 2
+
+        solutions = await generator.batch_results(batch_id, [PROBLEM, PROBLEM_2])
+        assert [s.problem_id for s in solutions] == [1, 2]
+        assert solutions[0].stats is not None and solutions[0].stats.output_tokens == 12
+        assert solutions[0].stats.batched and not solutions[0].stats.tokens_estimated
+        generator._complete = None  # type: ignore[assignment, method-assign]
+        assert (await generator.generate(PROBLEM, [])).stats == CACHED_STATS
+
+    @pytest.mark.asyncio
+    async def test_openai_batch_without_usage_estimates_tokens(self) -> None:
+        server = _FakeBatchServer(polls_until_done=0, usage=False)
+        generator = OpenAIGenerator("key", "https://batch.test/v1", "m")
+        generator._client = AsyncOpenAI(
+            api_key="key",
+            base_url="https://batch.test/v1",
+            http_client=httpx.AsyncClient(transport=server.transport()),
+        )
+        batch_id = await generator.submit_batch([PROBLEM])
+        assert (await generator.batch_progress(batch_id)).done
+        [solution] = await generator.batch_results(batch_id, [PROBLEM])
+        assert solution.stats is not None and solution.stats.tokens_estimated
+        assert solution.stats.output_tokens > 0
+
+
+class TestPrefilledGenerator:
+    @pytest.mark.asyncio
+    async def test_first_attempt_is_prefilled_and_retries_go_live(self) -> None:
+        prefilled = Solution(1, "batch", "python3", "m", attempt=1)
+        live = Solution(1, "live", "python3", "m", attempt=1)
+        inner = SimpleNamespace(generate=AsyncMock(return_value=live))
+        generator = PrefilledGenerator(inner, {1: prefilled})
+
+        failure = SubmissionResult(1, SubmissionStatus.WRONG_ANSWER, None, None, None, prefilled)
+        assert await generator.generate(PROBLEM, [failure]) is live
+        assert await generator.generate(PROBLEM, []) is prefilled
+        # Each batch result is used once; a restarted problem generates live.
+        assert await generator.generate(PROBLEM, []) is live
+
+
+class TestCascade:
+    def _generator(self, **policy: Any) -> tuple[CascadeGenerator, AsyncMock, AsyncMock]:
+        fast = AsyncMock()
+        fast.generate = AsyncMock(return_value="fast")
+        strong = AsyncMock()
+        strong.generate = AsyncMock(return_value="strong")
+        return CascadeGenerator(fast, strong, CascadePolicy(**policy)), fast, strong
+
+    def _failure(self, status: SubmissionStatus) -> SubmissionResult:
+        solution = Solution(1, "code", "python3", "fast-model", attempt=1)
+        return SubmissionResult(1, status, None, None, None, solution)
+
+    @pytest.mark.asyncio
+    async def test_first_attempts_use_the_fast_model(self) -> None:
+        generator, _, _ = self._generator()
+        assert await generator.generate(PROBLEM, []) == "fast"
+        wrong = [self._failure(SubmissionStatus.WRONG_ANSWER)]
+        assert await generator.generate(PROBLEM, wrong) == "fast"
+
+    @pytest.mark.asyncio
+    async def test_hard_problems_start_on_the_strong_model(self) -> None:
+        generator, _, _ = self._generator()
+        assert await generator.generate(replace(PROBLEM, difficulty="Hard"), []) == "strong"
+
+    @pytest.mark.asyncio
+    async def test_escalation_after_failures_and_on_tle_is_sticky(self) -> None:
+        generator, _, _ = self._generator(escalate_after=3)
+        tle = self._failure(SubmissionStatus.TIME_LIMIT)
+        wrong = self._failure(SubmissionStatus.WRONG_ANSWER)
+        assert await generator.generate(PROBLEM, [tle, wrong]) == "strong"
+        assert await generator.generate(PROBLEM, [wrong, wrong]) == "fast"
+        assert await generator.generate(PROBLEM, [wrong] * 3) == "strong"
+
+    @pytest.mark.asyncio
+    async def test_candidates_follow_the_same_route(self) -> None:
+        generator, fast, strong = self._generator()
+        await generator.generate_many(replace(PROBLEM, difficulty="Hard"), [], 3)
+        strong.generate_many.assert_awaited_once()
+        fast.generate_many.assert_not_called()
+
+
+class _TimedGenerator:
+    """Answers after ``delay`` seconds, or fails, and records whether it was cancelled."""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False) -> None:
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+
+    async def generate(self, problem: Problem, previous: list[SubmissionResult]) -> Solution:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise AIGenerationError(f"{self.name} is down")
+        return Solution(problem.id, self.name, "python3", self.name, attempt=1)
+
+    async def generate_many(
+        self, problem: Problem, previous: list[SubmissionResult], n: int
+    ) -> list[Solution]:
+        return [await self.generate(problem, previous)]
+
+
+class TestHedging:
+    def test_latency_percentile_needs_enough_samples(self) -> None:
+        tracker = LatencyTracker()
+        for seconds in [1.0, 2.0, 3.0, 4.0]:
+            tracker.observe(seconds)
+        assert tracker.percentile(0.95) is None
+        for seconds in range(5, 21):
+            tracker.observe(float(seconds))
+        assert tracker.percentile(0.95) == 19.0
+        assert tracker.percentile(0.5) == 10.0
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self) -> None:
+        primary, secondary = _TimedGenerator("primary"), _TimedGenerator("secondary")
+        generator = HedgedGenerator(primary, secondary, default_delay=1.0)
+        assert (await generator.generate(PROBLEM, [])).code == "primary"
+        assert secondary.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self) -> None:
+        primary = _TimedGenerator("primary", delay=5.0)
+        secondary = _TimedGenerator("secondary")
+        generator = HedgedGenerator(primary, secondary, default_delay=0.01)
+        assert (await generator.generate(PROBLEM, [])).code == "secondary"
+        assert primary.cancelled
+
+    @pytest.mark.asyncio
+    async def test_cancelled_primaries_still_count_towards_latency(self) -> None:
+        primary = _TimedGenerator("primary", delay=5.0)
+        generator = HedgedGenerator(primary, _TimedGenerator("secondary"), default_delay=0.01)
+        for _ in range(5):
+            await generator.generate(PROBLEM, [])
+        learned = generator.latency.percentile(0.5)
+        assert learned is not None and learned >= 0.01
+
+    @pytest.mark.asyncio
+    async def test_hedging_off_waits_for_the_primary(self) -> None:
+        primary = _TimedGenerator("primary", delay=0.05)
+        secondary = _TimedGenerator("secondary")
+        generator = HedgedGenerator(primary, secondary, hedge=False, default_delay=0.01)
+        assert (await generator.generate_many(PROBLEM, [], 2))[0].code == "primary"
+        assert secondary.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_fail_over_until_the_cooldown_ends(self) -> None:
+        now = [0.0]
+        primary = _TimedGenerator("primary", fail=True)
+        secondary = _TimedGenerator("secondary")
+        generator = HedgedGenerator(
+            primary, secondary, failover_after=2, cooldown=60.0, clock=lambda: now[0]
+        )
+        for _ in range(3):
+            assert (await generator.generate(PROBLEM, [])).code == "secondary"
+        assert primary.calls == 2
+
+        now[0] = 61.0
+        primary.fail = False
+        assert (await generator.generate(PROBLEM, [])).code == "primary"
+
+    @pytest.mark.asyncio
+    async def test_both_failing_raises(self) -> None:
+        generator = HedgedGenerator(
+            _TimedGenerator("primary", fail=True), _TimedGenerator("secondary", fail=True)
+        )
+        with pytest.raises(AIGenerationError, match="secondary is down"):
+            await generator.generate(PROBLEM, [])
+
+
+class _SleepingClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiting:
+    @pytest.mark.asyncio
+    async def test_openai_429_is_queued_and_retried(self) -> None:
+        throttled = AIGenerationError("429")
+        throttled.status_code = 429  # type: ignore[attr-defined]
+        throttled.response = SimpleNamespace(  # type: ignore[attr-defined]
+            headers={"retry-after": "2"}
+        )
+        clock = _SleepingClock()
+        limiter = AIRateLimiter(clock=clock, sleep=clock.sleep)
+        generator = OpenAIGenerator("key", "https://example.invalid/v1", "m", limiter=limiter)
+        create = AsyncMock(side_effect=[throttled, _FakeOpenAIStream(CHUNKS)])
+        generator._client = SimpleNamespace(  # type: ignore[assignment]
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+
+        solution = await generator.generate(PROBLEM, [])
+        assert solution.code == "class Solution: pass"
+        assert create.await_count == 2
+        assert clock.slept == [pytest.approx(2.0)]
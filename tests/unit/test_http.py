@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from auto_leetcode.leetcode.http import ConnectionStats, HttpSettings, build_http_client
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    # Minimal keep-alive HTTP/1.1 server: answer every request on the same socket.
+    try:
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+@pytest.fixture
+async def base_url() -> AsyncIterator[str]:
+    server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        yield f"http://127.0.0.1:{port}"
+
+
+class TestConnectionStats:
+    @pytest.mark.asyncio
+    async def test_counts_new_and_reused_connections(self, base_url: str) -> None:
+        stats = ConnectionStats()
+        async with build_http_client(base_url, {}, HttpSettings(http2=False), stats) as http:
+            for _ in range(3):
+                resp = await http.get("/")
+                assert resp.text == "ok"
+        assert stats.requests == 3
+        assert stats.new_connections == 1
+        assert stats.reused_connections == 2
+        assert stats.pool_wait_seconds >= 0.0
+
+    def test_record_wait_tracks_max(self) -> None:
+        stats = ConnectionStats()
+        stats.record_wait(0.5)
+        stats.record_wait(0.25)
+        assert stats.pool_wait_seconds == 0.75
+        assert stats.max_pool_wait_seconds == 0.5
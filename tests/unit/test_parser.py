@@ -15,6 +15,24 @@ class TestStripHtml:
     def test_plain_text(self) -> None:
         assert strip_html("hello world") == "hello world"
 
+    def test_superscript_stays_on_line(self) -> None:
+        html = "<li><code>1 &lt;= n &lt;= 10<sup>5</sup></code></li>"
+        assert strip_html(html) == "- `1 <= n <= 10^5`"
+
+    def test_pre_becomes_code_block(self) -> None:
+        html = "<pre>\n<strong>Input:</strong> nums = [1,2]\n<strong>Output:</strong> 3\n</pre>"
+        assert strip_html(html) == "```\nInput: nums = [1,2]\nOutput: 3\n```"
+
+    def test_lists_and_paragraphs(self) -> None:
+        html = (
+            "<p>Rules:</p><ol><li>first</li><li>second<ul><li>nested</li></ul></li></ol><p>End</p>"
+        )
+        assert strip_html(html) == "Rules:\n\n1. first\n2. second\n  - nested\n\nEnd"
+
+    def test_collapses_whitespace_and_nbsp(self) -> None:
+        html = "<p>Given&nbsp;<code>nums</code>,\n\t return   it.</p>\n\n<p>&nbsp;</p>"
+        assert strip_html(html) == "Given `nums`, return it."
+
 
 class TestExtractCodeSnippet:
     def test_finds_python3(self) -> None:
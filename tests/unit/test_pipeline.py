@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from auto_leetcode.config import Config
+from auto_leetcode.errors import LeetCodeClientError
+from auto_leetcode.models.problem import Problem
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
+from auto_leetcode.pipeline import Pipeline, StageLimits
+from auto_leetcode.storage.file_saver import FileSaver
+from auto_leetcode.storage.json_repository import JsonRepository
+
+
+def _config(tmp_path: Path, concurrency: int = 4) -> Config:
+    return Config(
+        leetcode_session="s",
+        csrf_token="c",
+        ai_provider="openai",
+        ai_api_key="k",
+        ai_base_url="http://localhost",
+        ai_model="gpt-4o",
+        max_retries=2,
+        concurrency=concurrency,
+        solutions_dir=tmp_path / "solutions",
+        results_path=tmp_path / "results.jsonl",
+    )
+
+
+def _problem(problem_id: int) -> Problem:
+    return Problem(
+        id=problem_id,
+        title=f"P{problem_id}",
+        slug=f"p-{problem_id}",
+        difficulty="Easy",
+        description="d",
+        code_snippet="class Solution:\n    def f(self):",
+        paid_only=False,
+    )
+
+
+def _solution(problem_id: int, attempt: int = 1) -> Solution:
+    return Solution(
+        problem_id=problem_id,
+        code="class Solution: pass",
+        language="python3",
+        model_used="gpt-4o",
+        attempt=attempt,
+    )
+
+
+def _result(solution: Solution, status: SubmissionStatus) -> SubmissionResult:
+    return SubmissionResult(
+        problem_id=solution.problem_id,
+        status=status,
+        runtime_ms=None,
+        memory_mb=None,
+        error_message=None,
+        solution=solution,
+    )
+
+
+def _pipeline(tmp_path: Path, client: AsyncMock, generator: AsyncMock, **kwargs: int) -> Pipeline:
+    return Pipeline(
+        client,
+        generator,
+        JsonRepository(tmp_path / "results.jsonl"),
+        FileSaver(tmp_path / "solutions"),
+        _config(tmp_path, **kwargs),
+        set(),
+    )
+
+
+class TestStageLimits:
+    def test_submit_stage_is_serialized(self, tmp_path: Path) -> None:
+        limits = StageLimits.from_config(_config(tmp_path, concurrency=8))
+        assert limits.submit == 1
+        assert limits.generate == 8
+        assert limits.poll == 8
+        assert limits.fetch == 4
+
+
+class TestPipeline:
+    @pytest.mark.asyncio
+    async def test_solves_every_problem(self, tmp_path: Path) -> None:
+        client = AsyncMock()
+        client.fetch_problem = AsyncMock(side_effect=_problem)
+        client.start_submission = AsyncMock(side_effect=lambda s: s.problem_id * 100)
+        client.check_submission = AsyncMock(
+            side_effect=lambda _sid, s: _result(s, SubmissionStatus.ACCEPTED)
+        )
+        generator = AsyncMock()
+        generator.generate = AsyncMock(side_effect=lambda p, _prev: _solution(p.id))
+
+        pipeline = _pipeline(tmp_path, client, generator)
+        await pipeline.run(range(1, 11))
+
+        repository = JsonRepository(tmp_path / "results.jsonl")
+        assert all(repository.is_solved(i) for i in range(1, 11))
+
+    @pytest.mark.asyncio
+    async def test_retries_through_generate_stage(self, tmp_path: Path) -> None:
+        client = AsyncMock()
+        client.fetch_problem = AsyncMock(side_effect=_problem)
+        client.start_submission = AsyncMock(return_value=1)
+        verdicts = iter([SubmissionStatus.WRONG_ANSWER, SubmissionStatus.ACCEPTED])
+        client.check_submission = AsyncMock(side_effect=lambda _sid, s: _result(s, next(verdicts)))
+        generator = AsyncMock()
+        generator.generate = AsyncMock(
+            side_effect=lambda p, prev: _solution(p.id, attempt=len(prev) + 1)
+        )
+
+        pipeline = _pipeline(tmp_path, client, generator, concurrency=2)
+        await pipeline.run([7])
+
+        assert generator.generate.call_count == 2
+        second_call_attempts = generator.generate.call_args_list[1].args[1]
+        assert second_call_attempts[0].status == SubmissionStatus.WRONG_ANSWER
+        assert JsonRepository(tmp_path / "results.jsonl").is_solved(7)
+
+    @pytest.mark.asyncio
+    async def test_poll_failure_resubmits_the_same_code(self, tmp_path: Path) -> None:
+        client = AsyncMock()
+        client.fetch_problem = AsyncMock(side_effect=_problem)
+        client.start_submission = AsyncMock(side_effect=[1, 2])
+        client.check_submission = AsyncMock(
+            side_effect=[
+                LeetCodeClientError("poll failed"),
+                _result(_solution(7), SubmissionStatus.ACCEPTED),
+            ]
+        )
+        generator = AsyncMock()
+        generator.generate = AsyncMock(side_effect=lambda p, _prev: _solution(p.id))
+
+        pipeline = _pipeline(tmp_path, client, generator)
+        await pipeline.run([7])
+
+        assert generator.generate.call_count == 1
+        assert [call.args[0] for call in client.check_submission.call_args_list] == [1, 2]
+        assert JsonRepository(tmp_path / "results.jsonl").is_solved(7)
+
+    @pytest.mark.asyncio
+    async def test_repeated_poll_failure_gives_up(self, tmp_path: Path) -> None:
+        client = AsyncMock()
+        client.fetch_problem = AsyncMock(side_effect=_problem)
+        client.start_submission = AsyncMock(return_value=1)
+        client.check_submission = AsyncMock(side_effect=LeetCodeClientError("poll failed"))
+        generator = AsyncMock()
+        generator.generate = AsyncMock(side_effect=lambda p, _prev: _solution(p.id))
+
+        pipeline = _pipeline(tmp_path, client, generator)
+        await pipeline.run([7])
+
+        assert client.start_submission.call_count == 2
+        assert not JsonRepository(tmp_path / "results.jsonl").is_solved(7)
+
+    @pytest.mark.asyncio
+    async def test_overlaps_generation_across_problems(self, tmp_path: Path) -> None:
+        active = 0
+        peak = 0
+
+        async def slow_generate(problem: Problem, _prev: list[SubmissionResult]) -> Solution:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return _solution(problem.id)
+
+        client = AsyncMock()
+        client.fetch_problem = AsyncMock(side_effect=_problem)
+        client.start_submission = AsyncMock(return_value=1)
+        client.check_submission = AsyncMock(
+            side_effect=lambda _sid, s: _result(s, SubmissionStatus.ACCEPTED)
+        )
+        generator = AsyncMock()
+        generator.generate = slow_generate
+
+        pipeline = _pipeline(tmp_path, client, generator, concurrency=4)
+        await pipeline.run(range(1, 9))
+
+        assert peak > 1
+        assert peak <= 4
+
+    @pytest.mark.asyncio
+    async def test_worker_failure_propagates(self, tmp_path: Path) -> None:
+        client = AsyncMock()
+        client.fetch_problem = AsyncMock(side_effect=RuntimeError("boom"))
+        generator = AsyncMock()
+
+        pipeline = _pipeline(tmp_path, client, generator)
+        with pytest.raises(RuntimeError, match="boom"):
+            await pipeline.run(range(1, 3))
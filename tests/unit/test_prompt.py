@@ -1,4 +1,12 @@
-from auto_leetcode.ai.prompt import SYSTEM_PROMPT, build_user_prompt, extract_code
+from auto_leetcode.ai.prompt import (
+    SYSTEM_PROMPT,
+    build_prompt_parts,
+    build_user_prompt,
+    extract_code,
+    has_code_block,
+    starter_class,
+    trim_error,
+)
 from auto_leetcode.models.problem import Problem
 from auto_leetcode.models.solution import Solution
 from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
@@ -72,3 +80,73 @@ class TestExtractCode:
 
     def test_empty_string(self) -> None:
         assert extract_code("") == ""
+
+    def test_prefers_the_block_defining_a_class(self) -> None:
+        text = (
+            "Usage:\n```python\nprint(Solution().solve())\n```\n"
+            "## Solution\n```python\nclass Solution:\n    def solve(self): pass\n```"
+        )
+        assert extract_code(text) == "class Solution:\n    def solve(self): pass"
+        assert not has_code_block(text.split("## Solution")[0])
+        assert has_code_block(text)
+
+    def test_prefers_the_starter_class_over_helper_classes(self) -> None:
+        helper_only = "```python\nclass TrieNode:\n    pass\n```\n"
+        text = helper_only + "```python\nclass Solution:\n    def solve(self): pass\n```"
+        assert extract_code(text) == "class Solution:\n    def solve(self): pass"
+        assert extract_code(helper_only) == "class TrieNode:\n    pass"
+        assert not has_code_block(helper_only)
+        assert has_code_block(text)
+        assert has_code_block(text.replace("Solution", "LRUCache"), "LRUCache")
+
+    def test_starter_class_of_design_problems(self) -> None:
+        snippet = "class LRUCache:\n    def __init__(self, capacity: int):\n        "
+        assert starter_class(_make_problem(code_snippet=snippet)) == "LRUCache"
+        assert starter_class(_make_problem(code_snippet="")) == "Solution"
+
+
+def _failed(code: str, error: str | None = None) -> SubmissionResult:
+    return SubmissionResult(
+        problem_id=1,
+        status=SubmissionStatus.RUNTIME_ERROR,
+        runtime_ms=None,
+        memory_mb=None,
+        error_message=error,
+        solution=Solution(
+            problem_id=1, code=code, language="python3", model_used="gpt-4o", attempt=1
+        ),
+    )
+
+
+class TestPromptBudget:
+    def test_within_budget_keeps_every_attempt(self) -> None:
+        attempts = [_failed("return 1"), _failed("return 2")]
+        parts = build_prompt_parts(_make_problem(), attempts)
+        assert parts.compacted == 0
+        assert "return 1" in parts.text and "return 2" in parts.text
+
+    def test_compacts_oldest_attempts_and_keeps_latest_verbatim(self) -> None:
+        attempts = [
+            _failed("x = 1\n" * 200, "Traceback (most recent call last):\n  ...\nKeyError: 3"),
+            _failed("y = 2\n" * 200, "Wrong answer on case 7\nmore detail"),
+            _failed("z = 3\n" * 200),
+        ]
+        parts = build_prompt_parts(_make_problem(), attempts, token_budget=500)
+        assert parts.compacted == 2
+        assert "x = 1" not in parts.text and "y = 2" not in parts.text
+        assert "z = 3\n" * 200 in parts.text
+        assert "Runtime Error: KeyError: 3" in parts.attempts[0]
+        assert "Runtime Error: Wrong answer on case 7" in parts.attempts[1]
+        assert parts.tokens < parts.uncompacted_tokens
+
+    def test_never_compacts_the_only_attempt(self) -> None:
+        parts = build_prompt_parts(_make_problem(), [_failed("w = 0\n" * 500)], token_budget=10)
+        assert parts.compacted == 0
+
+    def test_long_errors_are_trimmed(self) -> None:
+        error = "Traceback (most recent call last):\n" + "  frame\n" * 2000 + "RecursionError: deep"
+        trimmed = trim_error(error, 300)
+        assert len(trimmed) < 400
+        assert trimmed.startswith("Traceback") and trimmed.endswith("RecursionError: deep")
+        assert "characters trimmed" in trimmed
+        assert trim_error("short") == "short"
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from auto_leetcode.ai.rate_limiter import AIRateLimiter
+from auto_leetcode.leetcode.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock: _FakeClock, **kwargs: float) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class TestAdaptiveRateLimiter:
+    @pytest.mark.asyncio
+    async def test_first_request_is_immediate(self) -> None:
+        clock = _FakeClock()
+        await _limiter(clock).acquire()
+        assert clock.slept == []
+
+    @pytest.mark.asyncio
+    async def test_spaces_requests_by_rate(self) -> None:
+        clock = _FakeClock()
+        limiter = _limiter(clock, initial_rate=2.0, max_rate=2.0)
+        await limiter.acquire()
+        await limiter.acquire()
+        assert clock.now == pytest.approx(0.5)
+
+    def test_success_ramps_up_to_max(self) -> None:
+        limiter = _limiter(_FakeClock(), initial_rate=1.0, max_rate=1.2, increase=0.1)
+        limiter.on_success()
+        assert limiter.rate == pytest.approx(1.1)
+        limiter.on_success()
+        limiter.on_success()
+        assert limiter.rate == pytest.approx(1.2)
+
+    def test_throttle_backs_off_to_min(self) -> None:
+        limiter = _limiter(_FakeClock(), initial_rate=1.0, min_rate=0.3, decrease=0.5)
+        limiter.on_throttle(0)
+        assert limiter.rate == pytest.approx(0.5)
+        limiter.on_throttle(0)
+        assert limiter.rate == pytest.approx(0.3)
+
+    @pytest.mark.asyncio
+    async def test_honors_retry_after(self) -> None:
+        clock = _FakeClock()
+        limiter = _limiter(clock, initial_rate=2.0)
+        limiter.on_throttle(retry_after=12.0)
+        await limiter.acquire()
+        assert clock.now >= 12.0
+
+
+class TestParseRetryAfter:
+    def test_seconds(self) -> None:
+        assert parse_retry_after("30") == 30.0
+
+    def test_http_date(self) -> None:
+        when = datetime.now(UTC) + timedelta(seconds=60)
+        parsed = parse_retry_after(format_datetime(when, usegmt=True))
+        assert parsed is not None
+        assert 50 <= parsed <= 61
+
+    def test_missing_or_invalid(self) -> None:
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class _Throttled(Exception):
+    def __init__(self, status_code: int = 429, retry_after: str = "3") -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={"retry-after": retry_after})
+
+
+def _ai_limiter(clock: _FakeClock, **kwargs: Any) -> AIRateLimiter:
+    return AIRateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class TestAIRateLimiter:
+    @pytest.mark.asyncio
+    async def test_requests_per_minute_are_spread(self) -> None:
+        clock = _FakeClock()
+        limiter = _ai_limiter(clock, requests_per_minute=2)
+        for _ in range(3):
+            await limiter.run(10, AsyncMock(return_value="ok"))
+        assert clock.slept == [pytest.approx(30.0)]
+
+    @pytest.mark.asyncio
+    async def test_tokens_per_minute_queue_large_calls(self) -> None:
+        clock = _FakeClock()
+        limiter = _ai_limiter(clock, tokens_per_minute=1000)
+        await limiter.run(800, AsyncMock())
+        await limiter.run(800, AsyncMock())
+        assert clock.slept == [pytest.approx(36.0)]
+
+    @pytest.mark.asyncio
+    async def test_429_is_retried_after_pausing_and_halves_concurrency(self) -> None:
+        clock = _FakeClock()
+        limiter = _ai_limiter(clock, max_concurrency=8, increase=0.0)
+        call = AsyncMock(side_effect=[_Throttled(), "ok"])
+        assert await limiter.run(10, call) == "ok"
+        assert call.await_count == 2
+        assert clock.slept == [pytest.approx(3.0)]
+        assert limiter.concurrency == 4
+
+    @pytest.mark.asyncio
+    async def test_other_errors_and_exhausted_retries_propagate(self) -> None:
+        clock = _FakeClock()
+        limiter = _ai_limiter(clock, max_retries=2)
+        with pytest.raises(_Throttled):
+            await limiter.run(10, AsyncMock(side_effect=_Throttled(status_code=500)))
+        with pytest.raises(_Throttled):
+            await limiter.run(10, AsyncMock(side_effect=_Throttled()))
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_headers_set_the_budget(self) -> None:
+        clock = _FakeClock()
+        limiter = _ai_limiter(clock)
+        limiter.observe_headers(
+            {
+                "anthropic-ratelimit-tokens-limit": "1000",
+                "anthropic-ratelimit-tokens-remaining": "0",
+            }
+        )
+        await limiter.acquire(100)
+        assert clock.slept == [pytest.approx(6.0)]
+
+    @pytest.mark.asyncio
+    async def test_calls_beyond_the_concurrency_limit_wait_for_a_slot(self) -> None:
+        limiter = AIRateLimiter(max_concurrency=1, increase=0.0)
+        release = asyncio.Event()
+        started: list[str] = []
+
+        async def slow() -> None:
+            started.append("slow")
+            await release.wait()
+
+        async def quick() -> None:
+            started.append("quick")
+
+        first = asyncio.create_task(limiter.run(1, slow))
+        second = asyncio.create_task(limiter.run(1, quick))
+        await asyncio.sleep(0.01)
+        assert started == ["slow"]
+        release.set()
+        await asyncio.gather(first, second)
+        assert started == ["slow", "quick"]
@@ -1,17 +1,30 @@
 from __future__ import annotations
 
 import asyncio
+from dataclasses import replace
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from auto_leetcode.checks.dedup import DuplicateCheck
+from auto_leetcode.checks.protocol import CheckOutcome
 from auto_leetcode.config import Config
-from auto_leetcode.errors import AIGenerationError, LeetCodeClientError
+from auto_leetcode.errors import (
+    AIGenerationError,
+    LeetCodeAuthError,
+    LeetCodeClientError,
+    LeetCodeRateLimitError,
+)
+from auto_leetcode.models.batch import BatchJob, BatchProgress
+from auto_leetcode.models.checkpoint import Checkpoint
 from auto_leetcode.models.problem import Problem
 from auto_leetcode.models.solution import Solution
 from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
-from auto_leetcode.runner import _solve_problem
+from auto_leetcode.problem_run import rank_candidates
+from auto_leetcode.runner import _solve_problem, prefill_batch
+from auto_leetcode.storage.batch_store import BatchStore
+from auto_leetcode.storage.checkpoint_store import CheckpointStore
 
 
 def _config(tmp_path: Path) -> Config:
@@ -25,8 +38,6 @@ def _config(tmp_path: Path) -> Config:
         start_id=1,
         end_id=1,
         max_retries=2,
-        retry_delay_seconds=0.0,
-        submit_delay_seconds=0.0,
         solutions_dir=tmp_path / "solutions",
         results_path=tmp_path / "results.jsonl",
     )
@@ -198,3 +209,451 @@ class TestSolveProblem:
             deps["saver"], deps["config"], 1, set(),
         )
         deps["generator"].generate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_retries_fetch_after_rate_limit(self, deps: dict) -> None:
+        deps["client"].rate_limiter = MagicMock(rate=0.25)
+        deps["client"].fetch_problem = AsyncMock(
+            side_effect=[LeetCodeRateLimitError("slow down"), _problem()]
+        )
+        deps["generator"].generate = AsyncMock(return_value=_solution())
+        deps["client"].submit = AsyncMock(return_value=_result(SubmissionStatus.ACCEPTED))
+
+        await _solve_problem(
+            deps["client"],
+            deps["generator"],
+            deps["repository"],
+            deps["saver"],
+            deps["config"],
+            1,
+            set(),
+        )
+
+        assert deps["client"].fetch_problem.call_count == 2
+        assert deps["repository"].is_solved(1)
+
+    @pytest.mark.asyncio
+    async def test_expired_session_propagates(self, deps: dict) -> None:
+        deps["client"].fetch_problem = AsyncMock(side_effect=LeetCodeAuthError("expired"))
+        with pytest.raises(LeetCodeAuthError):
+            await _solve_problem(
+                deps["client"],
+                deps["generator"],
+                deps["repository"],
+                deps["saver"],
+                deps["config"],
+                1,
+                set(),
+            )
+
+
+class TestCheckpointResume:
+    @pytest.fixture()
+    def deps(self, tmp_path: Path) -> dict:
+        from auto_leetcode.storage.file_saver import FileSaver
+        from auto_leetcode.storage.json_repository import JsonRepository
+
+        client = AsyncMock()
+        client.fetch_problem = AsyncMock(return_value=_problem())
+        return {
+            "client": client,
+            "generator": AsyncMock(),
+            "repository": JsonRepository(tmp_path / "results.jsonl"),
+            "saver": FileSaver(tmp_path / "solutions"),
+            "config": _config(tmp_path),
+            "checkpoints": CheckpointStore(tmp_path / "checkpoints"),
+        }
+
+    async def _solve(self, deps: dict) -> None:
+        await _solve_problem(
+            deps["client"],
+            deps["generator"],
+            deps["repository"],
+            deps["saver"],
+            deps["config"],
+            1,
+            set(),
+            deps["checkpoints"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_repolls_outstanding_submission(self, deps: dict) -> None:
+        deps["checkpoints"].save(
+            Checkpoint(
+                problem_id=1,
+                attempt=1,
+                previous_attempts=(),
+                pending_solution=_solution(),
+                pending_submission_id=99,
+            )
+        )
+        deps["client"].check_submission = AsyncMock(return_value=_result(SubmissionStatus.ACCEPTED))
+
+        await self._solve(deps)
+
+        deps["client"].check_submission.assert_awaited_once_with(99, _solution())
+        deps["generator"].generate.assert_not_called()
+        assert deps["repository"].is_solved(1)
+        assert deps["checkpoints"].load(1) is None
+
+    @pytest.mark.asyncio
+    async def test_resubmits_a_submission_made_by_another_account(self, deps: dict) -> None:
+        deps["checkpoints"].save(
+            Checkpoint(
+                problem_id=1,
+                attempt=1,
+                previous_attempts=(),
+                pending_solution=_solution(),
+                pending_submission_id=99,
+                pending_account="other",
+            )
+        )
+        deps["client"].account_key = "mine"
+        deps["client"].check_submission = AsyncMock()
+        deps["client"].submit = AsyncMock(return_value=_result(SubmissionStatus.ACCEPTED))
+
+        await self._solve(deps)
+
+        deps["client"].check_submission.assert_not_called()
+        deps["client"].submit.assert_awaited_once()
+        assert deps["client"].submit.await_args.args[0] == _solution()
+        assert deps["repository"].is_solved(1)
+
+    @pytest.mark.asyncio
+    async def test_continues_retry_chain_without_regenerating(self, deps: dict) -> None:
+        failed = _result(SubmissionStatus.WRONG_ANSWER)
+        deps["checkpoints"].save(Checkpoint(problem_id=1, attempt=1, previous_attempts=(failed,)))
+        deps["generator"].generate = AsyncMock(return_value=_solution(attempt=2))
+        deps["client"].submit = AsyncMock(return_value=_result(SubmissionStatus.ACCEPTED))
+
+        await self._solve(deps)
+
+        deps["generator"].generate.assert_awaited_once()
+        previous = deps["generator"].generate.call_args.args[1]
+        assert previous[0].solution.code == "return [0, 1]"
+        assert deps["repository"].is_solved(1)
+
+    @pytest.mark.asyncio
+    async def test_interrupt_keeps_generated_solution(self, deps: dict) -> None:
+        deps["generator"].generate = AsyncMock(return_value=_solution())
+        deps["client"].submit = AsyncMock(side_effect=asyncio.CancelledError)
+
+        with pytest.raises(asyncio.CancelledError):
+            await self._solve(deps)
+
+        saved = deps["checkpoints"].load(1)
+        assert saved is not None
+        assert saved.attempt == 1
+        assert saved.pending_solution == _solution()
+
+
+class _RejectFirst:
+    """Fails the first ``count`` solutions it sees, like a failed example run."""
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.seen = 0
+
+    async def check(self, problem: Problem, solution: Solution) -> CheckOutcome:
+        self.seen += 1
+        if self.seen > self.count:
+            return CheckOutcome(solution)
+        failure = SubmissionResult(
+            problem_id=problem.id,
+            status=SubmissionStatus.WRONG_ANSWER,
+            runtime_ms=None,
+            memory_mb=None,
+            error_message="Local example check: Example 1",
+            solution=solution,
+        )
+        return CheckOutcome(solution, failure)
+
+
+class TestLocalChecks:
+    @pytest.fixture()
+    def deps(self, tmp_path: Path) -> dict:
+        from auto_leetcode.storage.file_saver import FileSaver
+        from auto_leetcode.storage.json_repository import JsonRepository
+
+        client = AsyncMock()
+        client.fetch_problem = AsyncMock(return_value=_problem())
+        generator = AsyncMock()
+        generator.generate = AsyncMock(side_effect=[_solution(1), _solution(2)])
+        return {
+            "client": client,
+            "generator": generator,
+            "repository": JsonRepository(tmp_path / "results.jsonl"),
+            "saver": FileSaver(tmp_path / "solutions"),
+            "config": _config(tmp_path),
+        }
+
+    @pytest.mark.asyncio
+    async def test_local_failure_is_fed_back_without_submitting(self, deps: dict) -> None:
+        deps["client"].submit = AsyncMock(return_value=_result(SubmissionStatus.ACCEPTED))
+        await _solve_problem(
+            deps["client"],
+            deps["generator"],
+            deps["repository"],
+            deps["saver"],
+            deps["config"],
+            1,
+            set(),
+            checks=[_RejectFirst(1)],
+        )
+        assert deps["client"].submit.await_count == 1
+        second_call_attempts = deps["generator"].generate.await_args_list[1].args[1]
+        assert second_call_attempts[0].error_message.startswith("Local example check")
+        assert len(deps["repository"].find_by_problem_id(1)) == 1
+
+    @pytest.mark.asyncio
+    async def test_local_failures_use_up_attempts(self, deps: dict) -> None:
+        deps["client"].submit = AsyncMock()
+        await _solve_problem(
+            deps["client"],
+            deps["generator"],
+            deps["repository"],
+            deps["saver"],
+            deps["config"],
+            1,
+            set(),
+            checks=[_RejectFirst(2)],
+        )
+        deps["client"].submit.assert_not_called()
+        assert deps["generator"].generate.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_repeated_code_gets_its_earlier_verdict(self, deps: dict) -> None:
+        deps["client"].submit = AsyncMock(return_value=_result(SubmissionStatus.WRONG_ANSWER))
+        deps["config"] = replace(deps["config"], max_retries=3)
+        deps["generator"].generate = AsyncMock(
+            side_effect=[_solution(1), _solution(2), replace(_solution(3), code="return [1, 0]")]
+        )
+        await _solve_problem(
+            deps["client"],
+            deps["generator"],
+            deps["repository"],
+            deps["saver"],
+            deps["config"],
+            1,
+            set(),
+            checks=[DuplicateCheck(deps["repository"])],
+        )
+        submitted = [call.args[0].code for call in deps["client"].submit.await_args_list]
+        assert submitted == ["return [0, 1]", "return [1, 0]"]
+        repeat = deps["generator"].generate.await_args_list[2].args[1][1]
+        assert repeat.status == SubmissionStatus.WRONG_ANSWER
+        assert repeat.error_message.startswith("You already tried this exact solution")
+
+
+def _candidate(code: str) -> Solution:
+    return replace(_solution(), code=code)
+
+
+class TestRankCandidates:
+    def test_dedupes_and_prefers_repeated_code(self) -> None:
+        lone = _candidate("def f():\n    return 1")
+        popular = _candidate("def f():\n    return 2")
+        reformatted = _candidate("def f():  # again\n    return (2)")
+        broken = _candidate("def f(:")
+        ranked = rank_candidates([broken, lone, popular, reformatted])
+        assert ranked == [popular, lone, broken]
+
+
+class TestCandidates:
+    @pytest.fixture()
+    def deps(self, tmp_path: Path) -> dict:
+        from auto_leetcode.storage.file_saver import FileSaver
+        from auto_leetcode.storage.json_repository import JsonRepository
+
+        client = AsyncMock()
+        client.fetch_problem = AsyncMock(return_value=_problem())
+        generator = AsyncMock()
+        generator.generate_many = AsyncMock(
+            return_value=[_candidate("x = 1"), _candidate("x = 2"), _candidate("x = 3")]
+        )
+        return {
+            "client": client,
+            "generator": generator,
+            "repository": JsonRepository(tmp_path / "results.jsonl"),
+            "saver": FileSaver(tmp_path / "solutions"),
+            "config": replace(_config(tmp_path), candidates=3, max_retries=3),
+        }
+
+    @pytest.mark.asyncio
+    async def test_fallbacks_are_submitted_before_generating_again(self, deps: dict) -> None:
+        deps["client"].submit = AsyncMock(
+            side_effect=[_result(SubmissionStatus.WRONG_ANSWER), _result()]
+        )
+        await _solve_problem(
+            deps["client"],
+            deps["generator"],
+            deps["repository"],
+            deps["saver"],
+            deps["config"],
+            1,
+            set(),
+        )
+        deps["generator"].generate_many.assert_awaited_once()
+        submitted = [call.args[0] for call in deps["client"].submit.await_args_list]
+        assert [s.code for s in submitted] == ["x = 1", "x = 2"]
+        assert [s.attempt for s in submitted] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_candidates_failing_local_checks_are_not_kept(self, deps: dict) -> None:
+        deps["client"].submit = AsyncMock(
+            side_effect=[_result(SubmissionStatus.WRONG_ANSWER), _result()]
+        )
+        await _solve_problem(
+            deps["client"],
+            deps["generator"],
+            deps["repository"],
+            deps["saver"],
+            deps["config"],
+            1,
+            set(),
+            checks=[_RejectFirst(2)],
+        )
+        deps["generator"].generate_many.assert_awaited()
+        submitted = [call.args[0].code for call in deps["client"].submit.await_args_list]
+        assert submitted[0] == "x = 3"
+        assert deps["generator"].generate_many.await_count == 2
+
+
+class _Rewrite:
+    """Rewrites code like a static repair would."""
+
+    def __init__(self, rewrites: dict[str, str]) -> None:
+        self.rewrites = rewrites
+
+    async def check(self, problem: Problem, solution: Solution) -> CheckOutcome:
+        return CheckOutcome(replace(solution, code=self.rewrites.get(solution.code, solution.code)))
+
+
+class TestCandidateDedup:
+    @pytest.fixture()
+    def deps(self, tmp_path: Path) -> dict:
+        from auto_leetcode.storage.file_saver import FileSaver
+        from auto_leetcode.storage.json_repository import JsonRepository
+
+        client = AsyncMock()
+        client.fetch_problem = AsyncMock(return_value=_problem())
+        client.submit = AsyncMock(
+            side_effect=[_result(SubmissionStatus.WRONG_ANSWER), _result(), _result()]
+        )
+        generator = AsyncMock()
+        generator.generate_many = AsyncMock(
+            return_value=[_candidate("x = 1"), _candidate("x = 2"), _candidate("x = 3")]
+        )
+        return {
+            "client": client,
+            "generator": generator,
+            "repository": JsonRepository(tmp_path / "results.jsonl"),
+            "saver": FileSaver(tmp_path / "solutions"),
+            "config": replace(_config(tmp_path), candidates=3, max_retries=3),
+        }
+
+    async def _submitted(self, deps: dict, checks: list) -> list[str]:
+        await _solve_problem(
+            deps["client"],
+            deps["generator"],
+            deps["repository"],
+            deps["saver"],
+            deps["config"],
+            1,
+            set(),
+            checks=checks,
+        )
+        return [call.args[0].code for call in deps["client"].submit.await_args_list]
+
+    @pytest.mark.asyncio
+    async def test_candidates_repaired_into_the_same_code_are_submitted_once(
+        self, deps: dict
+    ) -> None:
+        submitted = await self._submitted(deps, [_Rewrite({"x = 2": "x  =  1"})])
+        assert submitted == ["x = 1", "x = 3"]
+
+    @pytest.mark.asyncio
+    async def test_held_back_candidates_already_rejected_are_dropped(self, deps: dict) -> None:
+        deps["repository"].save(
+            replace(_result(SubmissionStatus.WRONG_ANSWER), solution=_candidate("x = 2"))
+        )
+        submitted = await self._submitted(deps, [])
+        assert submitted == ["x = 1", "x = 3"]
+
+
+class TestPrefillBatch:
+    def _deps(self, tmp_path: Path) -> tuple[AsyncMock, AsyncMock, dict]:
+        from auto_leetcode.storage.json_repository import JsonRepository
+
+        client = AsyncMock()
+        client.fetch_problem = AsyncMock(
+            side_effect=lambda problem_id: replace(_problem(), id=problem_id)
+        )
+        generator = AsyncMock()
+        # Python 3.12 checks protocol members statically, so every one must be set up front.
+        generator.submit_batch = AsyncMock(return_value="b1")
+        generator.batch_progress = AsyncMock(
+            side_effect=[
+                BatchProgress(done=False, succeeded=0, failed=0, total=1),
+                BatchProgress(done=True, succeeded=1, failed=0, total=1),
+            ]
+        )
+        generator.batch_results = AsyncMock(return_value=[_solution()])
+        config = replace(
+            _config(tmp_path),
+            batch_generate=True,
+            batch_path=tmp_path / "batch.json",
+            batch_poll_seconds=0.0,
+        )
+        return (
+            client,
+            generator,
+            {
+                "repository": JsonRepository(tmp_path / "results.jsonl"),
+                "checkpoints": CheckpointStore(tmp_path / "checkpoints"),
+                "config": config,
+            },
+        )
+
+    @pytest.mark.asyncio
+    async def test_submits_unstarted_problems_and_prefills_first_attempts(
+        self, tmp_path: Path
+    ) -> None:
+        client, generator, deps = self._deps(tmp_path)
+        deps["checkpoints"].save(Checkpoint(problem_id=2, attempt=1, previous_attempts=()))
+
+        wrapped = await prefill_batch(
+            client,
+            generator,
+            deps["repository"],
+            deps["checkpoints"],
+            deps["config"],
+            [1, 2],
+            set(),
+        )
+
+        submitted = generator.submit_batch.call_args.args[0]
+        assert [p.id for p in submitted] == [1]
+        assert generator.batch_progress.call_count == 2
+        assert not deps["config"].batch_path.exists()
+        assert await wrapped.generate(_problem(), []) == _solution()
+        generator.generate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resumes_a_stored_batch_instead_of_resubmitting(self, tmp_path: Path) -> None:
+        client, generator, deps = self._deps(tmp_path)
+        BatchStore(deps["config"].batch_path).save(BatchJob("b1", "openai", "gpt-4o", (1,), 0.0))
+
+        await prefill_batch(
+            client,
+            generator,
+            deps["repository"],
+            deps["checkpoints"],
+            deps["config"],
+            [1, 2, 3],
+            set(),
+        )
+
+        generator.submit_batch.assert_not_called()
+        assert generator.batch_results.call_args.args[0] == "b1"
+        assert [p.id for p in generator.batch_results.call_args.args[1]] == [1]
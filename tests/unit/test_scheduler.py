@@ -0,0 +1,65 @@
+from auto_leetcode.models.problem import ProblemSummary
+from auto_leetcode.models.submission import SubmissionHistory, SubmissionStatus
+from auto_leetcode.scheduler import ExpectedYieldPolicy, NumericOrderPolicy, schedule
+
+
+def _summary(problem_id: int, difficulty: str = "Easy", **kwargs: object) -> ProblemSummary:
+    defaults: dict[str, object] = {
+        "id": problem_id,
+        "slug": f"p-{problem_id}",
+        "difficulty": difficulty,
+        "ac_rate": 50.0,
+        "paid_only": False,
+        "has_python": True,
+    }
+    defaults.update(kwargs)
+    return ProblemSummary(**defaults)  # type: ignore[arg-type]
+
+
+class TestExpectedYieldPolicy:
+    def test_easy_beats_hard(self) -> None:
+        policy = ExpectedYieldPolicy()
+        assert policy.score(_summary(1, "Easy"), None) > policy.score(_summary(2, "Hard"), None)
+
+    def test_higher_acceptance_rate_ranks_higher(self) -> None:
+        policy = ExpectedYieldPolicy()
+        easy = policy.score(_summary(1, "Medium", ac_rate=70.0), None)
+        tough = policy.score(_summary(2, "Medium", ac_rate=20.0), None)
+        assert easy > tough
+
+    def test_unsolvable_scores_zero(self) -> None:
+        policy = ExpectedYieldPolicy()
+        assert policy.score(_summary(1, paid_only=True), None) == 0.0
+        assert policy.score(_summary(2, has_python=False), None) == 0.0
+
+    def test_failed_history_lowers_score(self) -> None:
+        policy = ExpectedYieldPolicy()
+        history = SubmissionHistory(attempts=3, last_status=SubmissionStatus.TIME_LIMIT)
+        assert policy.score(_summary(1), history) < policy.score(_summary(1), None)
+
+
+class TestSchedule:
+    def test_numeric_order_policy_keeps_ids_ascending(self) -> None:
+        catalog = {i: _summary(i, "Hard" if i % 2 else "Easy") for i in range(1, 6)}
+        assert schedule(range(1, 6), catalog, {}, NumericOrderPolicy()) == [1, 2, 3, 4, 5]
+
+    def test_yield_policy_puts_cheap_wins_first(self) -> None:
+        catalog = {
+            1: _summary(1, "Hard"),
+            2: _summary(2, "Easy"),
+            3: _summary(3, "Medium"),
+        }
+        assert schedule(range(1, 4), catalog, {}, ExpectedYieldPolicy()) == [2, 3, 1]
+
+    def test_paid_only_and_non_python_problems_are_left_out(self) -> None:
+        catalog = {
+            1: _summary(1),
+            2: _summary(2, paid_only=True),
+            3: _summary(3, has_python=False),
+        }
+        for policy in (NumericOrderPolicy(), ExpectedYieldPolicy()):
+            assert schedule(range(1, 4), catalog, {}, policy) == [1]
+
+    def test_unknown_ids_go_last(self) -> None:
+        catalog = {2: _summary(2)}
+        assert schedule([3, 1, 2], catalog, {}, ExpectedYieldPolicy()) == [2, 1, 3]
@@ -0,0 +1,81 @@
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from auto_leetcode.config import Config
+from auto_leetcode.errors import LeetCodeAuthError
+from auto_leetcode.sharding import ShardDispatcher, _solved_on_any_account
+
+
+class TestShardDispatcher:
+    def test_deals_ids_round_robin(self) -> None:
+        dispatcher = ShardDispatcher([5, 3, 9, 1], 2)
+        assert dispatcher.lease(0) == 5
+        assert dispatcher.lease(1) == 3
+        assert dispatcher.lease(0) == 9
+
+    def test_steals_when_own_shard_is_empty(self) -> None:
+        dispatcher = ShardDispatcher(range(1, 5), 2)
+        leased = [dispatcher.lease(0) for _ in range(3)]
+        assert leased == [1, 3, 4]
+        assert dispatcher.lease(1) == 2
+
+    def test_complete_releases_lease(self) -> None:
+        dispatcher = ShardDispatcher([1, 2], 1)
+        first = dispatcher.lease(0)
+        assert first == 1
+        dispatcher.complete(0, first)
+        assert dispatcher.remaining == 1
+
+    def test_retire_moves_pending_and_leased_work(self) -> None:
+        dispatcher = ShardDispatcher(range(1, 7), 3)
+        assert dispatcher.lease(0) == 1
+        moved = dispatcher.retire(0)
+        assert moved == 2
+        assert dispatcher.healthy == [1, 2]
+        assert dispatcher.lease(0) is None
+        handed_over = set(dispatcher.iter_for(1)) | set(dispatcher.iter_for(2))
+        assert handed_over == {1, 2, 3, 4, 5, 6}
+
+    def test_retiring_last_account_keeps_remaining(self) -> None:
+        dispatcher = ShardDispatcher([1, 2, 3], 1)
+        dispatcher.lease(0)
+        dispatcher.retire(0)
+        assert dispatcher.healthy == []
+        assert dispatcher.remaining == 3
+
+    def test_pinned_ids_go_first_and_are_never_stolen(self) -> None:
+        dispatcher = ShardDispatcher([1, 2, 3, 4], 2, pinned={4: 1})
+        assert [dispatcher.lease(0) for _ in range(3)] == [1, 3, 2]
+        assert dispatcher.lease(0) is None
+        assert dispatcher.lease(1) == 4
+
+    def test_retiring_releases_pinned_ids(self) -> None:
+        dispatcher = ShardDispatcher([1, 2], 2, pinned={2: 1})
+        dispatcher.retire(1)
+        assert list(dispatcher.iter_for(0)) == [1, 2]
+
+
+class TestSolvedOnAnyAccount:
+    @pytest.mark.asyncio
+    async def test_merges_accounts_and_reports_expired_ones(self, tmp_path: Path) -> None:
+        clients = [AsyncMock(), AsyncMock(), AsyncMock()]
+        clients[0].fetch_solved_ids = AsyncMock(return_value={1, 2})
+        clients[1].fetch_solved_ids = AsyncMock(side_effect=LeetCodeAuthError("expired"))
+        clients[2].fetch_solved_ids = AsyncMock(return_value={3})
+        config = Config(
+            leetcode_session="s",
+            csrf_token="c",
+            ai_provider="openai",
+            ai_api_key="k",
+            ai_base_url="http://localhost",
+            ai_model="gpt-4o",
+            solutions_dir=tmp_path / "solutions",
+            results_path=tmp_path / "results.jsonl",
+        )
+
+        solved, expired = await _solved_on_any_account(clients, config)
+
+        assert solved == {1, 2, 3}
+        assert expired == [1]
@@ -1,12 +1,21 @@
 import json
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
 
-from auto_leetcode.models.solution import Solution
-from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
+from auto_leetcode.models.batch import BatchJob
+from auto_leetcode.models.checkpoint import Checkpoint
+from auto_leetcode.models.problem import Problem, ProblemSummary
+from auto_leetcode.models.solution import GenerationStats, Solution
+from auto_leetcode.models.submission import ModelStats, SubmissionResult, SubmissionStatus
+from auto_leetcode.storage.batch_store import BatchStore
+from auto_leetcode.storage.catalog_cache import CatalogCache
+from auto_leetcode.storage.checkpoint_store import CheckpointStore
 from auto_leetcode.storage.file_saver import FileSaver
 from auto_leetcode.storage.json_repository import JsonRepository
+from auto_leetcode.storage.problem_store import ProblemStore
+from auto_leetcode.storage.response_cache import ResponseCache, response_key
 
 
 def _make_result(
@@ -73,6 +82,119 @@ class TestJsonRepository:
         assert not repo.is_solved(1)
         assert repo.find_all_accepted() == []
 
+    def test_history_counts_attempts_and_last_status(self, tmp_path: Path) -> None:
+        repo = JsonRepository(tmp_path / "results.jsonl")
+        repo.save(_make_result(problem_id=1, status=SubmissionStatus.WRONG_ANSWER))
+        repo.save(_make_result(problem_id=1, status=SubmissionStatus.TIME_LIMIT))
+        repo.save(_make_result(problem_id=2, status=SubmissionStatus.ACCEPTED))
+        history = repo.history()
+        assert history[1].attempts == 2
+        assert history[1].last_status == SubmissionStatus.TIME_LIMIT
+        assert history[2].attempts == 1
+
+    def test_verdict_times_skip_results_without_timing(self, tmp_path: Path) -> None:
+        repo = JsonRepository(tmp_path / "results.jsonl")
+        repo.save(_make_result(problem_id=1))
+        repo.save(replace(_make_result(problem_id=2), verdict_seconds=1.25))
+        assert repo.verdict_times() == [(2, SubmissionStatus.ACCEPTED, 1.25)]
+
+    def test_rejections_are_remembered_by_normalized_code(self, tmp_path: Path) -> None:
+        path = tmp_path / "results.jsonl"
+        rejected = _make_result(problem_id=1, status=SubmissionStatus.WRONG_ANSWER)
+        JsonRepository(path).save(
+            replace(
+                rejected,
+                solution=replace(
+                    rejected.solution, code='def f():\n    """Doc."""\n    return [0, 1]\n'
+                ),
+            )
+        )
+        repo = JsonRepository(path)
+        known = repo.known_rejection(1, "def f():  # same\n    return [0,\n            1]")
+        assert known is not None
+        assert known.status == SubmissionStatus.WRONG_ANSWER
+        assert repo.known_rejection(1, "def f():\n    return [1, 0]") is None
+        assert repo.known_rejection(2, "def f():\n    return [0, 1]") is None
+
+    @pytest.mark.parametrize("status", [SubmissionStatus.ACCEPTED, SubmissionStatus.UNKNOWN])
+    def test_accepted_and_unknown_verdicts_are_not_rejections(
+        self, tmp_path: Path, status: SubmissionStatus
+    ) -> None:
+        repo = JsonRepository(tmp_path / "results.jsonl")
+        repo.save(_make_result(problem_id=1, status=status))
+        assert repo.known_rejection(1, "return [0, 1]") is None
+
+
+class TestModelStats:
+    def test_acceptance_and_latency_per_model(self, tmp_path: Path) -> None:
+        path = tmp_path / "results.jsonl"
+        records = [
+            {"problem_id": 1, "status": "Wrong Answer", "model": "fast", "generation_seconds": 2.0},
+            {"problem_id": 1, "status": "Accepted", "model": "strong", "generation_seconds": 9.0},
+            {"problem_id": 2, "status": "Accepted", "model": "fast", "generation_seconds": 4.0},
+            {"problem_id": 3, "status": "Accepted", "model": "fast"},
+        ]
+        path.write_text("".join(json.dumps(r) + "\n" for r in records))
+        stats = JsonRepository(path).model_stats()
+        assert stats["fast"] == ModelStats(
+            submissions=3, accepted=2, generation_seconds=6.0, timed=2
+        )
+        assert stats["fast"].mean_generation_seconds == 3.0
+        assert stats["strong"].acceptance_rate == 1.0
+
+    def test_batch_generations_have_no_latency(self, tmp_path: Path) -> None:
+        repo = JsonRepository(tmp_path / "results.jsonl")
+        result = _make_result()
+        stats = GenerationStats(seconds=0.0, time_to_code=None, output_tokens=12, batched=True)
+        repo.save(replace(result, solution=replace(result.solution, stats=stats)))
+        assert repo.model_stats()["gpt-4o"] == ModelStats(submissions=1, accepted=1)
+        assert repo.model_stats()["gpt-4o"].mean_generation_seconds is None
+
+
+class TestCheckpointStore:
+    def test_round_trip_keeps_full_code(self, tmp_path: Path) -> None:
+        store = CheckpointStore(tmp_path / "checkpoints")
+        failed = _make_result(problem_id=7, status=SubmissionStatus.WRONG_ANSWER)
+        pending = Solution(
+            problem_id=7,
+            code="class Solution: ...",
+            language="python3",
+            model_used="gpt-4o",
+            attempt=2,
+            reasoning="try harder",
+        )
+        store.save(
+            Checkpoint(
+                problem_id=7,
+                attempt=2,
+                previous_attempts=(failed,),
+                pending_solution=pending,
+                pending_submission_id=1234,
+                pending_account="a1b2c3",
+                fallbacks=(pending,),
+            )
+        )
+
+        loaded = store.load(7)
+        assert loaded is not None
+        assert loaded.attempt == 2
+        assert loaded.previous_attempts[0].solution.code == "return [0, 1]"
+        assert loaded.previous_attempts[0].status == SubmissionStatus.WRONG_ANSWER
+        assert loaded.pending_solution == pending
+        assert loaded.pending_submission_id == 1234
+        assert loaded.pending_account == "a1b2c3"
+        assert loaded.fallbacks == (pending,)
+
+    def test_missing_checkpoint(self, tmp_path: Path) -> None:
+        assert CheckpointStore(tmp_path).load(1) is None
+
+    def test_delete(self, tmp_path: Path) -> None:
+        store = CheckpointStore(tmp_path)
+        store.save(Checkpoint(problem_id=3, attempt=1, previous_attempts=()))
+        store.delete(3)
+        assert store.load(3) is None
+        store.delete(3)
+
 
 class TestFileSaver:
     def test_saves_solution_file(self, tmp_path: Path) -> None:
@@ -102,3 +224,132 @@ class TestFileSaver:
         )
         path = saver.save(solution)
         assert path.exists()
+
+
+class TestCatalogCache:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        cache = CatalogCache(tmp_path / "catalog.json", ttl_seconds=60)
+        entry = ProblemSummary(1, "two-sum", "Easy", 55.2, False, True)
+        cache.save({1: entry}, total=1)
+        cached = cache.load()
+        assert cached is not None
+        assert cached.entries == {1: entry}
+        assert cache.is_fresh(cached)
+
+    def test_expired(self, tmp_path: Path) -> None:
+        cache = CatalogCache(tmp_path / "catalog.json", ttl_seconds=0)
+        cache.save({}, total=0)
+        cached = cache.load()
+        assert cached is not None
+        assert not cache.is_fresh(cached)
+
+    def test_corrupt_file_is_ignored(self, tmp_path: Path) -> None:
+        path = tmp_path / "catalog.json"
+        path.write_text("{not json")
+        assert CatalogCache(path, ttl_seconds=60).load() is None
+
+
+class TestBatchStore:
+    def test_round_trip_and_delete(self, tmp_path: Path) -> None:
+        store = BatchStore(tmp_path / "batch.json")
+        job = BatchJob("b1", "claude", "m", (1, 2), 100.0)
+        store.save(job)
+        assert store.load() == job
+        store.delete()
+        assert store.load() is None
+
+    def test_corrupt_file_is_ignored(self, tmp_path: Path) -> None:
+        path = tmp_path / "batch.json"
+        path.write_text('{"batch_id": "b1"}')
+        assert BatchStore(path).load() is None
+
+
+class TestProblemStore:
+    def _problem(self, description: str = "d") -> Problem:
+        return Problem(
+            id=1,
+            title="Two Sum",
+            slug="two-sum",
+            difficulty="Easy",
+            description=description,
+            code_snippet="class Solution:",
+            paid_only=False,
+        )
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        store = ProblemStore(tmp_path / "problems")
+        raw = {"titleSlug": "two-sum", "content": "<p>d</p>"}
+        assert store.put("two-sum", raw, self._problem(), parser_version=1)
+        stored = store.get("two-sum")
+        assert stored is not None
+        assert stored.problem == self._problem()
+        assert stored.raw == raw
+        assert stored.parser_version == 1
+        assert len(stored.content_hash) == 64
+
+    def test_put_reports_content_changes(self, tmp_path: Path) -> None:
+        store = ProblemStore(tmp_path)
+        raw = {"content": "a"}
+        store.put("two-sum", raw, self._problem(), parser_version=1)
+        assert not store.put("two-sum", dict(raw), self._problem(), parser_version=1)
+        assert store.put("two-sum", {"content": "b"}, self._problem("b"), parser_version=1)
+
+    def test_missing(self, tmp_path: Path) -> None:
+        assert ProblemStore(tmp_path).get("nope") is None
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache:
+    def test_hit_after_put_survives_reopen(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache.sqlite3"
+        cache = ResponseCache(path)
+        assert cache.get("k") is None
+        cache.put("k", "answer")
+        cache.close()
+        reopened = ResponseCache(path)
+        assert reopened.get("k") == "answer"
+        assert (reopened.stats.hits, reopened.stats.misses) == (1, 0)
+        reopened.close()
+
+    def test_key_covers_every_input(self) -> None:
+        base = response_key("openai", "m", "sys", "user", {"temperature": 0.2})
+        assert base == response_key("openai", "m", "sys", "user", {"temperature": 0.2})
+        assert base != response_key("claude", "m", "sys", "user", {"temperature": 0.2})
+        assert base != response_key("openai", "m", "sys", "user", {"temperature": 0.7})
+
+    def test_expired_entries_miss(self, tmp_path: Path) -> None:
+        clock = _Clock()
+        cache = ResponseCache(tmp_path / "cache.sqlite3", max_age_seconds=60, clock=clock)
+        cache.put("k", "answer")
+        clock.now += 61
+        assert cache.get("k") is None
+        assert cache.stats.evictions == 1
+
+    def test_evicts_least_recently_used_over_budget(self, tmp_path: Path) -> None:
+        clock = _Clock()
+        cache = ResponseCache(tmp_path / "cache.sqlite3", max_bytes=10, clock=clock)
+        cache.put("a", "aaaa")
+        clock.now += 1
+        cache.put("b", "bbbb")
+        clock.now += 1
+        assert cache.get("a") == "aaaa"
+        clock.now += 1
+        cache.put("c", "cccc")
+        assert cache.get("b") is None
+        assert cache.get("a") == "aaaa"
+        assert cache.get("c") == "cccc"
+
+    def test_bypass_misses_but_still_stores(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache.sqlite3"
+        bypassing = ResponseCache(path, bypass=True)
+        bypassing.put("k", "fresh")
+        assert bypassing.get("k") is None
+        bypassing.close()
+        assert ResponseCache(path).get("k") == "fresh"
@@ -1,4 +1,19 @@
-from auto_leetcode.leetcode.submitter import _parse_float, _parse_int
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import httpx
+import pytest
+
+from auto_leetcode.errors import LeetCodeClientError
+from auto_leetcode.leetcode.rate_limiter import AdaptiveRateLimiter
+from auto_leetcode.leetcode.submitter import (
+    JudgeLatencyModel,
+    SubmissionPoller,
+    _parse_float,
+    _parse_int,
+)
+from auto_leetcode.models.solution import Solution
+from auto_leetcode.models.submission import SubmissionResult, SubmissionStatus
 
 
 class TestParseInt:
@@ -27,3 +42,143 @@ class TestParseFloat:
 
     def test_invalid(self) -> None:
         assert _parse_float("xyz") is None
+
+
+class TestJudgeLatencyModel:
+    def test_default_before_any_sample(self) -> None:
+        assert JudgeLatencyModel(default_seconds=3.0).first_check_delay("Easy") == 3.0
+
+    def test_first_check_targets_fastest_status(self) -> None:
+        model = JudgeLatencyModel()
+        model.observe("Hard", SubmissionStatus.ACCEPTED, 6.0)
+        model.observe("Hard", SubmissionStatus.COMPILE_ERROR, 1.0)
+        assert model.first_check_delay("Hard") == 1.0
+
+    def test_falls_back_to_other_difficulties(self) -> None:
+        model = JudgeLatencyModel()
+        model.observe("Easy", SubmissionStatus.ACCEPTED, 2.0)
+        assert model.first_check_delay("Medium") == 2.0
+
+    def test_moving_average(self) -> None:
+        model = JudgeLatencyModel(smoothing=0.5)
+        model.observe("Easy", SubmissionStatus.ACCEPTED, 2.0)
+        model.observe("Easy", SubmissionStatus.ACCEPTED, 4.0)
+        assert model.estimate("Easy", SubmissionStatus.ACCEPTED) == 3.0
+
+
+class _FakeJudge:
+    """Reports each submission as pending for ``pending_checks`` checks, then accepted."""
+
+    def __init__(self, pending_checks: int) -> None:
+        self.pending_checks = pending_checks
+        self.checks: dict[int, int] = {}
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        submission_id = int(request.url.path.split("/")[3])
+        self.checks[submission_id] = self.checks.get(submission_id, 0) + 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0)
+        self.active -= 1
+        if self.checks[submission_id] <= self.pending_checks:
+            return httpx.Response(200, json={"state": "PENDING"})
+        return httpx.Response(
+            200, json={"state": "SUCCESS", "status_code": 10, "status_runtime": "40 ms"}
+        )
+
+
+def _poller(
+    judge: Callable[[httpx.Request], Awaitable[httpx.Response]],
+    latency: JudgeLatencyModel | None = None,
+    timeout: float = 2.0,
+) -> SubmissionPoller:
+    http = httpx.AsyncClient(base_url="https://leetcode.com", transport=httpx.MockTransport(judge))
+    return SubmissionPoller(
+        http,
+        AdaptiveRateLimiter(initial_rate=1000, max_rate=1000),
+        latency or JudgeLatencyModel(default_seconds=0.01),
+        min_interval=0.01,
+        max_interval=0.05,
+        timeout=timeout,
+    )
+
+
+def _solution(problem_id: int) -> Solution:
+    return Solution(problem_id=problem_id, code="", language="python3", model_used="m", attempt=1)
+
+
+class TestSubmissionPoller:
+    @pytest.mark.asyncio
+    async def test_multiplexes_submissions_through_one_loop(self) -> None:
+        judge = _FakeJudge(pending_checks=2)
+        poller = _poller(judge)
+        results = await asyncio.gather(*(poller.wait(i, _solution(i), "Easy") for i in range(1, 6)))
+        await poller.close()
+        assert [r.status for r in results] == [SubmissionStatus.ACCEPTED] * 5
+        assert all(r.verdict_seconds is not None and r.verdict_seconds > 0 for r in results)
+        assert judge.checks == {i: 3 for i in range(1, 6)}
+        assert judge.peak == 1
+
+    @pytest.mark.asyncio
+    async def test_learns_latency_from_verdicts(self) -> None:
+        latency = JudgeLatencyModel(default_seconds=0.01)
+        poller = _poller(_FakeJudge(pending_checks=0), latency)
+        result = await poller.wait(1, _solution(1), "Medium")
+        await poller.close()
+        assert latency.estimate("Medium", SubmissionStatus.ACCEPTED) == result.verdict_seconds
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_timeout(self) -> None:
+        poller = _poller(_FakeJudge(pending_checks=1000), timeout=0.1)
+        with pytest.raises(LeetCodeClientError, match="did not complete"):
+            await poller.wait(1, _solution(1))
+        await poller.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_fail_the_others(self) -> None:
+        judge = _FakeJudge(pending_checks=0)
+        checking = asyncio.Event()
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.split("/")[3] == "1":
+                checking.set()
+                await release.wait()
+            return await judge(request)
+
+        poller = _poller(handler)
+        first = asyncio.create_task(poller.wait(1, _solution(1)))
+        second = asyncio.create_task(poller.wait(2, _solution(2)))
+        await checking.wait()
+        first.cancel()
+        release.set()
+        result = await second
+        await poller.close()
+        assert first.cancelled()
+        assert result.status == SubmissionStatus.ACCEPTED
+
+    @pytest.mark.asyncio
+    async def test_a_broken_check_fails_only_its_submission(self) -> None:
+        judge = _FakeJudge(pending_checks=0)
+        html_served: set[int] = set()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            submission_id = int(request.url.path.split("/")[3])
+            if submission_id == 1 and submission_id not in html_served:
+                html_served.add(submission_id)
+                return httpx.Response(200, text="<html>busy</html>")
+            if submission_id == 2:
+                raise RuntimeError("boom")
+            return await judge(request)
+
+        poller = _poller(handler)
+        results = await asyncio.gather(
+            poller.wait(1, _solution(1)), poller.wait(2, _solution(2)), return_exceptions=True
+        )
+        await poller.close()
+        assert isinstance(results[0], SubmissionResult)
+        assert results[0].status == SubmissionStatus.ACCEPTED
+        assert isinstance(results[1], LeetCodeClientError)
+        assert "boom" in str(results[1])